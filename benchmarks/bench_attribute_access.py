@@ -0,0 +1,102 @@
+"""Micro-benchmark of attribute access on objects returned by a PaginatedList.
+
+Compares the plain attribute lookup of FabmanObject with a lookup routed through
+a Python-level __getattribute__ override, as FabmanObject used to define. The API
+is simulated with requests_mock, so no network access or API key is needed.
+
+Run from the repository root:
+
+    python benchmarks/bench_attribute_access.py
+"""
+import os
+import sys
+import timeit
+
+import requests_mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from fabman import Fabman
+from fabman.account import Account
+from fabman.member import Member
+from fabman.paginated_list import PaginatedList
+
+PAGE_SIZE = 1000
+REPEAT = 5
+
+
+class OverriddenMember(Member):
+    """Member with the former no-op __getattribute__ override"""
+
+    __slots__ = ()
+
+    def __getattribute__(self, name):
+        return super(OverriddenMember, self).__getattribute__(name)
+
+
+class OverriddenAccount(Account):
+    """Account with the former no-op __getattribute__ override"""
+
+    def __getattribute__(self, name):
+        return super(OverriddenAccount, self).__getattribute__(name)
+
+
+def make_record(index: int) -> dict:
+    return {
+        "id": index,
+        "account": 1,
+        "space": 1,
+        "memberNumber": str(index),
+        "firstName": "Julian",
+        "lastName": "Bashear",
+        "emailAddress": f"member{index}@example.com",
+        "state": "active",
+        "lockVersion": 1,
+        "createdAt": "2023-06-28T22:16:18.183Z",
+        "updatedAt": "2023-06-28T22:16:18.183Z",
+    }
+
+
+def load(fabman: Fabman, content_class) -> list:
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://fabman.io/api/v1/members",
+            json=[make_record(index) for index in range(PAGE_SIZE)],
+        )
+        members = PaginatedList(
+            content_class,
+            fabman._Fabman__requester,  # pylint: disable=protected-access
+            "GET",
+            "/members",
+            limit=PAGE_SIZE,
+        )
+        return list(members)
+
+
+def read_attributes(objects: list) -> None:
+    for obj in objects:
+        _ = (obj.id, obj.firstName, obj.lastName, obj.state, obj.updatedAt)
+        _ = obj._requester  # pylint: disable=protected-access
+
+
+def main() -> None:
+    fabman = Fabman("benchmark")
+    reads = PAGE_SIZE * 6
+
+    print(f"{reads} attribute reads per run, best of {REPEAT} runs")
+    for label, content_class in (
+        ("Member", Member),
+        ("Member with override", OverriddenMember),
+        ("Account", Account),
+        ("Account with override", OverriddenAccount),
+    ):
+        objects = load(fabman, content_class)
+        best = min(
+            timeit.repeat(lambda: read_attributes(objects), number=10, repeat=REPEAT)
+        )
+        print(f"{label:<24} {best / 10 / reads * 1e9:6.1f} ns per read")
+
+
+if __name__ == "__main__":
+    main()
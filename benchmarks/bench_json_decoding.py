@@ -0,0 +1,147 @@
+"""Benchmark of decoding pages of members and resource logs as returned by the API.
+
+Times each installed JSON decoder on the raw bodies, then the full path through a
+PaginatedList, which also builds the objects, and decoding into the typed records of
+fabman.schemas instead. The API is simulated with
+requests_mock, so no network access or API key is needed.
+
+Run from the repository root:
+
+    python benchmarks/bench_json_decoding.py
+"""
+import json
+import os
+import sys
+import timeit
+
+import requests_mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from fabman import Fabman, schemas
+from fabman.decoder import PREFERENCE, get_decoder
+
+PAGE_SIZE = 1000
+REPEAT = 5
+NUMBER = 5
+
+
+def make_member(index: int) -> dict:
+    """A member with its key and trainings embedded, as with embed=key,trainings"""
+    return {
+        "id": index,
+        "account": 1,
+        "space": 1,
+        "memberNumber": str(index),
+        "firstName": "Julian",
+        "lastName": "Bashear",
+        "gender": None,
+        "dateOfBirth": "1990-04-01",
+        "emailAddress": f"member{index}@example.com",
+        "company": "Deep Space Nine",
+        "phone": "+1 555 0100",
+        "address": "1 Promenade",
+        "address2": "",
+        "city": "Bajor",
+        "zip": "12345",
+        "countryCode": "US",
+        "region": "TX",
+        "notes": "Prefers the laser cutter in the evening. " * 3,
+        "state": "active",
+        "language": "en",
+        "hasBillingAddress": False,
+        "requireUpfrontPayment": False,
+        "upfrontMinimumBalance": "0.00",
+        "lockVersion": 3,
+        "createdAt": "2023-06-28T22:16:18.183Z",
+        "updatedAt": "2023-07-02T09:01:44.512Z",
+        "metadata": {"studentId": f"ut{index:06d}", "department": "ECE"},
+        "_embedded": {
+            "key": {"type": "em4102", "token": f"{index:010x}", "state": "active"},
+            "trainings": [
+                {
+                    "id": index * 10 + course,
+                    "trainingCourse": course,
+                    "date": "2023-06-30",
+                    "untilDate": None,
+                    "notes": None,
+                }
+                for course in range(3)
+            ],
+        },
+    }
+
+
+def make_resource_log(index: int) -> dict:
+    return {
+        "id": index,
+        "type": "allowed",
+        "resource": index % 40,
+        "member": index % 700,
+        "createdAt": "2023-07-02T09:01:44.512Z",
+        "updatedAt": "2023-07-02T10:15:02.093Z",
+        "stoppedAt": "2023-07-02T10:15:02.093Z",
+        "idleDurationSeconds": 120,
+        "notes": None,
+        "reason": None,
+        "status": "stopped",
+        "metadata": None,
+        "lockVersion": 1,
+    }
+
+
+def main() -> None:
+    payloads = {
+        "/members": json.dumps([make_member(i) for i in range(PAGE_SIZE)]),
+        "/resource-logs": json.dumps([make_resource_log(i) for i in range(PAGE_SIZE)]),
+    }
+    decoders = {}
+    for name in PREFERENCE:
+        try:
+            decoders[name] = get_decoder(name)
+        except ImportError:
+            print(f"{name} not installed, skipped")
+
+    print(f"Pages of {PAGE_SIZE} records, best of {REPEAT} runs")
+    for endpoint, text in payloads.items():
+        body = text.encode("utf-8")
+        print(f"\n{endpoint} ({len(body) / 1024:.0f} KiB)")
+        for name, decoder in decoders.items():
+            best = min(
+                timeit.repeat(lambda: decoder(body), number=NUMBER, repeat=REPEAT)
+            )
+            print(f"  decode   {name:<8} {best / NUMBER * 1000:7.2f} ms per page")
+
+        with requests_mock.Mocker() as m:
+            m.get(f"https://fabman.io/api/v1{endpoint}", content=body)
+            for name in decoders:
+                fabman = Fabman("benchmark", json_decoder=name)
+                method = (
+                    fabman.get_members
+                    if endpoint == "/members"
+                    else fabman.get_resource_logs
+                )
+                best = min(
+                    timeit.repeat(
+                        lambda: list(method(limit=PAGE_SIZE)),
+                        number=NUMBER,
+                        repeat=REPEAT,
+                    )
+                )
+                print(f"  objects  {name:<8} {best / NUMBER * 1000:7.2f} ms per page")
+
+            # typed records from fabman.schemas, decoded by msgspec if installed
+            best = min(
+                timeit.repeat(
+                    lambda: list(method(limit=PAGE_SIZE).iter_structs()),
+                    number=NUMBER,
+                    repeat=REPEAT,
+                )
+            )
+            backend = "msgspec" if schemas.msgspec is not None else "dataclass"
+            print(f"  structs  {backend:<8} {best / NUMBER * 1000:7.2f} ms per page")
+
+
+if __name__ == "__main__":
+    main()
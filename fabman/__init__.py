@@ -1,6 +1,18 @@
 """Fabman API wrapper."""
+from .async_fabman import AsyncFabman
+from .cache import ResponseCache
 from .fabman import Fabman
+from .metrics import MetricsCollector
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
 
-__all__ = ["Fabman"]
+__all__ = [
+    "AsyncFabman",
+    "Fabman",
+    "MetricsCollector",
+    "RateLimiter",
+    "ResponseCache",
+    "RetryPolicy",
+]
 
 __version__ = "1.2.10"
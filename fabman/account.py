@@ -36,7 +36,7 @@ class Account(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -54,7 +54,7 @@ class Account(FabmanObject):
         uri = f"/accounts/{self.id}/payment-info"
 
         response = self._requester.request("GET", uri, _kwargs=kwargs)
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"account_id": self.id})
 
         return PaymentInfo(self._requester, data)
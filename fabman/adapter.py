@@ -0,0 +1,84 @@
+"""Transport adapter controlling how connections to the Fabman API are pooled and
+kept alive.
+"""
+import socket
+from typing import List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+# seconds between keep-alive probes, and how many may go unanswered
+KEEPALIVE_INTERVAL = 15
+KEEPALIVE_PROBES = 4
+
+
+def keepalive_socket_options(idle: float) -> List[Tuple[int, int, int]]:
+    """
+    Builds socket options enabling TCP keep-alive, so idle pooled connections are
+    not dropped silently by NAT gateways and load balancers. Options the platform
+    does not support are left out.
+
+    :param idle: Seconds a connection is idle before the first keep-alive probe
+    :type idle: float
+    :return: Options for :code:`socket.setsockopt`
+    :rtype: List[Tuple[int, int, int]]
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+
+    idle_option = getattr(socket, "TCP_KEEPIDLE", None)
+    if idle_option is None:
+        # macOS names the idle time differently
+        idle_option = getattr(socket, "TCP_KEEPALIVE", None)
+    if idle_option is not None:
+        options.append((socket.IPPROTO_TCP, idle_option, max(1, int(idle))))
+    if hasattr(socket, "TCP_KEEPINTVL"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL))
+    if hasattr(socket, "TCP_KEEPCNT"):
+        options.append((socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_PROBES))
+    return options
+
+
+class FabmanHTTPAdapter(HTTPAdapter):
+    """
+    :code:`requests.adapters.HTTPAdapter` which can also set socket options, such as
+    TCP keep-alive, on every pooled connection.
+    """
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["socket_options"]
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int = 0,
+        socket_options: Optional[List[Tuple[int, int, int]]] = None,
+    ) -> None:
+        """
+        :param pool_connections: Number of hosts to keep connection pools for,
+            defaults to 10
+        :type pool_connections: int, optional
+        :param pool_maxsize: Maximum number of connections kept open per host. Should
+            be at least the number of threads sharing the client, defaults to 10
+        :type pool_maxsize: int, optional
+        :param max_retries: Number of times to retry failed connection attempts. Only
+            covers failures before the request reaches the server, defaults to 0
+        :type max_retries: int, optional
+        :param socket_options: Options set on every new socket, defaults to urllib3's
+        :type socket_options: Optional[List[Tuple[int, int, int]]], optional
+        """
+        # must be set before HTTPAdapter.__init__ creates the pool manager
+        self.socket_options = socket_options
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
@@ -51,7 +51,7 @@ class ApiKey(FabmanObject):
         uri = f"/api-keys/{self.id}/token"
 
         response = self._requester.request("GET", uri, _kwargs=kwargs)
-        data = response.json()
+        data = self._requester.decode(response)
 
         data.update({"api_key_id": self.id})
 
@@ -74,7 +74,7 @@ class ApiKey(FabmanObject):
         kwargs.update({"lockVersion": self.lockVersion})
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -0,0 +1,268 @@
+"""Asyncio interface to the Fabman API. Mirrors the :code:`Fabman` class so that
+code can be moved between the two with minimal changes. Blocking HTTP calls are
+handed off to a pool of worker threads so the event loop is never blocked and many
+requests can be in flight at once.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+from fabman.bulk import DEFAULT_WORKERS, BulkResult, Operation, run_bulk_async
+from fabman.fabman import Fabman
+from fabman.paginated_list import PaginatedList
+
+DEFAULT_MAX_WORKERS = 10
+
+
+def _coroutine(name: str):
+    """Builds a coroutine method which runs :code:`Fabman.<name>` on the worker pool."""
+    method = getattr(Fabman, name)
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        return await self._run(getattr(self._fabman, name), *args, **kwargs)
+
+    return wrapper
+
+
+def _paginated(name: str):
+    """Builds a method which wraps the :code:`PaginatedList` returned by
+    :code:`Fabman.<name>` in an :code:`AsyncPaginatedList`. No request is made until
+    the list is iterated."""
+    method = getattr(Fabman, name)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return AsyncPaginatedList(
+            getattr(self._fabman, name)(*args, **kwargs), self._run
+        )
+
+    return wrapper
+
+
+class AsyncPaginatedList(object):
+    """Asynchronous counterpart to :code:`fabman.paginated_list.PaginatedList`. Pages
+    are requested on the worker pool as the list is consumed with :code:`async for`.
+    Lists created with :code:`retain=False` keep nothing, as in the synchronous list.
+    """
+
+    def __init__(self, paginated_list: PaginatedList, run: Callable) -> None:
+        """
+        :param paginated_list: The list to wrap
+        :type paginated_list: fabman.paginated_list.PaginatedList
+        :param run: Coroutine function used to run blocking calls off the event loop
+        :type run: Callable
+        """
+        self._paginated_list = paginated_list
+        self._run = run
+        self._lock = None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    def __repr__(self):
+        return f"<AsyncPaginatedList of type {self._paginated_list._content_class.__name__}>"
+
+    async def _iterate(self):
+        if not self._paginated_list._retain:
+            async for element in self._iterate_unretained():
+                yield element
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        index = 0
+        while True:
+            elements = self._paginated_list._elements
+            while index < len(elements):
+                yield elements[index]
+                index += 1
+
+            async with self._lock:
+                # another task may have grown the list while we waited
+                if index < len(self._paginated_list._elements):
+                    continue
+                if not self._paginated_list._has_next():
+                    return
+                await self._run(self._paginated_list._grow)
+
+    async def _iterate_unretained(self):
+        """Iterates a list created with :code:`retain=False` through its own paging,
+        so nothing is kept. Pages are requested on the worker pool one at a time,
+        or, if the list is incremental, objects as they are decoded."""
+        if self._paginated_list._incremental:
+            chunks = ([element] for element in self._paginated_list._iter_unretained())
+        else:
+            chunks = self._paginated_list.iter_pages()
+
+        done = object()
+        while True:
+            chunk = await self._run(next, chunks, done)
+            if chunk is done:
+                return
+            for element in chunk:
+                yield element
+
+    async def get(self, index: int) -> Any:
+        """Retrieves a single element, requesting pages from the API as needed.
+
+        :param index: The index of the element to retrieve
+        :type index: int
+        :return: The element at :code:`index`
+        :rtype: fabman.fabman_object.FabmanObject
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            return await self._run(self._paginated_list.__getitem__, index)
+
+    async def to_list(self) -> list:
+        """Retrieves every element of the list.
+
+        :return: All elements of the list
+        :rtype: list
+        """
+        return [element async for element in self]
+
+
+class AsyncFabman(object):
+    """
+    Asyncio version of :code:`fabman.Fabman`. Every :code:`get_<object>` and
+    :code:`create_<object>` method is a coroutine taking the same arguments as its
+    synchronous counterpart. Methods returning a :code:`PaginatedList` return an
+    :code:`AsyncPaginatedList` immediately, to be consumed with :code:`async for`.
+
+    .. code:: python
+
+        async with AsyncFabman(API_KEY) as fabman:
+            members = await asyncio.gather(*(fabman.get_member(i) for i in ids))
+            async for log in fabman.get_resource_logs(resource=3):
+                ...
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        base_url="https://fabman.io/api/v1",
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ):
+        """
+        :param access_token: The access token to use for the API
+        :type access_token: str
+        :param base_url (optional): The base url to use for the API
+        :type base_url: str
+        :param max_workers (optional): Maximum number of requests in flight at once
+        :type max_workers: int
+
+        Any other keyword arguments, such as :code:`rate_limiter`, are passed on to
+        :code:`Fabman`. The connection pool is sized to :code:`max_workers` unless
+        :code:`pool_maxsize` is given.
+        """
+        kwargs.setdefault("pool_maxsize", max_workers)
+        self._fabman = Fabman(access_token, base_url, **kwargs)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="fabman"
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def close(self) -> None:
+        """Waits for outstanding requests to finish and shuts down the worker pool."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+
+    async def bulk(
+        self,
+        operations: Iterable[Operation],
+        workers: int = DEFAULT_WORKERS,
+        callback: Optional[Callable[[BulkResult], None]] = None,
+    ) -> List[BulkResult]:
+        """
+        Runs many calls concurrently, like :code:`Fabman.bulk`. Operations may be
+        the coroutine methods of this client, which are awaited, or blocking
+        callables such as :code:`MemberCredit.update`, which run on the worker pool.
+
+        .. code:: python
+
+            results = await fabman.bulk(
+                (fabman.create_member, {"account": 1, "firstName": name})
+                for name in names
+            )
+
+        :param operations: Callables taking no arguments, or :code:`(callable, kwargs)`
+            pairs
+        :type operations: Iterable[Union[Callable, Tuple[Callable, dict]]]
+        :param workers: Number of calls made at once, defaults to 4
+        :type workers: int, optional
+        :param callback: Called with each result in order as the batch progresses
+        :type callback: Optional[Callable[[fabman.bulk.BulkResult], None]], optional
+        :returns: The outcome of each operation, in the order of :code:`operations`
+        :rtype: List[fabman.bulk.BulkResult]
+        """
+        return await run_bulk_async(
+            operations, self._run, workers=workers, callback=callback
+        )
+
+    create_api_key = _coroutine("create_api_key")
+    create_booking = _coroutine("create_booking")
+    create_charge = _coroutine("create_charge")
+    create_invoice = _coroutine("create_invoice")
+    create_key_assignment = _coroutine("create_key_assignment")
+    create_member = _coroutine("create_member")
+    create_package = _coroutine("create_package")
+    create_payment = _coroutine("create_payment")
+    create_resource = _coroutine("create_resource")
+    create_resource_log = _coroutine("create_resource_log")
+    create_resource_type = _coroutine("create_resource_type")
+    create_space = _coroutine("create_space")
+    create_training_course = _coroutine("create_training_course")
+    create_webhook = _coroutine("create_webhook")
+
+    get_account = _coroutine("get_account")
+    get_accounts = _paginated("get_accounts")
+    get_api_key = _coroutine("get_api_key")
+    get_api_keys = _paginated("get_api_keys")
+    get_booking = _coroutine("get_booking")
+    get_bookings = _paginated("get_bookings")
+    get_bookings_by_ids = _coroutine("get_bookings_by_ids")
+    get_charge = _coroutine("get_charge")
+    get_charges = _paginated("get_charges")
+    get_invoice = _coroutine("get_invoice")
+    get_invoices = _paginated("get_invoices")
+    get_invoices_by_ids = _coroutine("get_invoices_by_ids")
+    get_job = _coroutine("get_job")
+    get_jobs = _paginated("get_jobs")
+    get_member = _coroutine("get_member")
+    get_members = _paginated("get_members")
+    get_members_by_ids = _coroutine("get_members_by_ids")
+    get_package = _coroutine("get_package")
+    get_packages = _paginated("get_packages")
+    get_payment = _coroutine("get_payment")
+    get_payments = _paginated("get_payments")
+    get_resource = _coroutine("get_resource")
+    get_resources = _paginated("get_resources")
+    get_resources_by_ids = _coroutine("get_resources_by_ids")
+    get_resource_log = _coroutine("get_resource_log")
+    get_resource_logs = _paginated("get_resource_logs")
+    get_resource_types = _paginated("get_resource_types")
+    get_space = _coroutine("get_space")
+    get_spaces = _paginated("get_spaces")
+    get_training_course = _coroutine("get_training_course")
+    get_training_courses = _paginated("get_training_courses")
+    get_user = _coroutine("get_user")
+    get_webhook = _coroutine("get_webhook")
+    get_webhooks = _paginated("get_webhooks")
@@ -3,6 +3,7 @@
 import requests
 
 from fabman.fabman_object import FabmanObject
+from fabman.fields import BOOKING_FIELDS
 
 
 class Booking(FabmanObject):
@@ -11,6 +12,9 @@ class Booking(FabmanObject):
     https://fabman.io/api/v1/documentation#/bookings
     """
 
+    __slots__ = tuple(BOOKING_FIELDS)
+    __annotations__ = dict(BOOKING_FIELDS)
+
     def __str__(self):
         return f"Booking #{self.id}: {self.fromDateTime} - {self.untilDateTime}"
 
@@ -49,7 +53,6 @@ class Booking(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
-        for attr, val in data.items():
-            setattr(self, attr, val)
+        self.set_attributes(data)
@@ -0,0 +1,162 @@
+"""Runs many API calls concurrently, collecting the outcome of each one. Used by
+:code:`Fabman.bulk` and :code:`AsyncFabman.bulk`.
+"""
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Union
+
+DEFAULT_WORKERS = 4
+
+Operation = Union[Callable[[], Any], Tuple[Callable[..., Any], dict]]
+
+
+class BulkResult(object):
+    """Outcome of a single operation passed to :code:`Fabman.bulk`"""
+
+    def __init__(
+        self,
+        index: int,
+        operation: Operation,
+        result: Any = None,
+        exception: Optional[Exception] = None,
+    ) -> None:
+        """
+        :param index: Position of the operation in the batch
+        :type index: int
+        :param operation: The operation as it was passed in
+        :param result: Return value of the operation, if it succeeded
+        :type result: Any
+        :param exception: Exception raised by the operation, if it failed
+        :type exception: Optional[Exception]
+        """
+        self.index = index
+        self.operation = operation
+        self.result = result
+        self.exception = exception
+
+    def __repr__(self):
+        if self.ok:
+            return f"<BulkResult #{self.index} ok: {self.result!r}>"
+        return f"<BulkResult #{self.index} failed: {self.exception!r}>"
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded"""
+        return self.exception is None
+
+
+def _split(operation: Operation) -> Tuple[Callable[..., Any], dict]:
+    if callable(operation):
+        return operation, {}
+    return operation
+
+
+def _run(index: int, operation: Operation) -> BulkResult:
+    try:
+        func, kwargs = _split(operation)
+        result = func(**kwargs)
+    except Exception as exception:  # pylint: disable=broad-except
+        return BulkResult(index, operation, exception=exception)
+    return BulkResult(index, operation, result=result)
+
+
+async def _run_async(
+    index: int, operation: Operation, run: Callable, semaphore: asyncio.Semaphore
+) -> BulkResult:
+    async with semaphore:
+        try:
+            func, kwargs = _split(operation)
+            if inspect.iscoroutinefunction(func):
+                result = await func(**kwargs)
+            else:
+                result = await run(func, **kwargs)
+                # e.g. a lambda returning a coroutine
+                if inspect.isawaitable(result):
+                    result = await result
+        except Exception as exception:  # pylint: disable=broad-except
+            return BulkResult(index, operation, exception=exception)
+    return BulkResult(index, operation, result=result)
+
+
+def run_bulk(
+    operations: Iterable[Operation],
+    workers: int = DEFAULT_WORKERS,
+    callback: Optional[Callable[[BulkResult], None]] = None,
+) -> List[BulkResult]:
+    """
+    Runs operations on a pool of worker threads. An operation which raises is
+    recorded and does not stop the others.
+
+    :param operations: Callables taking no arguments, or :code:`(callable, kwargs)`
+        pairs
+    :type operations: Iterable[Union[Callable, Tuple[Callable, dict]]]
+    :param workers: Number of operations run at once, defaults to 4
+    :type workers: int, optional
+    :param callback: Called with each result, in the order of :code:`operations`,
+        as soon as it and every operation before it have finished
+    :type callback: Optional[Callable[[BulkResult], None]], optional
+    :return: One result per operation, in the order of :code:`operations`
+    :rtype: List[BulkResult]
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    results = []
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="fabman-bulk"
+    ) as executor:
+        futures = [
+            executor.submit(_run, index, operation)
+            for index, operation in enumerate(operations)
+        ]
+        for future in futures:
+            result = future.result()
+            if callback is not None:
+                callback(result)
+            results.append(result)
+
+    return results
+
+
+async def run_bulk_async(
+    operations: Iterable[Operation],
+    run: Callable,
+    workers: int = DEFAULT_WORKERS,
+    callback: Optional[Callable[[BulkResult], None]] = None,
+) -> List[BulkResult]:
+    """
+    Asyncio counterpart to :code:`run_bulk`. Coroutine functions, and callables
+    returning an awaitable, are awaited on the event loop. Other callables are
+    handed to :code:`run` so they do not block it. At most :code:`workers`
+    operations are in progress at once.
+
+    :param operations: Callables taking no arguments, or :code:`(callable, kwargs)`
+        pairs
+    :type operations: Iterable[Union[Callable, Tuple[Callable, dict]]]
+    :param run: Coroutine function running a blocking callable off the event loop
+    :type run: Callable
+    :param workers: Number of operations run at once, defaults to 4
+    :type workers: int, optional
+    :param callback: Called with each result, in the order of :code:`operations`,
+        as soon as it and every operation before it have finished
+    :type callback: Optional[Callable[[BulkResult], None]], optional
+    :return: One result per operation, in the order of :code:`operations`
+    :rtype: List[BulkResult]
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    semaphore = asyncio.Semaphore(workers)
+    tasks = [
+        asyncio.ensure_future(_run_async(index, operation, run, semaphore))
+        for index, operation in enumerate(operations)
+    ]
+    results = []
+    for task in tasks:
+        result = await task
+        if callback is not None:
+            callback(result)
+        results.append(result)
+
+    return results
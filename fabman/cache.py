@@ -0,0 +1,176 @@
+"""Caching of GET responses returned by the Fabman API"""
+import hashlib
+import threading
+from collections import OrderedDict
+from time import monotonic
+from typing import Hashable, Optional, Tuple
+
+import requests
+
+
+class CacheEntry(object):
+    """A cached response and the information needed to revalidate it"""
+
+    def __init__(self, response: requests.Response, ttl: float) -> None:
+        """
+        :param response: The response to cache
+        :type response: requests.Response
+        :param ttl: Seconds the response is considered fresh for
+        :type ttl: float
+        """
+        self.response = response
+        self.size = len(response.content or b"")
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.expires = monotonic() + ttl
+
+    def is_fresh(self) -> bool:
+        """Whether the entry can be used without asking the server"""
+        return monotonic() < self.expires
+
+    def validators(self) -> dict:
+        """Conditional request headers used to revalidate a stale entry"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache(object):
+    """
+    Least recently used cache of successful GET responses, keyed by URL, query
+    parameters and credentials. Entries are evicted once there are more than :code:`max_entries` of
+    them or their bodies add up to more than :code:`max_bytes`.
+
+    Entries are served without a request for :code:`ttl` seconds. After that, entries
+    which carry an :code:`ETag` or :code:`Last-Modified` header are revalidated with a
+    conditional request, so an unchanged resource costs a :code:`304 Not Modified`
+    rather than a full download. Entries are safe to share between threads.
+    """
+
+    def __init__(
+        self, max_entries: int = 256, max_bytes: int = 16 * 1024**2, ttl: float = 30.0
+    ) -> None:
+        """
+        :param max_entries: Maximum number of cached responses, defaults to 256
+        :type max_entries: int, optional
+        :param max_bytes: Maximum total size of cached bodies, defaults to 16 MiB
+        :type max_bytes: int, optional
+        :param ttl: Seconds a response is served without revalidation, defaults to 30
+        :type ttl: float, optional
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"<ResponseCache with {len(self)} entries, {self.size} bytes>"
+
+    @staticmethod
+    def make_key(
+        url: str, params: Optional[dict] = None, credentials: Optional[str] = None
+    ) -> Tuple[str, tuple, str]:
+        """
+        Builds the cache key of a request. Parameter order does not matter.
+
+        Requests made with different credentials get different keys, so a cache
+        shared by clients using different API keys never serves the responses of one
+        to the other. Only a hash of the credentials is kept.
+
+        :param url: Full URL of the request
+        :type url: str
+        :param params: Query parameters of the request
+        :type params: Optional[dict]
+        :param credentials: Access token the request is made with
+        :type credentials: Optional[str]
+        :return: The cache key
+        :rtype: tuple
+        """
+        items = []
+        for name, value in sorted((params or {}).items()):
+            if isinstance(value, list):
+                value = tuple(value)
+            if not isinstance(value, Hashable):
+                value = repr(value)
+            items.append((name, value))
+        digest = ""
+        if credentials:
+            digest = hashlib.sha256(credentials.encode("utf-8")).hexdigest()
+        return url, tuple(items), digest
+
+    def get(self, key: tuple) -> Optional[CacheEntry]:
+        """
+        Looks up an entry, fresh or stale, and marks it as recently used.
+
+        :param key: Key from :code:`make_key`
+        :type key: tuple
+        :return: The entry if there is one
+        :rtype: Optional[CacheEntry]
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, response: requests.Response) -> None:
+        """
+        Stores a response, evicting least recently used entries to make room.
+        Responses larger than :code:`max_bytes` are not cached.
+
+        :param key: Key from :code:`make_key`
+        :type key: tuple
+        :param response: The response to store
+        :type response: requests.Response
+        """
+        entry = CacheEntry(response, self.ttl)
+        with self._lock:
+            self._remove(key)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.size += entry.size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def refresh(self, key: tuple) -> None:
+        """
+        Marks an entry as fresh again after the server confirmed it is unchanged.
+
+        :param key: Key from :code:`make_key`
+        :type key: tuple
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires = monotonic() + self.ttl
+
+    def invalidate(self, url_prefix: str) -> None:
+        """
+        Removes every entry whose URL starts with :code:`url_prefix`.
+
+        :param url_prefix: URL prefix to remove, e.g. :code:`https://fabman.io/api/v1/members`
+        :type url_prefix: str
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0].startswith(url_prefix)]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Removes all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
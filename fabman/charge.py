@@ -3,11 +3,15 @@
 import requests
 
 from fabman.fabman_object import FabmanObject
+from fabman.fields import CHARGE_FIELDS
 
 
 class Charge(FabmanObject):
     """Charge object handles management of charges in fabman"""
 
+    __slots__ = tuple(CHARGE_FIELDS)
+    __annotations__ = dict(CHARGE_FIELDS)
+
     def __str__(self):
         return f"Charge #{self.id}: {self.price} {self.description}"
 
@@ -44,7 +48,6 @@ class Charge(FabmanObject):
 
         response = self._requester.request("PUT", f"/charges/{self.id}", _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
-        for attr, val in data.items():
-            setattr(self, attr, val)
+        self.set_attributes(data)
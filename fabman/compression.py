@@ -0,0 +1,52 @@
+"""Compression of responses sent by the Fabman API. Responses are decoded by urllib3,
+which can decode brotli when the brotli or brotlicffi package is installed, and
+zstd when zstandard is installed with urllib3 2. Installing one of them is all it
+takes to have it negotiated.
+"""
+from typing import List, Optional
+
+import requests
+from urllib3.util.request import ACCEPT_ENCODING
+
+# most compact first
+PREFERENCE = ("zstd", "br", "gzip", "deflate")
+
+
+def supported_encodings() -> List[str]:
+    """
+    Lists the content encodings this installation can decode, most compact first.
+
+    :rtype: List[str]
+    """
+    available = {encoding.strip() for encoding in ACCEPT_ENCODING.split(",")}
+    return [encoding for encoding in PREFERENCE if encoding in available]
+
+
+def accept_encoding(compression: bool = True) -> str:
+    """
+    Builds the :code:`Accept-Encoding` header sent with every request.
+
+    :param compression: Whether to ask for compressed responses, defaults to True
+    :type compression: bool, optional
+    :return: Every supported encoding, or :code:`identity` if compression is off
+    :rtype: str
+    """
+    if not compression:
+        return "identity"
+    return ", ".join(supported_encodings())
+
+
+def wire_size(response: requests.Response) -> Optional[int]:
+    """
+    Reads how many bytes of the response body were transferred, i.e. its size
+    before decompression. Only known once the body has been read.
+
+    :param response: The response
+    :type response: requests.Response
+    :return: The number of bytes read from the connection, if known
+    :rtype: Optional[int]
+    """
+    try:
+        return int(response.raw.tell())
+    except (AttributeError, TypeError, ValueError, OSError):
+        return None
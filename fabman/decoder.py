@@ -0,0 +1,63 @@
+"""Decoding of the JSON bodies returned by the Fabman API. orjson and msgspec decode
+large pages several times faster than the standard library and are used when
+installed; neither is a dependency of this package.
+"""
+import json
+from typing import Any, Callable, Union
+
+Decoder = Callable[[bytes], Any]
+
+# fastest first
+PREFERENCE = ("orjson", "msgspec", "json")
+
+
+def _orjson() -> Decoder:
+    import orjson  # pylint: disable=import-outside-toplevel
+
+    return orjson.loads
+
+
+def _msgspec() -> Decoder:
+    import msgspec  # pylint: disable=import-outside-toplevel
+
+    return msgspec.json.Decoder().decode
+
+
+def _json() -> Decoder:
+    # json.loads detects the encoding of bytes itself
+    return json.loads
+
+
+LOADERS = {"orjson": _orjson, "msgspec": _msgspec, "json": _json}
+
+
+def get_decoder(decoder: Union[None, str, Decoder] = None) -> Decoder:
+    """
+    Picks the function used to decode JSON bodies.
+
+    :param decoder: Name of a decoder from :code:`PREFERENCE`, a function decoding
+        bytes, or None for the fastest one installed, defaults to None
+    :type decoder: Union[None, str, Callable[[bytes], Any]], optional
+    :raises ValueError: The decoder name is unknown
+    :raises ImportError: The named decoder is not installed
+    :return: A function decoding bytes
+    :rtype: Callable[[bytes], Any]
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is not None:
+        if decoder not in LOADERS:
+            raise ValueError(
+                f"Unknown JSON decoder {decoder!r}, expected one of {PREFERENCE}"
+            )
+        try:
+            return LOADERS[decoder]()
+        except ImportError as error:
+            raise ImportError(f"JSON decoder {decoder} is not installed") from error
+
+    for name in PREFERENCE[:-1]:
+        try:
+            return LOADERS[name]()
+        except ImportError:
+            pass
+    return _json()
@@ -68,3 +68,9 @@ class RateLimitExceeded(FabmanException):
     The request was valid, but too may requests have been issued from this access token.
     Please try again later.
     """
+
+
+class SchemaError(FabmanException):
+    """
+    A response did not match the schema it was decoded with.
+    """
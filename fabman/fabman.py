@@ -3,34 +3,64 @@
 """
 
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple, Union
 
 import requests
 
 from fabman.account import Account
+from fabman.adapter import DEFAULT_POOL_MAXSIZE
 from fabman.api_key import ApiKey
 from fabman.booking import Booking
+from fabman.bulk import DEFAULT_WORKERS, BulkResult, Operation, run_bulk
+from fabman.cache import ResponseCache
 from fabman.charge import Charge
+from fabman.decoder import Decoder
+from fabman.exceptions import ResourceDoesNotExist
 from fabman.invoice import Invoice
 from fabman.job import Job
+from fabman.log import DEFAULT_BODY_LIMIT
 from fabman.member import Member
+from fabman.metrics import MetricsHook
 from fabman.package import Package
 from fabman.paginated_list import PaginatedList
 from fabman.payment import Payment
+from fabman.rate_limiter import RateLimiter
 from fabman.requester import Requester
 from fabman.resource import Resource
 from fabman.resource_log import ResourceLog
 from fabman.resource_type import ResourceType
+from fabman.retry import RetryPolicy
 from fabman.space import Space
 from fabman.training_course import TrainingCourse
 from fabman.webhook import Webhook
 
+DEFAULT_MAX_WORKERS = 8
+
 
 class Fabman(object):
     """
     The main class to be instantiated to provide access to the Fabman api.
     """
 
-    def __init__(self, access_token: str, base_url="https://fabman.io/api/v1"):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        access_token: str,
+        base_url="https://fabman.io/api/v1",
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int = 0,
+        timeout: Union[None, float, Tuple[float, float]] = None,
+        keepalive: Optional[float] = None,
+        metrics: Union[None, MetricsHook, Iterable[MetricsHook]] = None,
+        log_body_limit: Optional[int] = DEFAULT_BODY_LIMIT,
+        log_sample_rate: float = 1.0,
+        coalesce: bool = False,
+        compression: bool = True,
+        json_decoder: Union[None, str, Decoder] = None,
+    ):
         """
         Initializes the Fabman class with the given access token and base url.
         All methods take kwargs as their arguments, please refer to the Fabman API
@@ -40,6 +70,50 @@ class Fabman(object):
         :type access_token: str
         :param base_url (optional): The base url to use for the API
         :type base_url: str
+        :param rate_limiter (optional): Paces requests client side. The same
+            :code:`RateLimiter` may be shared between several clients and threads.
+        :type rate_limiter: fabman.RateLimiter
+        :param retry_policy (optional): Retries rate limited requests, server errors and
+            connection errors. By default requests are never retried.
+        :type retry_policy: fabman.RetryPolicy
+        :param cache (optional): Caches GET responses. By default nothing is cached.
+        :type cache: fabman.ResponseCache
+        :param pool_maxsize (optional): Maximum number of connections kept open to the
+            API. Set this to at least the number of threads sharing the client, so
+            connections are reused rather than discarded, defaults to 10
+        :type pool_maxsize: int
+        :param max_retries (optional): Number of times to retry failed connection
+            attempts, defaults to 0
+        :type max_retries: int
+        :param timeout (optional): Seconds to wait for the server, either for both
+            connecting and reading or as a :code:`(connect, read)` tuple. By default
+            requests wait forever.
+        :type timeout: Union[float, Tuple[float, float]]
+        :param keepalive (optional): Enable TCP keep-alive, probing connections idle for
+            this many seconds, so firewalls do not drop pooled connections
+        :type keepalive: float
+        :param metrics (optional): Called with a :code:`fabman.metrics.RequestEvent`
+            for every request, e.g. a :code:`fabman.MetricsCollector`. A list of
+            callbacks may be given.
+        :type metrics: Union[Callable, Iterable[Callable]]
+        :param log_body_limit (optional): Bytes of each response body logged at DEBUG
+            level at most, or None for whole bodies, defaults to 4096
+        :type log_body_limit: int
+        :param log_sample_rate (optional): Fraction of response bodies logged at DEBUG
+            level, defaults to 1 (all of them)
+        :type log_sample_rate: float
+        :param coalesce (optional): Let identical GET requests made at the same time,
+            e.g. by several threads looking up the same member, share one HTTP call
+            and its response, defaults to False
+        :type coalesce: bool
+        :param compression (optional): Ask for compressed responses. Brotli and zstd
+            are negotiated when the packages decoding them are installed, defaults to
+            True
+        :type compression: bool
+        :param json_decoder (optional): Decodes response bodies: "orjson", "msgspec",
+            "json" or a function decoding bytes. By default the fastest decoder
+            installed is used.
+        :type json_decoder: Union[str, Callable[[bytes], Any]]
         """
 
         if "https://" not in base_url:
@@ -62,7 +136,78 @@ class Fabman(object):
         if base_url[-1] == "/":
             base_url = base_url[:-1]
 
-        self.__requester = Requester(base_url, access_token)
+        self.__requester = Requester(
+            base_url,
+            access_token,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            timeout=timeout,
+            keepalive=keepalive,
+            metrics=metrics,
+            log_body_limit=log_body_limit,
+            log_sample_rate=log_sample_rate,
+            coalesce=coalesce,
+            compression=compression,
+            json_decoder=json_decoder,
+        )
+
+    @staticmethod
+    def __get_by_ids(
+        get_one: Callable, ids: Iterable[int], max_workers: int, kwargs: dict
+    ) -> list:
+        """Calls :code:`get_one` for every distinct id concurrently. Returns the
+        results in the order of :code:`ids`, with None for ids which do not exist."""
+        ids = list(ids)
+        unique = list(dict.fromkeys(ids))
+        if not unique:
+            return []
+
+        def get(object_id):
+            try:
+                return get_one(object_id, **kwargs)
+            except ResourceDoesNotExist:
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(unique)), thread_name_prefix="fabman"
+        ) as executor:
+            found = dict(zip(unique, executor.map(get, unique)))
+
+        return [found[object_id] for object_id in ids]
+
+    def bulk(
+        self,
+        operations: Iterable[Operation],
+        workers: int = DEFAULT_WORKERS,
+        callback: Optional[Callable[[BulkResult], None]] = None,
+    ) -> List[BulkResult]:
+        """
+        Runs many calls, such as :code:`create_member` or :code:`MemberCredit.update`,
+        concurrently. A call which fails is recorded and does not stop the others.
+        Calls made through this client share its rate limiter and retry policy.
+
+        .. code:: python
+
+            results = fabman.bulk(
+                (fabman.create_member, {"account": 1, "firstName": name})
+                for name in names
+            )
+            failed = [result for result in results if not result.ok]
+
+        :param operations: Callables taking no arguments, or :code:`(callable, kwargs)`
+            pairs
+        :type operations: Iterable[Union[Callable, Tuple[Callable, dict]]]
+        :param workers: Number of calls made at once, defaults to 4
+        :type workers: int, optional
+        :param callback: Called with each result in order as the batch progresses
+        :type callback: Optional[Callable[[fabman.bulk.BulkResult], None]], optional
+        :returns: The outcome of each operation, in the order of :code:`operations`
+        :rtype: List[fabman.bulk.BulkResult]
+        """
+        return run_bulk(operations, workers=workers, callback=callback)
 
     def create_api_key(self, **kwargs) -> ApiKey:
         """
@@ -78,7 +223,7 @@ class Fabman(object):
         uri = "/api-keys"
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return ApiKey(self.__requester, response.json())
+        return ApiKey(self.__requester, self.__requester.decode(response))
 
     def create_booking(self, **kwargs) -> Booking:
         """
@@ -95,7 +240,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Booking(self.__requester, response.json())
+        return Booking(self.__requester, self.__requester.decode(response))
 
     def create_charge(self, **kwargs) -> Charge:
         """
@@ -112,7 +257,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Charge(self.__requester, response.json())
+        return Charge(self.__requester, self.__requester.decode(response))
 
     def create_invoice(self, **kwargs) -> Invoice:
         """
@@ -129,7 +274,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Invoice(self.__requester, response.json())
+        return Invoice(self.__requester, self.__requester.decode(response))
 
     def create_key_assignment(self, **kwargs) -> requests.Response:
         """
@@ -165,7 +310,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Member(self.__requester, response.json())
+        return Member(self.__requester, self.__requester.decode(response))
 
     def create_package(self, **kwargs) -> Package:
         """
@@ -182,7 +327,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Package(self.__requester, response.json())
+        return Package(self.__requester, self.__requester.decode(response))
 
     def create_payment(self, **kwargs) -> Payment:
         """
@@ -199,7 +344,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Payment(self.__requester, response.json())
+        return Payment(self.__requester, self.__requester.decode(response))
 
     def create_resource(self, **kwargs) -> Resource:
         """
@@ -216,7 +361,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Resource(self.__requester, response.json())
+        return Resource(self.__requester, self.__requester.decode(response))
 
     def create_resource_log(self, **kwargs) -> ResourceLog:
         """
@@ -232,7 +377,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return ResourceLog(self.__requester, response.json())
+        return ResourceLog(self.__requester, self.__requester.decode(response))
 
     def create_resource_type(self, **kwargs) -> ResourceType:
         """
@@ -248,7 +393,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return ResourceType(self.__requester, response.json())
+        return ResourceType(self.__requester, self.__requester.decode(response))
 
     def create_space(self, **kwargs) -> Space:
         """
@@ -264,7 +409,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Space(self.__requester, response.json())
+        return Space(self.__requester, self.__requester.decode(response))
 
     def create_training_course(self, **kwargs) -> TrainingCourse:
         """
@@ -281,7 +426,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return TrainingCourse(self.__requester, response.json())
+        return TrainingCourse(self.__requester, self.__requester.decode(response))
 
     def create_webhook(self, **kwargs) -> Webhook:
         """
@@ -298,7 +443,7 @@ class Fabman(object):
 
         response = self.__requester.request("POST", uri, _kwargs=kwargs)
 
-        return Webhook(self.__requester, response.json())
+        return Webhook(self.__requester, self.__requester.decode(response))
 
     def get_account(self, account_id, **kwargs) -> Account:
         """
@@ -319,7 +464,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Account(self.__requester, response.json())
+        return Account(self.__requester, self.__requester.decode(response))
 
     def get_accounts(self, **kwargs) -> PaginatedList:
         """
@@ -351,7 +496,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return ApiKey(self.__requester, response.json())
+        return ApiKey(self.__requester, self.__requester.decode(response))
 
     def get_api_keys(self, **kwargs) -> PaginatedList:
         """
@@ -382,7 +527,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Booking(self.__requester, response.json())
+        return Booking(self.__requester, self.__requester.decode(response))
 
     def get_bookings(self, **kwargs) -> PaginatedList:
         """
@@ -397,6 +542,29 @@ class Fabman(object):
         """
         return PaginatedList(Booking, self.__requester, "GET", "/bookings", **kwargs)
 
+    def get_bookings_by_ids(
+        self,
+        booking_ids: Iterable[int],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ) -> List[Optional[Booking]]:
+        """
+        Retrieves many bookings at once. Duplicate ids are requested once and the
+        remaining requests are sent concurrently. Responses held by the client's
+        :code:`ResponseCache`, if any, are served without a request.
+
+        :calls: "GET /bookings/{id}" for each distinct id
+
+        :param booking_ids: The ids of the bookings to retrieve
+        :type booking_ids: Iterable[int]
+        :param max_workers: Maximum number of requests in flight at once, defaults to 8
+        :type max_workers: int, optional
+        :returns: The bookings in the order of :code:`booking_ids`, with None for ids
+            which do not exist
+        :rtype: List[Optional[fabman.Booking]]
+        """
+        return self.__get_by_ids(self.get_booking, booking_ids, max_workers, kwargs)
+
     def get_charge(self, charge_id: int, **kwargs) -> Charge:
         """
         Retrieves a single Charge given the charge_id.
@@ -414,7 +582,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Charge(self.__requester, response.json())
+        return Charge(self.__requester, self.__requester.decode(response))
 
     def get_charges(self, **kwargs) -> PaginatedList:
         """
@@ -446,7 +614,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Invoice(self.__requester, response.json())
+        return Invoice(self.__requester, self.__requester.decode(response))
 
     def get_invoices(self, **kwargs) -> PaginatedList:
         """
@@ -461,6 +629,29 @@ class Fabman(object):
 
         return PaginatedList(Invoice, self.__requester, "GET", "/invoices", **kwargs)
 
+    def get_invoices_by_ids(
+        self,
+        invoice_ids: Iterable[int],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ) -> List[Optional[Invoice]]:
+        """
+        Retrieves many invoices at once. Duplicate ids are requested once and the
+        remaining requests are sent concurrently. Responses held by the client's
+        :code:`ResponseCache`, if any, are served without a request.
+
+        :calls: "GET /invoices/{id}" for each distinct id
+
+        :param invoice_ids: The ids of the invoices to retrieve
+        :type invoice_ids: Iterable[int]
+        :param max_workers: Maximum number of requests in flight at once, defaults to 8
+        :type max_workers: int, optional
+        :returns: The invoices in the order of :code:`invoice_ids`, with None for ids
+            which do not exist
+        :rtype: List[Optional[fabman.Invoice]]
+        """
+        return self.__get_by_ids(self.get_invoice, invoice_ids, max_workers, kwargs)
+
     def get_job(self, job_id, **kwargs) -> Job:
         """
         Retrieve a single job from the Fabman API given the job_id.
@@ -476,7 +667,7 @@ class Fabman(object):
         uri = f"/jobs/{job_id}"
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Job(self.__requester, response.json())
+        return Job(self.__requester, self.__requester.decode(response))
 
     def get_jobs(self, **kwargs) -> PaginatedList:
         """
@@ -504,7 +695,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Member(self.__requester, response.json())
+        return Member(self.__requester, self.__requester.decode(response))
 
     def get_members(self, **kwargs):
         """Get all of the members in the Fabman database. Can specify filters,
@@ -520,6 +711,29 @@ class Fabman(object):
 
         return PaginatedList(Member, self.__requester, "GET", "/members", **kwargs)
 
+    def get_members_by_ids(
+        self,
+        member_ids: Iterable[int],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ) -> List[Optional[Member]]:
+        """
+        Retrieves many members at once. Duplicate ids are requested once and the
+        remaining requests are sent concurrently. Responses held by the client's
+        :code:`ResponseCache`, if any, are served without a request.
+
+        :calls: "GET /members/{id}" for each distinct id
+
+        :param member_ids: The ids of the members to retrieve
+        :type member_ids: Iterable[int]
+        :param max_workers: Maximum number of requests in flight at once, defaults to 8
+        :type max_workers: int, optional
+        :returns: The members in the order of :code:`member_ids`, with None for ids
+            which do not exist
+        :rtype: List[Optional[fabman.Member]]
+        """
+        return self.__get_by_ids(self.get_member, member_ids, max_workers, kwargs)
+
     def get_package(self, package_id: int, **kwargs) -> Package:
         """
         Retrieves a single Package given a package_id
@@ -537,7 +751,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Package(self.__requester, response.json())
+        return Package(self.__requester, self.__requester.decode(response))
 
     def get_packages(self, **kwargs) -> PaginatedList:
         """
@@ -569,7 +783,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Payment(self.__requester, response.json())
+        return Payment(self.__requester, self.__requester.decode(response))
 
     def get_payments(self, **kwargs) -> PaginatedList:
         """
@@ -600,7 +814,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Resource(self.__requester, response.json())
+        return Resource(self.__requester, self.__requester.decode(response))
 
     def get_resources(self, **kwargs) -> PaginatedList:
         """
@@ -621,6 +835,29 @@ class Fabman(object):
             **kwargs,
         )
 
+    def get_resources_by_ids(
+        self,
+        resource_ids: Iterable[int],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        **kwargs,
+    ) -> List[Optional[Resource]]:
+        """
+        Retrieves many resources at once. Duplicate ids are requested once and the
+        remaining requests are sent concurrently. Responses held by the client's
+        :code:`ResponseCache`, if any, are served without a request.
+
+        :calls: "GET /resources/{id}" for each distinct id
+
+        :param resource_ids: The ids of the resources to retrieve
+        :type resource_ids: Iterable[int]
+        :param max_workers: Maximum number of requests in flight at once, defaults to 8
+        :type max_workers: int, optional
+        :returns: The resources in the order of :code:`resource_ids`, with None for ids
+            which do not exist
+        :rtype: List[Optional[fabman.Resource]]
+        """
+        return self.__get_by_ids(self.get_resource, resource_ids, max_workers, kwargs)
+
     def get_resource_log(self, resource_log_id, **kwargs) -> ResourceLog:
         """
         Retrieves a single Resource Log from the API.
@@ -638,7 +875,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return ResourceLog(self.__requester, response.json())
+        return ResourceLog(self.__requester, self.__requester.decode(response))
 
     def get_resource_logs(self, **kwargs) -> PaginatedList:
         """
@@ -687,7 +924,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Space(self.__requester, response.json())
+        return Space(self.__requester, self.__requester.decode(response))
 
     def get_spaces(self, **kwargs) -> PaginatedList:
         """
@@ -718,7 +955,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return TrainingCourse(self.__requester, response.json())
+        return TrainingCourse(self.__requester, self.__requester.decode(response))
 
     def get_training_courses(self, **kwargs):
         """
@@ -747,7 +984,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Member(self.__requester, response.json()["members"][0])
+        return Member(self.__requester, self.__requester.decode(response)["members"][0])
 
     def get_webhook(self, webhook_id, **kwargs) -> Webhook:
         """
@@ -766,7 +1003,7 @@ class Fabman(object):
 
         response = self.__requester.request("GET", uri, _kwargs=kwargs)
 
-        return Webhook(self.__requester, response.json())
+        return Webhook(self.__requester, self.__requester.decode(response))
 
     def get_webhooks(self, **kwargs) -> PaginatedList:
         """
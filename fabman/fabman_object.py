@@ -14,12 +14,87 @@ class FabmanObject(object):
 
     Based off of canvasapi.canvas_object.CanvasObject found at
     https://github.com/ucfopen/canvasapi/blob/develop/canvasapi/canvas_object.py
+
+    Subclasses which declare :code:`__slots__` for the fields the API returns store
+    them in fixed slots instead of a per-instance :code:`__dict__`, which takes a
+    fraction of the memory. Any other fields, and any other attribute assigned to the
+    object, go to a side dictionary, so they are read and written like on any other
+    object. :code:`vars()` returns a copy of the attributes of such objects.
+
+    Objects created with :code:`lazy=True` keep the decoded JSON object as it is and
+    only turn a field into an attribute the first time it is read.
     """
 
-    def __getattribute__(self, __name: str) -> Any:
-        return super(FabmanObject, self).__getattribute__(__name)
+    __slots__ = ("_requester", "_embedded", "_extra", "_raw", "__weakref__")
+
+    _internal = frozenset(("_requester", "_extra", "_raw"))
+
+    # names of the attribute slots filled by set_attributes, or None if the class
+    # stores its attributes in a regular instance __dict__
+    _fields = frozenset(("_embedded",))
+    _field_order = ("_embedded",)
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        mro = cls.__mro__[:-1]
+        if not all("__slots__" in klass.__dict__ for klass in mro):
+            cls._fields = None
+            cls._field_order = FabmanObject._field_order
+            return
+
+        order = []
+        for klass in reversed(mro):
+            for name in klass.__dict__["__slots__"]:
+                if name not in cls._internal and name != "__weakref__":
+                    order.append(name)
+        cls._fields = frozenset(order)
+        cls._field_order = tuple(order)
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for attributes not found normally, i.e. not in a slot or
+        # __dict__: either kept in the side dictionary or not materialized yet
+        if name not in ("_extra", "_raw"):
+            extra = self._extra
+            if extra and name in extra:
+                return extra[name]
+            raw = self._raw
+            if raw is not None and name in raw:
+                value = raw[name]
+                setattr(self, name, value)
+                return value
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        fields = self._fields
+        if fields is None or name in fields or name in self._internal:
+            object.__setattr__(self, name, value)
+            return
+        # no slot for it, keep it with the other unknown fields
+        if self._extra is None:
+            object.__setattr__(self, "_extra", {})
+        self._extra[name] = value
 
-    def __init__(self, requester: fabman.requester.Requester, attributes: dict) -> None:
+    def __delattr__(self, name: str) -> None:
+        extra = self._extra
+        if extra and name in extra:
+            del extra[name]
+        else:
+            object.__delattr__(self, name)
+
+    @property
+    def __dict__(self) -> dict:
+        # only reached on slotted classes, which have no instance dictionary, so
+        # vars() keeps working on them. Other classes get the real __dict__
+        return dict(self._attribute_items())
+
+    def __init__(
+        self,
+        requester: fabman.requester.Requester,
+        attributes: dict,
+        lazy: bool = False,
+    ) -> None:
         """Initialize the Object. Stores the requester method to interact
         with the API for further calls
 
@@ -27,33 +102,80 @@ class FabmanObject(object):
         :type requester: :code:`Requester`
         :param attributes: The attributes to initialize this object with
         :type attributes: dict
+        :param lazy: Keep :code:`attributes` as they are and set each attribute the
+            first time it is accessed, defaults to False
+        :type lazy: bool, optional
         """
 
         self._requester = requester
-        self.set_attributes(attributes)
-        if "_embedded" not in self.__dict__:
+        self._extra = None
+        if lazy:
+            self._raw = attributes
+            self._embedded = attributes.get("_embedded", {})
+        else:
+            self._raw = None
             self._embedded = {}
+            self.set_attributes(attributes)
 
     def __repr__(self) -> str:
         classname = self.__class__.__name__
         attrs = ", ".join(
             [
                 f"{k}={v}"
-                for k, v in self.__dict__.items()
+                for k, v in self._attribute_items()
                 if not k.startswith("_") and k != "attributes"
             ]
         )
 
         return f"<{classname} {attrs}>"
 
+    def _attribute_items(self):
+        """Returns the name and value of every attribute of the object, without
+        materializing the attributes of a lazy object"""
+        attributes = dict(self._raw) if self._raw else {}
+        for name in self._field_order:
+            try:
+                attributes[name] = object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+        if self._fields is None:
+            attributes.update(self.__dict__)
+        if self._extra:
+            attributes.update(self._extra)
+        return attributes.items()
+
+    def to_dict(self) -> dict:
+        """
+        Returns the attributes of the object, as returned by the API.
+
+        :return: The attributes of this object
+        :rtype: dict
+        """
+        return dict(self._attribute_items())
+
     def set_attributes(self, attributes: dict):
         """
         Loads the Object with the specified attributes. Typically, these attributes
         will be returned by the API when the object is created. Can also be used when
         update 'PUT' requests are made to the API.
 
+        Classes with fixed attribute slots keep attributes without a slot in a
+        separate dictionary. They remain readable as regular attributes.
+
         :param attributes: The attributes to initialize this object with
         :type attributes: dict
         """
+        fields = self._fields
+        if fields is None:
+            for attr, val in attributes.items():
+                setattr(self, attr, val)
+            return
+
         for attr, val in attributes.items():
-            setattr(self, attr, val)
+            if attr in fields:
+                # skips __setattr__, which would only check the name again
+                object.__setattr__(self, attr, val)
+            else:
+                if self._extra is None:
+                    self._extra = {}
+                self._extra[attr] = val
@@ -0,0 +1,218 @@
+"""Fields returned by the Fabman API for frequently used objects, mapped to their
+types. Used to give those classes fixed attribute slots, and by
+:code:`fabman.schemas` to define typed schemas.
+Documentation: https://fabman.io/api/v1/documentation
+"""
+from typing import Any, Optional, Union
+
+BOOKING_FIELDS = {
+    "id": int,
+    "account": int,
+    "resource": int,
+    "member": Optional[int],
+    "fromDateTime": str,
+    "untilDateTime": str,
+    "state": str,
+    "charged": bool,
+    "notes": Optional[str],
+    "metadata": Optional[dict],
+    "lockVersion": int,
+    "createdAt": str,
+    "updatedAt": str,
+    "updatedBy": Optional[int],
+}
+
+CHARGE_FIELDS = {
+    "id": int,
+    "account": int,
+    "member": int,
+    "dateTime": str,
+    "date": str,
+    "description": str,
+    "details": Optional[str],
+    "price": str,
+    "taxPercent": Optional[str],
+    "invoice": Optional[int],
+    "booking": Optional[int],
+    "resourceLog": Optional[int],
+    "memberPackage": Optional[int],
+    "onBehalfOf": Optional[int],
+    "calculated": bool,
+    "lockVersion": int,
+    "createdAt": str,
+    "updatedAt": str,
+    "updatedBy": Optional[int],
+}
+
+INVOICE_FIELDS = {
+    "id": int,
+    "account": int,
+    "space": int,
+    "member": Optional[int],
+    "date": str,
+    "dueDate": Optional[str],
+    "dunnedDate": Optional[str],
+    "number": str,
+    "state": str,
+    "header": Optional[str],
+    "footer": Optional[str],
+    "text": Optional[str],
+    "recipientFirstName": Optional[str],
+    "recipientLastName": Optional[str],
+    "recipientCompany": Optional[str],
+    "recipientAddress": Optional[str],
+    "recipientAddress2": Optional[str],
+    "recipientCity": Optional[str],
+    "recipientZip": Optional[str],
+    "recipientCountryCode": Optional[str],
+    "recipientRegion": Optional[str],
+    "currency": str,
+    "total": str,
+    "discount": Optional[str],
+    "dunningFee": Optional[str],
+    "totalWithFees": Optional[str],
+    "paid": Optional[str],
+    "totalPayable": Optional[str],
+    "cancelledInvoice": Optional[int],
+    "payments": Optional[list],
+    "notes": Optional[str],
+    "lockVersion": int,
+    "createdAt": str,
+    "updatedAt": str,
+    "updatedBy": Optional[int],
+}
+
+MEMBER_FIELDS = {
+    "id": int,
+    "account": int,
+    "space": int,
+    "memberNumber": Optional[str],
+    "firstName": str,
+    "lastName": str,
+    "gender": Optional[str],
+    "dateOfBirth": Optional[str],
+    "emailAddress": Optional[str],
+    "company": Optional[str],
+    "phone": Optional[str],
+    "address": Optional[str],
+    "address2": Optional[str],
+    "city": Optional[str],
+    "zip": Optional[str],
+    "countryCode": Optional[str],
+    "region": Optional[str],
+    "notes": Optional[str],
+    "state": str,
+    "language": Optional[str],
+    "allowLogin": bool,
+    "taxExempt": bool,
+    "hasBillingAddress": bool,
+    "requireUpfrontPayment": bool,
+    "upfrontMinimumBalance": Optional[str],
+    "billingFirstName": Optional[str],
+    "billingLastName": Optional[str],
+    "billingCompany": Optional[str],
+    "billingAddress": Optional[str],
+    "billingAddress2": Optional[str],
+    "billingCity": Optional[str],
+    "billingZip": Optional[str],
+    "billingCountryCode": Optional[str],
+    "billingRegion": Optional[str],
+    "billingInvoiceText": Optional[str],
+    "stripeCustomer": Optional[str],
+    "paidForBy": Optional[int],
+    "metadata": Optional[dict],
+    "lockVersion": int,
+    "createdAt": str,
+    "updatedAt": str,
+    "updatedBy": Optional[int],
+}
+
+PAYMENT_FIELDS = {
+    "id": int,
+    "account": int,
+    "member": int,
+    "date": str,
+    "total": Union[float, str],
+    "invoices": Optional[list],
+    "notes": Optional[str],
+    "lockVersion": int,
+    "createdAt": str,
+    "updatedAt": str,
+    "updatedBy": Optional[int],
+}
+
+RESOURCE_FIELDS = {
+    "id": int,
+    "account": int,
+    "space": int,
+    "type": int,
+    "name": str,
+    "state": str,
+    "controlType": str,
+    "displayTitle": Optional[str],
+    "description": Optional[str],
+    "notes": Optional[str],
+    "maintenanceNotes": Optional[str],
+    "safetyMessage": Optional[str],
+    "requiresTraining": bool,
+    "visibleForMembers": bool,
+    "canBeBooked": bool,
+    "mustBeBooked": bool,
+    "exclusiveUsage": bool,
+    "bookingMaxMinutesPerMemberDay": Optional[int],
+    "bookingMaxMinutesPerMemberWeek": Optional[int],
+    "maxOfflineUsage": int,
+    "deadManIntervalBusy": int,
+    "deadManIntervalIdle": int,
+    "muteDeadMan": bool,
+    "exhaustErrorShutdown": Optional[Any],
+    "idlePowerThreshold": Optional[int],
+    "preventPowerOffWhileBusy": bool,
+    "stopAfterBusy": bool,
+    "hasCountdown": bool,
+    "input1": Optional[str],
+    "input1Inverted": bool,
+    "input2": Optional[str],
+    "input2Inverted": bool,
+    "inputAC": Optional[str],
+    "inputACInverted": bool,
+    "auxEquipment": Optional[Any],
+    "pricePerTimeBusy": str,
+    "pricePerTimeBusySeconds": int,
+    "pricePerTimeIdle": str,
+    "pricePerTimeIdleSeconds": int,
+    "pricePerUsage": str,
+    "pricePerBooking": str,
+    "pricePerBookingSeconds": int,
+    "pricingMinDurationSeconds": int,
+    "lastUsed": Optional[dict],
+    "debug": bool,
+    "metadata": Optional[dict],
+    "lockVersion": int,
+    "createdAt": str,
+    "updatedAt": str,
+    "updatedBy": Optional[int],
+}
+
+RESOURCE_LOG_FIELDS = {
+    "id": int,
+    "account": int,
+    "resource": int,
+    "member": Optional[int],
+    "originalMember": Optional[int],
+    "type": str,
+    "createdAt": str,
+    "stoppedAt": Optional[str],
+    "stopType": Optional[str],
+    "idleDurationSeconds": Optional[int],
+    "reason": Optional[str],
+    "notes": Optional[str],
+    "metadata": Optional[dict],
+    "extraChargeDescription": Optional[str],
+    "extraChargePrice": Optional[str],
+    "extraChargeTaxPercent": Optional[str],
+    "extraChargeDetails": Optional[str],
+    "lockVersion": int,
+    "updatedAt": str,
+    "updatedBy": Optional[int],
+}
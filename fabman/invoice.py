@@ -34,7 +34,7 @@ class Invoice(FabmanObject):
         uri = f"/invoices/{self.id}/cancel"
         response = self._requester.request("POST", uri, _kwargs=data)
 
-        return response.json()
+        return self._requester.decode(response)
 
     def details(self, **kwargs) -> InvoiceDetails:
         """
@@ -54,10 +54,11 @@ class Invoice(FabmanObject):
         uri = f"/invoices/{self.id}/details"
 
         response = self._requester.request("GET", uri, _kwargs=kwargs)
-        data = response.json()
-        self._embedded["details"] = response.json()
-
+        data = self._requester.decode(response)
         data.update({"invoice_id": self.id})
+        # kept like details embedded by the API, which also carry the invoice_id
+        self._embedded["details"] = data
+
         return InvoiceDetails(self._requester, data)
 
     def update(self, **kwargs) -> None:
@@ -77,6 +78,6 @@ class Invoice(FabmanObject):
         uri = f"/invoices/{self.id}"
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -0,0 +1,108 @@
+"""Logging helpers used by the Requester. Request and response details are only
+formatted once a log record is actually emitted, so logging costs next to nothing
+while DEBUG is disabled.
+"""
+import json
+import logging
+from pprint import pformat
+from typing import Any, Callable, Optional, Union
+
+from requests.structures import CaseInsensitiveDict
+
+from fabman.util import clean_headers
+
+# bytes of a response body logged at most, by default
+DEFAULT_BODY_LIMIT = 4096
+
+# attribute of log records holding structured request details
+RECORD_ATTRIBUTE = "fabman"
+
+
+class LazyFormat(object):
+    """
+    Log argument calling :code:`func(*args, **kwargs)` only when the message is
+    formatted, i.e. when a handler emits the record.
+    """
+
+    __slots__ = ("func", "args", "kwargs")
+
+    def __init__(self, func: Callable[..., Any], *args, **kwargs) -> None:
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return str(self.func(*self.args, **self.kwargs))
+
+
+def format_headers(headers: Union[dict, CaseInsensitiveDict]) -> str:
+    """
+    Formats headers for the log with the access token hidden.
+
+    :param headers: The headers to format
+    :type headers: Union[dict, CaseInsensitiveDict]
+    :rtype: str
+    """
+    return pformat(dict(clean_headers(headers)), indent=2, width=80, compact=True)
+
+
+def format_body(
+    content: Optional[bytes], limit: Optional[int] = DEFAULT_BODY_LIMIT
+) -> str:
+    """
+    Formats a response body for the log, cut off after :code:`limit` bytes.
+
+    :param content: The body
+    :type content: Optional[bytes]
+    :param limit: Number of bytes logged at most, or None for the whole body,
+        defaults to :code:`DEFAULT_BODY_LIMIT`
+    :type limit: Optional[int], optional
+    :rtype: str
+    """
+    if content is None:
+        return "<no data>"
+
+    size = len(content)
+    truncated = limit is not None and size > limit
+    if truncated:
+        content = content[:limit]
+
+    try:
+        formatted = pformat(content.decode("utf-8"))
+    except UnicodeDecodeError as error:
+        if truncated and error.start >= len(content) - 3:
+            # the cut split a multi-byte character
+            formatted = pformat(content[: error.start].decode("utf-8"))
+        else:
+            formatted = pformat(content)
+
+    if truncated:
+        formatted += f" ... ({size - limit} more bytes)"
+    return formatted
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Formats log records as single-line JSON objects, for log pipelines which parse
+    structured logs. Records logged by the Requester carry the request details
+    (:code:`event`, :code:`method`, :code:`url`, and where known :code:`status`,
+    :code:`duration` and :code:`attempt`) as additional keys.
+
+    .. code:: python
+
+        handler = logging.StreamHandler()
+        handler.setFormatter(JSONFormatter())
+        logging.getLogger("fabman").addHandler(handler)
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, RECORD_ATTRIBUTE, None) or {})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
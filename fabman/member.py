@@ -6,6 +6,7 @@ import requests
 
 from fabman.embedded_list import EmbeddedList
 from fabman.fabman_object import FabmanObject
+from fabman.fields import MEMBER_FIELDS
 from fabman.package import Package
 from fabman.paginated_list import PaginatedList
 
@@ -84,7 +85,7 @@ class MemberCredit(FabmanObject):
             "GET", f"/members/{self.member_id}/credits/{self.id}/uses", _kwargs=kwargs
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
         return [MemberCreditUse(self._requester, use) for use in data]
 
     def update(self, **kwargs) -> None:
@@ -102,7 +103,7 @@ class MemberCredit(FabmanObject):
             "PUT", f"/members/{self.member_id}/credits/{self.id}", _kwargs=kwargs
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -184,7 +185,7 @@ class MemberKey(FabmanObject):
             "PUT", f"/members/{self.member}/key", _kwargs=kwargs
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -230,7 +231,7 @@ class MemberPackage(FabmanObject):
             response = self._requester.request(
                 "GET", f"/packages/{self.package}", _kwargs=kwargs
             )
-            data = response.json()
+            data = self._requester.decode(response)
 
         return Package(self._requester, data)
 
@@ -251,7 +252,7 @@ class MemberPackage(FabmanObject):
             "PUT", f"/members/{self.member_id}/packages/{self.id}", _kwargs=kwargs
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -326,6 +327,9 @@ class Member(FabmanObject):
     Member object returned by the API. Provides access to all API calls that operate on a single member.
     """
 
+    __slots__ = tuple(MEMBER_FIELDS)
+    __annotations__ = dict(MEMBER_FIELDS)
+
     def __str__(self):
         return f"{self.id}: {self.firstName} {self.lastName}"
 
@@ -348,7 +352,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberCredit(self._requester, data)
@@ -369,7 +373,7 @@ class Member(FabmanObject):
             "POST", f"/members/{self.id}/key", _kwargs=kwargs
         )
 
-        return MemberKey(self._requester, response.json())
+        return MemberKey(self._requester, self._requester.decode(response))
 
     def create_training(self, **kwargs) -> MemberTraining:
         """Creates a Training object which links a member to a training course.
@@ -382,7 +386,7 @@ class Member(FabmanObject):
             "POST", f"/members/{self.id}/trainings", _kwargs=kwargs
         )
 
-        return MemberTraining(self._requester, response.json())
+        return MemberTraining(self._requester, self._requester.decode(response))
 
     def delete(self, **kwargs) -> requests.Response:
         """
@@ -416,7 +420,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberBalanceItems(self._requester, data)
@@ -436,7 +440,7 @@ class Member(FabmanObject):
             f"/members/{self.id}/changes",
             _kwargs=kwargs,
         )
-        data = response.json()
+        data = self._requester.decode(response)
         for change in data:
             change.update({"member_id": self.id})
 
@@ -478,7 +482,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberCredit(self._requester, data)
@@ -502,7 +506,7 @@ class Member(FabmanObject):
                 _kwargs=kwargs,
             )
 
-            data = response.json()
+            data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberDevice(self._requester, data)
@@ -522,7 +526,7 @@ class Member(FabmanObject):
             f"/members/{self.id}/device/changes",
             _kwargs=kwargs,
         )
-        data = response.json()
+        data = self._requester.decode(response)
         for el in data:
             el.update({"member_id": self.id})
 
@@ -546,7 +550,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberDeviceChange(self._requester, data)
@@ -578,7 +582,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberInvitation(self._requester, data)
@@ -601,7 +605,7 @@ class Member(FabmanObject):
                 f"/members/{self.id}/key",
                 _kwargs=kwargs,
             )
-            data = response.json()
+            data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberKey(self._requester, data)
@@ -659,7 +663,7 @@ class Member(FabmanObject):
                 _kwargs=kwargs,
             )
 
-            data = response.json()
+            data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberPackage(self._requester, data)
@@ -680,7 +684,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = {"payments": response.json()}
+        data = {"payments": self._requester.decode(response)}
         data.update({"member_id": self.id})
 
         return MemberPaymentAccount(self._requester, data)
@@ -700,7 +704,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberPaymentMethod(self._requester, data)
@@ -723,7 +727,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberPaymentMethodMandatePreview(self._requester, data)
@@ -746,7 +750,7 @@ class Member(FabmanObject):
                 _kwargs=kwargs,
             )
 
-            data = response.json()
+            data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberPrivileges(self._requester, data)
@@ -766,7 +770,7 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = {"resources": response.json()}
+        data = {"resources": self._requester.decode(response)}
         data.update({"member_id": self.id})
 
         return MemberTrainedResources(self._requester, data)
@@ -824,7 +828,7 @@ class Member(FabmanObject):
                 _kwargs=kwargs,
             )
 
-            data = response.json()
+            data = self._requester.decode(response)
         data.update({"member_id": self.id})
 
         return MemberTraining(self._requester, data)
@@ -843,10 +847,9 @@ class Member(FabmanObject):
 
         response = self._requester.request("GET", f"/members/{self.id}")
 
-        data = response.json()
+        data = self._requester.decode(response)
 
-        for attr, val in data.items():
-            setattr(self, attr, val)
+        self.set_attributes(data)
 
     def update(self, **kwargs) -> None:
         """
@@ -868,7 +871,6 @@ class Member(FabmanObject):
             _kwargs=kwargs,
         )
 
-        data = response.json()
+        data = self._requester.decode(response)
 
-        for attr, val in data.items():
-            setattr(self, attr, val)
+        self.set_attributes(data)
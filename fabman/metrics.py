@@ -0,0 +1,497 @@
+"""Instrumentation of the requests sent to the Fabman API. Pass a callback, or a list
+of them, as :code:`metrics` to :code:`Fabman` and it is called with a
+:code:`RequestEvent` for every request sent.
+"""
+import bisect
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(url: str, base_url: str = "") -> str:
+    """
+    Reduces a request URL to the endpoint it calls, dropping the query string and
+    replacing ids with :code:`{id}`, e.g. :code:`/members/{id}/trainings` for
+    :code:`<base_url>/members/42/trainings?limit=10`. Keeps the number of distinct
+    endpoints, and so of metric series, small.
+
+    :param url: Full URL or path of the request
+    :type url: str
+    :param base_url: Prefix removed from the URL, defaults to ""
+    :type base_url: str, optional
+    :return: The endpoint template
+    :rtype: str
+    """
+    if base_url and url.startswith(base_url):
+        path = url[len(base_url) :].split("?")[0]
+    else:
+        path = urlsplit(url).path
+    return _ID_SEGMENT.sub("/{id}", path) or "/"
+
+
+class RequestEvent(object):
+    """Measurements of a single request sent to the API"""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        status: Optional[int] = None,
+        duration: float = 0.0,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        attempt: int = 0,
+        rate_limit_wait: float = 0.0,
+        cached: bool = False,
+        error: Optional[Exception] = None,
+        wire_bytes: int = 0,
+        content_encoding: Optional[str] = None,
+    ) -> None:
+        """
+        :param method: HTTP method of the request
+        :type method: str
+        :param endpoint: Endpoint template, as returned by :code:`endpoint_template`
+        :type endpoint: str
+        :param url: Full URL of the request
+        :type url: str
+        :param status: Status code of the response, None if no response arrived
+        :type status: Optional[int]
+        :param duration: Seconds from sending the request until the response was
+            read, excluding time spent waiting on the rate limiter
+        :type duration: float
+        :param bytes_sent: Size of the request body
+        :type bytes_sent: int
+        :param bytes_received: Size of the response body after decompression. For
+            streamed responses this is the size announced in the :code:`Content-Length`
+            header, if any
+        :type bytes_received: int
+        :param attempt: 0 for the first attempt, 1 for the first retry and so on
+        :type attempt: int
+        :param rate_limit_wait: Seconds spent waiting on the rate limiter before the
+            request was sent
+        :type rate_limit_wait: float
+        :param cached: Whether the response was served from the cache without
+            contacting the API
+        :type cached: bool
+        :param error: Exception raised while sending the request, if any
+        :type error: Optional[Exception]
+        :param wire_bytes: Size of the response body as transferred, before
+            decompression
+        :type wire_bytes: int
+        :param content_encoding: Compression of the response body, None if it was
+            sent uncompressed
+        :type content_encoding: Optional[str]
+        """
+        self.method = method
+        self.endpoint = endpoint
+        self.url = url
+        self.status = status
+        self.duration = duration
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.attempt = attempt
+        self.rate_limit_wait = rate_limit_wait
+        self.cached = cached
+        self.error = error
+        self.wire_bytes = wire_bytes
+        self.content_encoding = content_encoding
+
+    def __repr__(self):
+        outcome = self.status if self.error is None else repr(self.error)
+        return (
+            f"<RequestEvent {self.method} {self.endpoint} {outcome} "
+            f"{self.duration * 1000:.1f}ms>"
+        )
+
+    @property
+    def is_retry(self) -> bool:
+        """Whether the request repeated an earlier, failed attempt"""
+        return self.attempt > 0
+
+
+MetricsHook = Callable[[RequestEvent], None]
+
+
+def normalize_hooks(
+    metrics: Union[None, MetricsHook, Iterable[MetricsHook]],
+) -> Tuple[MetricsHook, ...]:
+    """Turns the :code:`metrics` argument of :code:`Fabman` into a tuple of hooks"""
+    if metrics is None:
+        return ()
+    if callable(metrics):
+        return (metrics,)
+    return tuple(metrics)
+
+
+def emit(hooks: Iterable[MetricsHook], event: RequestEvent) -> None:
+    """Calls every hook with the event. A failing hook is logged and does not
+    affect the request or the other hooks."""
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Metrics hook %r failed", hook)
+
+
+class EndpointStats(object):
+    """Aggregated measurements of one endpoint, kept by :code:`MetricsCollector`"""
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.statuses = Counter()
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.wire_bytes = 0
+        self.encodings = Counter()
+        self.rate_limit_wait = 0.0
+
+    def __repr__(self):
+        return f"<EndpointStats {self.count} requests, {self.mean_time * 1000:.1f}ms>"
+
+    @property
+    def mean_time(self) -> float:
+        """Average request duration in seconds"""
+        return self.total_time / self.count if self.count else 0.0
+
+    @property
+    def compression_ratio(self) -> float:
+        """Bytes of response bodies after decompression per byte transferred"""
+        return self.bytes_received / self.wire_bytes if self.wire_bytes else 1.0
+
+    def add(self, event: RequestEvent) -> None:
+        """Adds a request to the statistics"""
+        if event.cached:
+            self.cache_hits += 1
+            return
+        self.count += 1
+        self.total_time += event.duration
+        self.max_time = max(self.max_time, event.duration)
+        self.bucket_counts[bisect.bisect_left(self.buckets, event.duration)] += 1
+        if event.status is not None:
+            self.statuses[event.status] += 1
+        if event.error is not None:
+            self.errors += 1
+        if event.is_retry:
+            self.retries += 1
+        self.bytes_sent += event.bytes_sent
+        self.bytes_received += event.bytes_received
+        self.wire_bytes += event.wire_bytes
+        if event.status is not None:
+            self.encodings[event.content_encoding or "identity"] += 1
+        self.rate_limit_wait += event.rate_limit_wait
+
+    def histogram(self) -> Dict[float, int]:
+        """
+        Cumulative latency histogram: the number of requests which took at most
+        each bucket's upper bound, ending with :code:`float("inf")`.
+
+        :rtype: Dict[float, int]
+        """
+        histogram = {}
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.bucket_counts):
+            total += count
+            histogram[bound] = total
+        return histogram
+
+    def to_dict(self) -> dict:
+        """The statistics as a plain dict"""
+        return {
+            "count": self.count,
+            "total_time": self.total_time,
+            "mean_time": self.mean_time,
+            "max_time": self.max_time,
+            "histogram": self.histogram(),
+            "statuses": dict(self.statuses),
+            "errors": self.errors,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "wire_bytes": self.wire_bytes,
+            "compression_ratio": self.compression_ratio,
+            "encodings": dict(self.encodings),
+            "rate_limit_wait": self.rate_limit_wait,
+        }
+
+
+class MetricsCollector(object):
+    """
+    Metrics hook aggregating requests in memory, per method and endpoint template.
+    Safe to share between threads and clients.
+
+    .. code:: python
+
+        metrics = MetricsCollector()
+        f = Fabman(API_KEY, metrics=metrics)
+        ...
+        for (method, endpoint), stats in metrics.snapshot().items():
+            print(method, endpoint, stats["count"], stats["mean_time"])
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        """
+        :param buckets: Upper bounds in seconds of the latency histogram buckets,
+            defaults to :code:`DEFAULT_BUCKETS`
+        :type buckets: Iterable[float], optional
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+        key = (event.method, event.endpoint)
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = EndpointStats(self.buckets)
+            stats.add(event)
+
+    def __repr__(self):
+        return f"<MetricsCollector {len(self._endpoints)} endpoints>"
+
+    def snapshot(self) -> Dict[Tuple[str, str], dict]:
+        """
+        Copies the statistics collected so far.
+
+        :return: Statistics keyed by :code:`(method, endpoint)`, as returned by
+            :code:`EndpointStats.to_dict`
+        :rtype: Dict[Tuple[str, str], dict]
+        """
+        with self._lock:
+            return {key: stats.to_dict() for key, stats in self._endpoints.items()}
+
+    def totals(self) -> dict:
+        """
+        Sums the statistics of all endpoints.
+
+        :return: Statistics of every request, in the format of :code:`snapshot`
+        :rtype: dict
+        """
+        total = EndpointStats(self.buckets)
+        with self._lock:
+            for stats in self._endpoints.values():
+                total.bucket_counts = [
+                    a + b for a, b in zip(total.bucket_counts, stats.bucket_counts)
+                ]
+                total.count += stats.count
+                total.total_time += stats.total_time
+                total.max_time = max(total.max_time, stats.max_time)
+                total.statuses.update(stats.statuses)
+                total.errors += stats.errors
+                total.retries += stats.retries
+                total.cache_hits += stats.cache_hits
+                total.bytes_sent += stats.bytes_sent
+                total.bytes_received += stats.bytes_received
+                total.wire_bytes += stats.wire_bytes
+                total.encodings.update(stats.encodings)
+                total.rate_limit_wait += stats.rate_limit_wait
+        return total.to_dict()
+
+    def reset(self) -> None:
+        """Discards everything collected so far"""
+        with self._lock:
+            self._endpoints = {}
+
+
+class PrometheusMetrics(object):
+    """
+    Metrics hook recording requests with :code:`prometheus_client`. Requires
+    prometheus_client to be installed. Records:
+
+    * :code:`<prefix>_request_duration_seconds` histogram
+    * :code:`<prefix>_responses_total` counter, labelled with the status code
+    * :code:`<prefix>_request_errors_total` counter of requests without a response
+    * :code:`<prefix>_retries_total` counter
+    * :code:`<prefix>_cache_hits_total` counter
+    * :code:`<prefix>_request_bytes_total` and :code:`<prefix>_response_bytes_total`
+      counters, the latter counting bodies after decompression
+    * :code:`<prefix>_response_wire_bytes_total` counter of response bodies as
+      transferred, labelled with the content encoding
+    * :code:`<prefix>_rate_limit_wait_seconds_total` counter
+
+    All are labelled with :code:`method` and :code:`endpoint`.
+    """
+
+    def __init__(
+        self,
+        registry=None,
+        prefix: str = "fabman",
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """
+        :param registry: Registry to register the metrics with, defaults to
+            prometheus_client's default registry
+        :type registry: Optional[prometheus_client.CollectorRegistry], optional
+        :param prefix: Prefix of the metric names, defaults to "fabman"
+        :type prefix: str, optional
+        :param buckets: Upper bounds in seconds of the latency histogram buckets,
+            defaults to :code:`DEFAULT_BUCKETS`
+        :type buckets: Iterable[float], optional
+        """
+        try:
+            # pylint: disable=import-outside-toplevel
+            from prometheus_client import REGISTRY, Counter as PromCounter, Histogram
+        except ImportError as error:
+            raise ImportError(
+                "PrometheusMetrics requires prometheus_client to be installed"
+            ) from error
+
+        if registry is None:
+            registry = REGISTRY
+        labels = ("method", "endpoint")
+
+        def counter(name, documentation, labelnames=labels):
+            return PromCounter(
+                f"{prefix}_{name}", documentation, labelnames, registry=registry
+            )
+
+        self.duration = Histogram(
+            f"{prefix}_request_duration_seconds",
+            "Time spent on requests to the Fabman API",
+            labels,
+            registry=registry,
+            buckets=tuple(buckets),
+        )
+        self.responses = counter(
+            "responses", "Responses by status code", labels + ("status",)
+        )
+        self.errors = counter("request_errors", "Requests which got no response")
+        self.retries = counter("retries", "Retried requests")
+        self.cache_hits = counter("cache_hits", "Responses served from the cache")
+        self.bytes_sent = counter("request_bytes", "Bytes of request bodies sent")
+        self.bytes_received = counter(
+            "response_bytes", "Bytes of response bodies received"
+        )
+        self.wire_bytes = counter(
+            "response_wire_bytes",
+            "Bytes of response bodies transferred, before decompression",
+            labels + ("encoding",),
+        )
+        self.rate_limit_wait = counter(
+            "rate_limit_wait_seconds", "Time spent waiting on the rate limiter"
+        )
+
+    def __call__(self, event: RequestEvent) -> None:
+        labels = (event.method, event.endpoint)
+        if event.cached:
+            self.cache_hits.labels(*labels).inc()
+            return
+        self.duration.labels(*labels).observe(event.duration)
+        if event.status is not None:
+            self.responses.labels(*labels, str(event.status)).inc()
+        if event.error is not None:
+            self.errors.labels(*labels).inc()
+        if event.is_retry:
+            self.retries.labels(*labels).inc()
+        self.bytes_sent.labels(*labels).inc(event.bytes_sent)
+        self.bytes_received.labels(*labels).inc(event.bytes_received)
+        self.wire_bytes.labels(*labels, event.content_encoding or "identity").inc(
+            event.wire_bytes
+        )
+        if event.rate_limit_wait:
+            self.rate_limit_wait.labels(*labels).inc(event.rate_limit_wait)
+
+
+class OpenTelemetryMetrics(object):
+    """
+    Metrics hook recording requests with the OpenTelemetry metrics API. Requires
+    opentelemetry-api to be installed. Records the :code:`fabman.request.duration`
+    histogram and the :code:`fabman.responses`, :code:`fabman.request.errors`,
+    :code:`fabman.retries`, :code:`fabman.cache_hits`, :code:`fabman.request.bytes`,
+    :code:`fabman.response.bytes`, :code:`fabman.response.wire_bytes` and
+    :code:`fabman.rate_limit.wait` counters, with
+    :code:`http.method` and :code:`endpoint` attributes.
+    """
+
+    def __init__(self, meter=None) -> None:
+        """
+        :param meter: Meter to create the instruments with, defaults to the meter
+            named "fabman" of the global meter provider
+        :type meter: Optional[opentelemetry.metrics.Meter], optional
+        """
+        if meter is None:
+            try:
+                # pylint: disable=import-outside-toplevel
+                from opentelemetry import metrics
+            except ImportError as error:
+                raise ImportError(
+                    "OpenTelemetryMetrics requires opentelemetry-api to be installed"
+                ) from error
+            meter = metrics.get_meter("fabman")
+
+        self.duration = meter.create_histogram(
+            "fabman.request.duration",
+            unit="s",
+            description="Time spent on requests to the Fabman API",
+        )
+        self.responses = meter.create_counter(
+            "fabman.responses", description="Responses by status code"
+        )
+        self.errors = meter.create_counter(
+            "fabman.request.errors", description="Requests which got no response"
+        )
+        self.retries = meter.create_counter(
+            "fabman.retries", description="Retried requests"
+        )
+        self.cache_hits = meter.create_counter(
+            "fabman.cache_hits", description="Responses served from the cache"
+        )
+        self.bytes_sent = meter.create_counter(
+            "fabman.request.bytes", unit="By", description="Bytes of request bodies"
+        )
+        self.bytes_received = meter.create_counter(
+            "fabman.response.bytes", unit="By", description="Bytes of response bodies"
+        )
+        self.wire_bytes = meter.create_counter(
+            "fabman.response.wire_bytes",
+            unit="By",
+            description="Bytes of response bodies transferred, before decompression",
+        )
+        self.rate_limit_wait = meter.create_counter(
+            "fabman.rate_limit.wait",
+            unit="s",
+            description="Time spent waiting on the rate limiter",
+        )
+
+    def __call__(self, event: RequestEvent) -> None:
+        attributes = {"http.method": event.method, "endpoint": event.endpoint}
+        if event.cached:
+            self.cache_hits.add(1, attributes)
+            return
+        self.duration.record(event.duration, attributes)
+        if event.status is not None:
+            self.responses.add(1, {**attributes, "http.status_code": event.status})
+        if event.error is not None:
+            self.errors.add(1, attributes)
+        if event.is_retry:
+            self.retries.add(1, attributes)
+        self.bytes_sent.add(event.bytes_sent, attributes)
+        self.bytes_received.add(event.bytes_received, attributes)
+        self.wire_bytes.add(
+            event.wire_bytes,
+            {
+                **attributes,
+                "http.content_encoding": event.content_encoding or "identity",
+            },
+        )
+        if event.rate_limit_wait:
+            self.rate_limit_wait.add(event.rate_limit_wait, attributes)
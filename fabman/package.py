@@ -45,7 +45,7 @@ class PackageCredit(FabmanObject):
         kwargs.update({"lockVersion": self.lockVersion})
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -90,7 +90,7 @@ class PackagePermission(FabmanObject):
         kwargs.update({"lockVersion": self.lockVersion})
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -116,7 +116,7 @@ class Package(FabmanObject):
         uri = f"/packages/{self.id}/credits"
         response = self._requester.request("POST", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"package_id": self.id})
 
         return PackageCredit(self._requester, data)
@@ -136,7 +136,7 @@ class Package(FabmanObject):
 
         response = self._requester.request("POST", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"package_id": self.id})
 
         return PackagePermission(self._requester, data)
@@ -157,7 +157,7 @@ class Package(FabmanObject):
         uri = f"/packages/{self.id}/credits/{credit_id}"
         response = self._requester.request("GET", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"package_id": self.id})
 
         return PackageCredit(self._requester, data)
@@ -195,7 +195,7 @@ class Package(FabmanObject):
         uri = f"/packages/{self.id}/permissions/{permission_id}"
         response = self._requester.request("GET", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"package_id": self.id})
 
         return PackagePermission(self._requester, data)
@@ -255,7 +255,7 @@ class Package(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
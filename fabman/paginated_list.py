@@ -1,10 +1,16 @@
 """Handles pagination of the api"""
-from typing import List, Optional, Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Type
+from urllib.parse import parse_qsl, urlencode, urlsplit
 
 from requests.structures import CaseInsensitiveDict
 
 from fabman.fabman_object import FabmanObject
 from fabman.requester import Requester
+from fabman.schemas import decode, schema_for
+from fabman.util import get_path, iter_json_array
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
 
 # TODO: kwargs are not coming through correctly, so commands for pagination are not working
@@ -15,14 +21,14 @@ class PaginatedList(object):  # pylint: disable=too-many-instance-attributes
     """
 
     def __getitem__(self, index):
-        assert isinstance(
-            index, int
-        ), "Index must be an integer, slicing and keys are \
-            not supported"
+        if isinstance(index, slice):
+            return self._get_slice(index)
+        assert isinstance(index, int), "Index must be an integer or a slice"
         if index < 0:
-            raise IndexError("Cannot use negative indexing on PaginatedList")
-        self._get_up_to_index(index)
-        return self._elements[index]
+            index += len(self)
+            if index < 0:
+                raise IndexError("PaginatedList index out of range")
+        return self._get_element(index)
 
     def __init__(  # pylint: disable=too-many-arguments
         self,
@@ -33,6 +39,10 @@ class PaginatedList(object):  # pylint: disable=too-many-instance-attributes
         extra_attribs: Optional[dict] = None,
         _root: Optional[str] = None,
         url_override: Optional[str] = None,
+        prefetch: int = 0,
+        incremental: bool = False,
+        retain: bool = True,
+        lazy: bool = False,
         **kwargs,
     ) -> None:
         """Abstracts pagination of the Fabman API. Provides a simple interface to work with
@@ -52,6 +62,21 @@ class PaginatedList(object):  # pylint: disable=too-many-instance-attributes
         :type _root: str, optional
         :param url_override: Override the base_url, defaults to None
         :type url_override: str, optional
+        :param prefetch: Number of pages to request in the background while the current
+            page is consumed, defaults to 0 (no prefetching)
+        :type prefetch: int, optional
+        :param incremental: Decode pages as they are received when iterating, yielding
+            each object as soon as it is complete instead of once the whole page has
+            arrived, defaults to False
+        :type incremental: bool, optional
+        :param retain: Keep every object retrieved so the list can be indexed and
+            iterated again without new requests. When False, each iteration requests
+            the pages afresh and only the current page is held in memory, defaults to
+            True
+        :type retain: bool, optional
+        :param lazy: Create objects which only set each attribute the first time it is
+            read. Saves time when few fields of each object are used, defaults to False
+        :type lazy: bool, optional
         """
 
         self._elements = []
@@ -66,11 +91,61 @@ class PaginatedList(object):  # pylint: disable=too-many-instance-attributes
         self._root = _root
         self._request_method = request_method
         self._url_override = url_override
+        self._prefetch = prefetch
+        self._incremental = incremental
+        self._retain = retain
+        self._lazy = lazy
+        self._prefetched = {}
+        self._executor = None
+        self._last_url = None
+        self._total_count = None
+        self._length = None
+        self._first_page_size = None
+        self._pages = {}
+
+    def __len__(self):
+        if self._retain and self._elements and not self._has_next():
+            return len(self._elements)
+        if self._length is not None:
+            return self._length
+
+        if self._total_count is None and self._last_url is None:
+            # read the first page to learn how long the list is
+            if self._retain:
+                if not self._elements and self._has_next():
+                    self._grow()
+                if not self._has_next():
+                    return len(self._elements)
+            else:
+                self._get_page(0)
+
+        if self._total_count is not None:
+            return max(0, self._total_count - self._base_offset())
+
+        # counting takes requests, so the result is kept
+        last_offset = self.__query_int(self._last_url, "offset")
+        if last_offset is not None:
+            last_page = self._request_window(last_offset)
+            self._length = last_offset + len(last_page) - self._base_offset()
+        elif self._retain:
+            self._get_up_to_index(float("inf"))
+            return len(self._elements)
+        else:
+            self._length = sum(len(page) for page in self.iter_pages())
+        return self._length
 
     def __iter__(self):
+        if not self._retain:
+            for element in self._iter_unretained():
+                yield element
+            return
         for element in self._elements:
             yield element
         while self._has_next():
+            if self._incremental and not self._is_prefetched(self._next_url):
+                for element in self._stream_next_page():
+                    yield element
+                continue
             new_elements = self._grow()
             for element in new_elements:
                 yield element
@@ -80,39 +155,524 @@ class PaginatedList(object):  # pylint: disable=too-many-instance-attributes
 
     @staticmethod
     def __format_link(headers: CaseInsensitiveDict):
-        if "link" in headers.keys():
-            link = headers["link"]
-            return link.split(";")[0].strip("<>").split("/api/v1")[1]
+        return PaginatedList.__parse_links(headers).get("next")
 
-        return None
+    @staticmethod
+    def __parse_links(headers: CaseInsensitiveDict) -> Dict[str, str]:
+        """Maps each :code:`rel` of the link header to its endpoint"""
+        links = {}
+        for link in headers.get("link", "").split(","):
+            if not link.strip():
+                continue
+            url, *params = link.split(";")
+            rel = "next"
+            for param in params:
+                name, _, value = param.strip().partition("=")
+                if name == "rel":
+                    rel = value.strip('"')
+            links[rel] = url.strip().strip("<>").split("/api/v1")[-1]
+        return links
+
+    @staticmethod
+    def __page_key(endpoint: str) -> tuple:
+        """Identifies a page regardless of the order of its query parameters"""
+        url = urlsplit(endpoint)
+        return url.path, tuple(sorted(parse_qsl(url.query)))
+
+    @staticmethod
+    def __offset_endpoint(endpoint: str, pages: int) -> Optional[str]:
+        """Predicts the endpoint :code:`pages` pages after :code:`endpoint` from its
+        :code:`offset` and :code:`limit` parameters, if it has them"""
+        url = urlsplit(endpoint)
+        query = dict(parse_qsl(url.query))
+        try:
+            offset = int(query["offset"])
+            limit = int(query["limit"])
+        except (KeyError, ValueError):
+            return None
+        query["offset"] = offset + pages * limit
+        return f"{url.path}?{urlencode(query)}"
+
+    def _request_page(self, endpoint: str):
+        return self._requester.request(
+            self._request_method,
+            endpoint,
+            _url=self._url_override,
+            _kwargs=self._next_params,
+        )
+
+    def _is_prefetched(self, endpoint: str) -> bool:
+        return self.__page_key(endpoint) in self._prefetched
+
+    def _fetch_page(self, endpoint: str):
+        future = self._prefetched.pop(self.__page_key(endpoint), None)
+        if future is not None:
+            return future.result()
+        return self._request_page(endpoint)
+
+    def _schedule_prefetch(self, next_url: Optional[str], last_page_size: int):
+        """Starts requesting :code:`next_url` and the pages after it in the background"""
+        if not self._prefetch or self._url_override:
+            return
+        if next_url is None or last_page_size == 0:
+            self._stop_prefetch()
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._prefetch, thread_name_prefix="fabman-prefetch"
+            )
+
+        # a short page is the last one, even if the API links to a next one
+        if self._first_page_size is not None and last_page_size < self._first_page_size:
+            self._stop_prefetch()
+            return
+
+        end = self._end_offset()
+        endpoints = [next_url]
+        for pages in range(1, self._prefetch):
+            endpoint = self.__offset_endpoint(next_url, pages)
+            if endpoint is None:
+                break
+            if end is not None and self.__query_int(endpoint, "offset") >= end:
+                break
+            endpoints.append(endpoint)
+
+        for endpoint in endpoints:
+            key = self.__page_key(endpoint)
+            if key not in self._prefetched:
+                self._prefetched[key] = self._executor.submit(
+                    self._request_page, endpoint
+                )
+
+    def _stop_prefetch(self):
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
     def _get_next_page(self):
+        response = self._fetch_page(self._next_url)
+        content = self._process_page(response)
+        self._schedule_prefetch(self._next_url, len(content))
+        return content
+
+    def _stream_page(self, endpoint: str, content: Optional[list] = None):
+        """Requests a page and yields its objects as they are decoded, also adding them
+        to :code:`content` if given. Returns the headers of the response."""
         response = self._requester.request(
             self._request_method,
-            self._next_url,
+            endpoint,
             _url=self._url_override,
             _kwargs=self._next_params,
+            stream=True,
         )
 
-        data = response.json()
-        headers = response.headers
-        self._next_url = self.__format_link(headers)
+        try:
+            for element in iter_json_array(response.iter_content(STREAM_CHUNK_SIZE)):
+                if element is not None:
+                    element.update(self._extra_attribs)
+                    obj = self._content_class(self._requester, element, lazy=self._lazy)
+                    if content is not None:
+                        content.append(obj)
+                    yield obj
+        finally:
+            response.close()
+
+        return response.headers
+
+    def _stream_next_page(self):
+        """Streams the next page. The page is only added to the list once it has been
+        read in full, so a page abandoned part way through is requested again by the
+        next iteration."""
+        content = []
+        headers = yield from self._stream_page(self._next_url, content)
+
+        self._record_links(headers)
+        self._elements.extend(content)
+        self._schedule_prefetch(self._next_url, len(content))
+
+    def _iter_unretained(self):
+        """Iterates the whole list from the first page without keeping any objects"""
+        if self._incremental:
+            endpoint = self._first_url
+            while endpoint is not None:
+                headers = yield from self._stream_page(endpoint)
+                endpoint = self.__parse_links(headers).get("next")
+            return
+
+        for page in self.iter_pages():
+            for element in page:
+                yield element
+
+    def iter_pages(self):
+        """Iterates over the list one page at a time, starting from the first page.
+        Pages are not kept by the list, so memory use is bounded by the size of a
+        single page no matter how long the list is.
+
+        .. code:: python
+
+            for page in fabman.get_resource_logs(limit=1000).iter_pages():
+                write_rows(page)
+
+        :return: Generator of pages, each a list of objects
+        :rtype: Iterator[list]
+        """
+        for data in self._iter_raw_pages():
+            yield self._build_objects(data)
+
+    def _iter_raw_pages(self, decode_page=None):
+        """Iterates over the decoded JSON of each page, starting from the first page.
+        Pages are decoded by :code:`decode_page`, which is passed the response, if
+        given."""
+        endpoint = self._first_url
+        while endpoint is not None:
+            response = self._fetch_page(endpoint)
+            if decode_page is None:
+                data = self._requester.decode(response)
+            else:
+                data = decode_page(response)
+            endpoint = self.__parse_links(response.headers).get("next")
+            self._record_extent(response.headers)
+            self._schedule_prefetch(endpoint, len(data))
+            yield data
+
+    def iter_structs(self, schema: Optional[type] = None) -> Iterator[Any]:
+        """Iterates over the list as typed records, one per element, decoded straight
+        from each page and validated against a schema from :code:`fabman.schemas`.
+        Much faster and smaller than objects when pulling many records, in
+        particular with msgspec installed. Records are plain data without methods,
+        and :code:`extra_attribs` are not added to them.
+
+        .. code:: python
+
+            for log in fabman.get_resource_logs(limit=1000).iter_structs():
+                print(log.id, log.member, log.createdAt)
+
+        The pages are requested afresh and are not kept by the list.
+
+        :param schema: Schema to decode into, defaults to the schema of the list's
+            content class, e.g. :code:`MemberSchema` for members
+        :type schema: Optional[type], optional
+        :raises ValueError: There is no schema for the content class
+        :raises fabman.exceptions.SchemaError: A page does not match the schema
+        :return: Generator of records
+        :rtype: Iterator[Any]
+        """
+        if schema is None:
+            schema = schema_for(self._content_class)
+
+        def decode_page(response):
+            return decode(
+                response.content,
+                schema,
+                many=True,
+                loads=self._requester.json_decoder,
+            )
+
+        for page in self._iter_raw_pages(decode_page):
+            for record in page:
+                yield record
+
+    def to_columns(self, fields: Sequence[str]) -> Dict[str, list]:
+        """Reads the whole list into one list of values per field, without creating
+        an object for each element. Nested fields are named with dots, e.g.
+        :code:`_embedded.member.firstName`. Missing fields are None.
 
+        .. code:: python
+
+            columns = fabman.get_resource_logs(limit=1000).to_columns(
+                ["id", "resource", "member", "createdAt", "stoppedAt"]
+            )
+
+        The pages are requested afresh and are not kept by the list.
+
+        :param fields: Names of the fields to read
+        :type fields: Sequence[str]
+        :return: Values of each field, in the order of the list
+        :rtype: Dict[str, list]
+        """
+        paths = [(field, field.split(".")) for field in fields]
+        columns = {field: [] for field in fields}
+        appends = [(columns[field].append, path) for field, path in paths]
+
+        for data in self._iter_raw_pages():
+            for element in data:
+                if element is None:
+                    continue
+                element.update(self._extra_attribs)
+                for append, path in appends:
+                    append(get_path(element, path))
+
+        return columns
+
+    def to_pandas(self, fields: Sequence[str]):
+        """Reads the whole list into a :code:`pandas.DataFrame` with one column per
+        field, as read by :code:`to_columns`. Requires pandas to be installed.
+
+        :param fields: Names of the fields to read
+        :type fields: Sequence[str]
+        :return: The list as a data frame
+        :rtype: pandas.DataFrame
+        """
+        try:
+            import pandas  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError("to_pandas requires pandas to be installed") from error
+
+        return pandas.DataFrame(self.to_columns(fields), columns=list(fields))
+
+    def to_arrow(self, fields: Sequence[str]):
+        """Reads the whole list into a :code:`pyarrow.Table` with one column per
+        field, as read by :code:`to_columns`. Requires pyarrow to be installed.
+
+        :param fields: Names of the fields to read
+        :type fields: Sequence[str]
+        :return: The list as an Arrow table
+        :rtype: pyarrow.Table
+        """
+        try:
+            import pyarrow  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise ImportError("to_arrow requires pyarrow to be installed") from error
+
+        return pyarrow.table(self.to_columns(fields))
+
+    def _record_links(self, headers: CaseInsensitiveDict):
+        """Records where the next and last pages are"""
+        self._next_url = self.__parse_links(headers).get("next")
+        self._record_extent(headers)
+
+    def _record_extent(self, headers: CaseInsensitiveDict):
+        """Records how long the list is, if the API says"""
+        links = self.__parse_links(headers)
+        if "last" in links:
+            self._last_url = links["last"]
+        if "X-Total-Count" in headers:
+            self._total_count = int(headers["X-Total-Count"])
+
+    def _process_page(self, response):
+        """Builds the objects of a page and records where the next page is"""
+        data = self._requester.decode(response)
+        self._record_links(response.headers)
+
+        return self._build_objects(data)
+
+    def _build_objects(self, data: list) -> list:
         content = []
 
         for element in data:
             if element is not None:
                 element.update(self._extra_attribs)
-                content.append(self._content_class(self._requester, element))
+                content.append(
+                    self._content_class(self._requester, element, lazy=self._lazy)
+                )
 
         return content
 
+    def __window_endpoints(self, size: int) -> Optional[List[str]]:
+        """Predicts the endpoints of the next :code:`size` pages. Pages known to be
+        past the end of the list are left out. Returns None if the pages cannot be
+        predicted from the link header."""
+        if self.__offset_endpoint(self._next_url, 0) is None:
+            return None
+
+        query = dict(parse_qsl(urlsplit(self._next_url).query))
+        offset, limit = int(query["offset"]), int(query["limit"])
+        end = self._end_offset()
+
+        endpoints = []
+        for pages in range(size):
+            if end is not None and pages > 0 and offset + pages * limit >= end:
+                break
+            endpoints.append(self.__offset_endpoint(self._next_url, pages))
+        return endpoints
+
+    def _end_offset(self) -> Optional[int]:
+        """The offset past which there are no pages, if the API has said"""
+        if self._total_count is not None:
+            return self._total_count
+        last_offset = self.__query_int(self._last_url, "offset")
+        if last_offset is not None:
+            return last_offset + 1
+        return None
+
+    def fetch_all(self, parallelism: int = 4) -> list:
+        """Retrieves every remaining page of the list, requesting up to
+        :code:`parallelism` pages at the same time.
+
+        The pages are requested as disjoint :code:`offset`/:code:`limit` windows
+        predicted from the link header of the first page. When the API reports the
+        total number of items, or the offset of the last page, only the pages that
+        exist are requested. Otherwise windows of :code:`parallelism` pages are
+        requested until a page turns out to be the last one, either because it is
+        shorter than the first page or because it has no next link. If the pages
+        cannot be predicted they are retrieved one at a time.
+
+        The returned list is not kept by lists created with :code:`retain=False`.
+
+        :param parallelism: Maximum number of concurrent requests, defaults to 4
+        :type parallelism: int, optional
+        :return: All elements of the list, in order
+        :rtype: list
+        """
+        self._stop_prefetch()
+        if not self._elements and self._has_next():
+            self._grow()
+
+        with ThreadPoolExecutor(
+            max_workers=parallelism, thread_name_prefix="fabman-fetch"
+        ) as executor:
+            while self._has_next():
+                endpoints = self.__window_endpoints(parallelism)
+                if endpoints is None:
+                    self._grow()
+                    continue
+
+                futures = [
+                    executor.submit(self._fetch_page, endpoint)
+                    for endpoint in endpoints
+                ]
+                for future in futures:
+                    page = self._process_page(future.result())
+                    self._elements.extend(page)
+                    if len(page) < (self._first_page_size or 0):
+                        self._next_url = None
+                    if not self._has_next():
+                        break
+                for future in futures:
+                    future.cancel()
+
+        elements = self._elements
+        if not self._retain:
+            self._elements = []
+            self._next_url = self._first_url
+        return list(elements)
+
+    @staticmethod
+    def __query_int(endpoint: Optional[str], name: str) -> Optional[int]:
+        if endpoint is None:
+            return None
+        try:
+            return int(dict(parse_qsl(urlsplit(endpoint).query))[name])
+        except (KeyError, ValueError):
+            return None
+
+    def _base_offset(self) -> int:
+        return int(self._first_params.get("offset", 0))
+
+    def _page_size(self) -> Optional[int]:
+        """The number of elements per page. The API may return fewer than the
+        requested :code:`limit`, so once the first page has been seen its size is
+        trusted over the limit."""
+        first_page_size = self._first_page_size
+        if "limit" not in self._first_params:
+            return first_page_size
+        limit = int(self._first_params["limit"])
+        if first_page_size:
+            return min(limit, first_page_size)
+        return limit
+
+    def _request_window(self, offset: int) -> list:
+        """Requests the page starting at the absolute :code:`offset`, without moving
+        the cursor used for iteration"""
+        params = {**self._first_params, "offset": offset}
+        if self._page_size() is not None:
+            params["limit"] = self._page_size()
+        response = self._requester.request(
+            self._request_method,
+            self._first_url,
+            _url=self._url_override,
+            _kwargs=params,
+        )
+        self._record_extent(response.headers)
+        return self._build_objects(self._requester.decode(response))
+
+    def _get_page(self, number: int) -> list:
+        """Returns page :code:`number`, requesting it directly with an :code:`offset`
+        rather than walking every page before it. Lists created with
+        :code:`retain=False` only keep the most recent page."""
+        if number not in self._pages:
+            if number == 0:
+                page = self._request_window(self._base_offset())
+                if self._first_page_size is None:
+                    self._first_page_size = len(page)
+            else:
+                if self._first_page_size is None:
+                    # the offset of the page depends on the size of the first one
+                    self._get_page(0)
+                    return self._get_page(number)
+                page = self._request_window(
+                    self._base_offset() + number * self._page_size()
+                )
+            if not self._retain:
+                self._pages.clear()
+            self._pages[number] = page
+        return self._pages[number]
+
+    def _get_element(self, index: int):
+        if self._retain:
+            if index >= len(self._elements) and self._has_next():
+                if not self._elements:
+                    self._grow()
+                page_size = self._page_size()
+                # close enough to the end of the list to simply keep walking
+                if page_size is None or index < len(self._elements) + page_size:
+                    self._get_up_to_index(index)
+            if index < len(self._elements):
+                return self._elements[index]
+            if not self._has_next():
+                raise IndexError("PaginatedList index out of range")
+
+        if self._first_page_size is None:
+            self._get_page(0)
+        if not self._first_page_size:
+            # the first page is empty, and so is the list
+            raise IndexError("PaginatedList index out of range")
+        page_size = self._page_size()
+        if not self._may_exist(index, page_size):
+            raise IndexError("PaginatedList index out of range")
+        page = self._get_page(index // page_size)
+        if index % page_size >= len(page):
+            raise IndexError("PaginatedList index out of range")
+        return page[index % page_size]
+
+    def _may_exist(self, index: int, page_size: int) -> bool:
+        """Whether :code:`index` may be in the list, judging by what the API has said
+        about its length"""
+        if self._total_count is not None:
+            return index < self._total_count - self._base_offset()
+        last_offset = self.__query_int(self._last_url, "offset")
+        if last_offset is not None:
+            page_start = self._base_offset() + index // page_size * page_size
+            return page_start <= last_offset
+        return True
+
+    def _get_slice(self, index: slice) -> list:
+        start, stop, step = index.start, index.stop, index.step or 1
+        if step < 0 or stop is None or stop < 0 or (start or 0) < 0:
+            indices = range(*index.indices(len(self)))
+        else:
+            indices = range(start or 0, stop, step)
+
+        elements = []
+        for i in indices:
+            try:
+                elements.append(self._get_element(i))
+            except IndexError:
+                break
+        return elements
+
     def _get_up_to_index(self, index):
         while len(self._elements) <= index and self._has_next():
             self._grow()
 
     def _grow(self):
         new_elements = self._get_next_page()
+        if self._first_page_size is None:
+            self._first_page_size = len(new_elements)
         self._elements.extend(new_elements)
         return new_elements
 
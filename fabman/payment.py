@@ -48,7 +48,7 @@ class Payment(FabmanObject):
 
         response = self._requester.request("POST", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"payment_id": self.id})
 
         return PaymentRequest(self._requester, data)
@@ -71,7 +71,7 @@ class Payment(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
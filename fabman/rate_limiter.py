@@ -0,0 +1,79 @@
+"""Client side rate limiting for requests made to the Fabman API.
+Documentation: https://github.com/FabmanHQ/fabman-api#rate-limiting
+"""
+import asyncio
+import threading
+from time import monotonic, sleep
+from typing import Optional
+
+
+class RateLimiter(object):
+    """
+    Token bucket limiting the rate at which requests are sent. Tokens are added at
+    :code:`rate` per second up to :code:`burst`, and every request consumes one.
+
+    A single instance may be shared by any number of threads, asyncio tasks and
+    :code:`Fabman` clients. Callers reserve their token under a lock and then wait
+    outside of it, so requests are released in the order they arrived.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        """
+        :param rate: Sustained number of requests allowed per second
+        :type rate: float
+        :param burst: Number of requests that may be sent at once after a period of
+            inactivity, defaults to :code:`rate` rounded down (minimum 1)
+        :type burst: Optional[int], optional
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        if burst is not None and burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<RateLimiter rate={self.rate}/s burst={self.burst}>"
+
+    def _reserve(self) -> float:
+        """Takes a token from the bucket, returning how long the caller must wait
+        before it may be used. The bucket may go negative, which queues callers."""
+        with self._lock:
+            now = monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self) -> float:
+        """
+        Blocks the calling thread until a request may be sent.
+
+        :return: The number of seconds spent waiting
+        :rtype: float
+        """
+        wait = self._reserve()
+        if wait > 0:
+            sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Suspends the calling task until a request may be sent.
+
+        :return: The number of seconds spent waiting
+        :rtype: float
+        """
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
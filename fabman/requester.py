@@ -1,15 +1,25 @@
-"""The Requester module handles all requests to the API. This should not be used 
+"""The Requester module handles all requests to the API. This should not be used
 or called directly as it is meant to be used internally. All accesses should be
 made directly through the Fabman class found in fabman/fabman.py
 """
 import logging
+import random
+import threading
 import warnings
-from pprint import pformat
-from time import sleep
-from typing import Optional
+from time import monotonic, sleep
+from typing import Any, Iterable, Optional, Tuple, Union
 
 import requests
 
+from fabman.adapter import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    FabmanHTTPAdapter,
+    keepalive_socket_options,
+)
+from fabman.cache import ResponseCache
+from fabman.compression import accept_encoding, wire_size
+from fabman.decoder import Decoder, get_decoder
 from fabman.exceptions import (
     BadRequest,
     Conflict,
@@ -21,31 +31,180 @@ from fabman.exceptions import (
     Unauthorized,
     UnprocessableEntity,
 )
-from fabman.util import clean_headers
+from fabman.log import (
+    DEFAULT_BODY_LIMIT,
+    RECORD_ATTRIBUTE,
+    LazyFormat,
+    format_body,
+    format_headers,
+)
+from fabman.metrics import (
+    MetricsHook,
+    RequestEvent,
+    emit,
+    endpoint_template,
+    normalize_hooks,
+)
+from fabman.rate_limiter import RateLimiter
+from fabman.retry import RetryPolicy
+from fabman.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
-CACHE_SIZE = 4
-
 
 class Requester(object):
     """Main class responsible for handling all http requests to the API.
     Based on canvasapi.requester.Requester found at
     https://github.com/ucfopen/canvasapi/blob/develop/canvasapi/requester.py
+
+    A requester may be shared by any number of threads. Each thread sends its
+    requests through its own :code:`requests.Session`, while all of them draw
+    connections from one shared, thread-safe connection pool. Headers and parameters
+    passed in by callers are copied, never modified. The rate limiter and response
+    cache synchronize internally.
     """
 
-    def __init__(self, base_url: str, access_token: str) -> None:
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        base_url: str,
+        access_token: str,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_retries: int = 0,
+        timeout: Union[None, float, Tuple[float, float]] = None,
+        keepalive: Optional[float] = None,
+        metrics: Union[None, MetricsHook, Iterable[MetricsHook]] = None,
+        log_body_limit: Optional[int] = DEFAULT_BODY_LIMIT,
+        log_sample_rate: float = 1.0,
+        coalesce: bool = False,
+        compression: bool = True,
+        json_decoder: Union[None, str, Decoder] = None,
+    ) -> None:
         """
         :param base_url: The base URL of the Fabman instance's API.
         :type base_url: str
         :param access_token: The API key to authenticate requests with.
         :type access_token: str
+        :param rate_limiter: Limits the rate at which requests are sent, defaults to None
+        :type rate_limiter: Optional[fabman.rate_limiter.RateLimiter]
+        :param retry_policy: When to retry failed requests, defaults to None (never)
+        :type retry_policy: Optional[fabman.retry.RetryPolicy]
+        :param cache: Cache for GET responses, defaults to None (no caching)
+        :type cache: Optional[fabman.cache.ResponseCache]
+        :param pool_connections: Number of hosts to keep connection pools for,
+            defaults to 10
+        :type pool_connections: int
+        :param pool_maxsize: Maximum number of connections kept open to the API. Set
+            this to at least the number of threads sharing the requester, defaults to 10
+        :type pool_maxsize: int
+        :param max_retries: Number of times to retry failed connection attempts,
+            defaults to 0
+        :type max_retries: int
+        :param timeout: Seconds to wait for the server, either for both connecting and
+            reading or as a :code:`(connect, read)` tuple, defaults to None (forever)
+        :type timeout: Union[None, float, Tuple[float, float]]
+        :param keepalive: Enable TCP keep-alive, probing connections idle for this many
+            seconds, defaults to None (operating system default)
+        :type keepalive: Optional[float]
+        :param metrics: Called with a :code:`fabman.metrics.RequestEvent` for every
+            request sent and every response served from the cache, defaults to None
+        :type metrics: Union[None, Callable, Iterable[Callable]]
+        :param log_body_limit: Bytes of each response body logged at DEBUG level at
+            most, or None for whole bodies, defaults to 4096
+        :type log_body_limit: Optional[int]
+        :param log_sample_rate: Fraction of response bodies logged at DEBUG level,
+            between 0 and 1, defaults to 1 (all of them)
+        :type log_sample_rate: float
+        :param coalesce: Let identical GET requests made at the same time by
+            different threads share one HTTP call, defaults to False
+        :type coalesce: bool
+        :param compression: Ask for responses compressed with every encoding this
+            installation can decode, defaults to True
+        :type compression: bool
+        :param json_decoder: Decodes response bodies: "orjson", "msgspec", "json", a
+            function decoding bytes, or None for the fastest one installed,
+            defaults to None
+        :type json_decoder: Union[None, str, Callable[[bytes], Any]]
         """
 
         self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.timeout = timeout
+        self.metrics = normalize_hooks(metrics)
+        self.log_body_limit = log_body_limit
+        self.log_sample_rate = log_sample_rate
         self.__access_token = access_token
-        self.__session = requests.Session()
-        self.__cache = []
+        self.__adapter = FabmanHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            socket_options=(
+                keepalive_socket_options(keepalive) if keepalive is not None else None
+            ),
+        )
+        self.__local = threading.local()
+        self.__cache = cache
+        self.__single_flight = SingleFlight() if coalesce else None
+        self.accept_encoding = accept_encoding(compression)
+        self.json_decoder = get_decoder(json_decoder)
+
+    def __collection_url(self, full_url: str) -> str:
+        """Returns the URL of the collection :code:`full_url` belongs to, e.g.
+        :code:`<base_url>/members` for :code:`<base_url>/members/1/trainings`"""
+        path = full_url.split("?")[0]
+        if not path.startswith(self.base_url):
+            return path
+        collection = path[len(self.base_url) :].lstrip("/").split("/")[0]
+        return f"{self.base_url}/{collection}"
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """The response cache, if caching is enabled"""
+        return self.__cache
+
+    @property
+    def coalesce(self) -> bool:
+        """Whether identical concurrent GET requests share one HTTP call"""
+        return self.__single_flight is not None
+
+    @property
+    def adapter(self) -> FabmanHTTPAdapter:
+        """The transport adapter holding the connection pool"""
+        return self.__adapter
+
+    @property
+    def _session(self) -> requests.Session:
+        """The session of the calling thread. Sessions keep mutable state such as
+        cookies, so each thread gets its own, sharing the connection pool."""
+        session = getattr(self.__local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("https://", self.__adapter)
+            session.mount("http://", self.__adapter)
+            session.headers["Accept-Encoding"] = self.accept_encoding
+            self.__local.session = session
+        return session
+
+    def decode(self, response: requests.Response) -> Any:
+        """
+        Decodes the JSON body of a response with the configured decoder. Use this
+        rather than :code:`response.json()`.
+
+        :param response: The response
+        :type response: requests.Response
+        :return: The decoded body
+        :rtype: Any
+        """
+        return self.json_decoder(response.content)
+
+    def close(self) -> None:
+        """Closes every pooled connection. The requester may still be used
+        afterwards; new connections are opened as needed."""
+        self.__adapter.close()
 
     def _delete_request(
         self, url: str, headers: dict, data: Optional[dict] = None, **kwargs
@@ -54,7 +213,7 @@ class Requester(object):
         Handles a delete request to the API. Should never be called directly
         """
 
-        return self.__session.delete(url, headers=headers, data=data, **kwargs)
+        return self._session.delete(url, headers=headers, data=data, **kwargs)
 
     def _get_request(
         self, url: str, headers: dict, params: Optional[dict] = None, **kwargs
@@ -63,7 +222,7 @@ class Requester(object):
         Handles a get request to the API. Should never be called directly
         """
 
-        return self.__session.get(url, headers=headers, params=params, **kwargs)
+        return self._session.get(url, headers=headers, params=params, **kwargs)
 
     def _post_request(
         self, url: str, headers: dict, data: Optional[dict] = None, **kwargs
@@ -72,7 +231,7 @@ class Requester(object):
         Handles a post request to the API. Should never be called directly
         """
 
-        return self.__session.post(url, headers=headers, data=data, **kwargs)
+        return self._session.post(url, headers=headers, data=data, **kwargs)
 
     def _put_request(
         self, url: str, headers: dict, data: Optional[dict] = None, **kwargs
@@ -81,7 +240,217 @@ class Requester(object):
         Handles a put request to the API. Should never be called directly
         """
 
-        return self.__session.put(url, headers=headers, data=data, **kwargs)
+        return self._session.put(url, headers=headers, data=data, **kwargs)
+
+    def _record(  # pylint: disable=too-many-arguments
+        self,
+        method: str,
+        full_url: str,
+        started: float,
+        response: Optional[requests.Response] = None,
+        **kwargs,
+    ) -> None:
+        """Passes the measurements of a request to the metrics hooks"""
+        duration = monotonic() - started
+        if response is not None:
+            body = response.request.body if response.request is not None else None
+            kwargs["status"] = response.status_code
+            kwargs["bytes_sent"] = len(body) if body else 0
+            kwargs["content_encoding"] = response.headers.get("Content-Encoding")
+            if kwargs.pop("stream", False):
+                length = response.headers.get("Content-Length", "")
+                kwargs["bytes_received"] = int(length) if length.isdigit() else 0
+                kwargs["wire_bytes"] = kwargs["bytes_received"]
+            else:
+                kwargs["bytes_received"] = len(response.content or b"")
+                size = wire_size(response)
+                kwargs["wire_bytes"] = (
+                    kwargs["bytes_received"] if size is None else size
+                )
+        emit(
+            self.metrics,
+            RequestEvent(
+                method,
+                endpoint_template(full_url, self.base_url),
+                full_url,
+                duration=duration,
+                **kwargs,
+            ),
+        )
+
+    def _send(  # pylint: disable=too-many-arguments
+        self,
+        method,
+        req_method,
+        full_url,
+        headers,
+        _kwargs,
+        json,
+        stream=False,
+        attempt=0,
+    ) -> requests.Response:
+        """
+        Sends a single request, waiting on the rate limiter first if there is one.
+        Should never be called directly
+        """
+        waited = 0.0
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire()
+            if waited:
+                logger.debug("Rate limited: waited %.3fs", waited)
+
+        logger.info(
+            "Request: %s %s",
+            method,
+            full_url,
+            extra={
+                RECORD_ATTRIBUTE: {
+                    "event": "request",
+                    "method": method,
+                    "url": full_url,
+                    "attempt": attempt,
+                }
+            },
+        )
+        logger.debug("Headers %s", LazyFormat(format_headers, headers))
+
+        started = monotonic()
+        try:
+            response = req_method(
+                full_url,
+                headers,
+                _kwargs,
+                json=json,
+                stream=stream,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as exc:
+            if self.metrics:
+                self._record(
+                    method,
+                    full_url,
+                    started,
+                    attempt=attempt,
+                    rate_limit_wait=waited,
+                    error=exc,
+                )
+            raise
+        if self.metrics:
+            self._record(
+                method,
+                full_url,
+                started,
+                response,
+                stream=stream,
+                attempt=attempt,
+                rate_limit_wait=waited,
+            )
+        logger.info(
+            "Response: %s %s %s",
+            method,
+            full_url,
+            response.status_code,
+            extra={
+                RECORD_ATTRIBUTE: {
+                    "event": "response",
+                    "method": method,
+                    "url": full_url,
+                    "status": response.status_code,
+                    "duration": monotonic() - started,
+                    "attempt": attempt,
+                }
+            },
+        )
+        if not logger.isEnabledFor(logging.DEBUG):
+            return response
+
+        logger.debug("Headers: %s", LazyFormat(format_headers, response.headers))
+        if stream:
+            # reading the body here would defeat streaming it
+            logger.debug("Data: <streamed>")
+        elif self.log_sample_rate >= 1 or random.random() < self.log_sample_rate:
+            logger.debug(
+                "Data: %s",
+                LazyFormat(format_body, response.content, self.log_body_limit),
+            )
+
+        return response
+
+    def _send_with_retries(  # pylint: disable=too-many-arguments
+        self, method, req_method, full_url, headers, _kwargs, json, stream=False
+    ) -> requests.Response:
+        """
+        Sends a request, retrying it as allowed by the retry policy. Should never be
+        called directly
+        """
+        if self.retry_policy is None:
+            return self._send(
+                method, req_method, full_url, headers, _kwargs, json, stream
+            )
+
+        started = monotonic()
+        attempt = 0
+        while True:
+            try:
+                response = self._send(
+                    method,
+                    req_method,
+                    full_url,
+                    headers,
+                    _kwargs,
+                    json,
+                    stream,
+                    attempt,
+                )
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                delay = self.retry_policy.get_delay(
+                    method, attempt, monotonic() - started
+                )
+                if delay is None:
+                    raise
+                logger.warning(
+                    "Retrying %s %s in %.2fs after %s",
+                    method,
+                    full_url,
+                    delay,
+                    exc,
+                    extra={
+                        RECORD_ATTRIBUTE: {
+                            "event": "retry",
+                            "method": method,
+                            "url": full_url,
+                            "attempt": attempt,
+                            "delay": delay,
+                        }
+                    },
+                )
+            else:
+                delay = self.retry_policy.get_delay(
+                    method, attempt, monotonic() - started, response
+                )
+                if delay is None:
+                    return response
+                response.close()
+                logger.warning(
+                    "Retrying %s %s in %.2fs after status %s",
+                    method,
+                    full_url,
+                    delay,
+                    response.status_code,
+                    extra={
+                        RECORD_ATTRIBUTE: {
+                            "event": "retry",
+                            "method": method,
+                            "url": full_url,
+                            "status": response.status_code,
+                            "attempt": attempt,
+                            "delay": delay,
+                        }
+                    },
+                )
+
+            sleep(delay)
+            attempt += 1
 
     def request(
         self,
@@ -92,6 +461,7 @@ class Requester(object):
         _url: Optional[str] = None,
         _kwargs: Optional[dict] = None,
         json: Optional[bool] = False,
+        stream: bool = False,
         **kwargs,
     ) -> requests.Response:
         """
@@ -112,24 +482,27 @@ class Requester(object):
         :type _kwargs: dict
         :param json: Whether or not to send the data as JSON.
         :type json: bool
+        :param stream: Return before the body of a successful response has been read, so
+            it can be consumed with :code:`response.iter_content`. Streamed responses
+            are not cached.
+        :type stream: bool
 
         :return: The response object if the call was successful
         :rtype: requests.Response
         """
         full_url = _url if _url else f"{self.base_url}{endpoint}"
 
-        if not headers:
-            headers = {}
+        # copy the caller's dicts, which may be shared with other threads
+        headers = dict(headers) if headers else {}
 
         if use_auth:
-            auth_header = {"Authorization": f"Bearer {self.__access_token}"}
-            headers.update(auth_header)
+            headers["Authorization"] = f"Bearer {self.__access_token}"
 
         # Add kwargs to _kwargs
         if _kwargs is None:
             _kwargs = kwargs
         else:
-            _kwargs.update(kwargs)
+            _kwargs = {**_kwargs, **kwargs}
 
         # Determine the appropriate request method.
         if method == "GET":
@@ -143,28 +516,64 @@ class Requester(object):
         else:
             raise ValueError(f"Invalid method {method}")
 
-        logger.info("Request: %s %s", method, full_url)
-        logger.debug(
-            "Headers %s",
-            pformat(clean_headers(headers), indent=2, width=80, compact=True),
-        )
+        cache_key = None
+        cache_entry = None
+        if self.__cache is not None and method == "GET" and not stream:
+            cache_key = self.__cache.make_key(full_url, _kwargs, self.__access_token)
+            cache_entry = self.__cache.get(cache_key)
+            if cache_entry is not None:
+                if cache_entry.is_fresh():
+                    logger.info(
+                        "Cache hit: %s %s",
+                        method,
+                        full_url,
+                        extra={
+                            RECORD_ATTRIBUTE: {
+                                "event": "cache_hit",
+                                "method": method,
+                                "url": full_url,
+                            }
+                        },
+                    )
+                    if self.metrics:
+                        self._record(
+                            method,
+                            full_url,
+                            monotonic(),
+                            status=cache_entry.response.status_code,
+                            cached=True,
+                        )
+                    return cache_entry.response
+                headers = {**headers, **cache_entry.validators()}
 
-        response = req_method(full_url, headers, _kwargs, json=json)
-        logger.info("Response: %s %s %s", method, full_url, response.status_code)
-        logger.debug("Headers: %s", pformat(clean_headers(response.headers)))
+        if self.__single_flight is not None and method == "GET" and not stream:
+            key = (
+                ResponseCache.make_key(full_url, _kwargs),
+                tuple(sorted(headers.items())),
+            )
+            response, shared = self.__single_flight.do(
+                key,
+                lambda: self._send_with_retries(
+                    method, req_method, full_url, headers, _kwargs, json, stream
+                ),
+            )
+            if shared:
+                logger.info("Coalesced: %s %s", method, full_url)
+        else:
+            response = self._send_with_retries(
+                method, req_method, full_url, headers, _kwargs, json, stream
+            )
 
-        try:
-            logger.debug("Data: %s", pformat(response.content.decode("utf-8")))
-        except UnicodeDecodeError:
-            logger.debug("Data: %s", pformat(response.content))
-        except AttributeError:
-            # Response has no content
-            logger.debug("No data")
-
-        # add response to cache
-        if len(self.__cache) >= CACHE_SIZE:
-            self.__cache.pop()
-        self.__cache.insert(0, response)
+        if cache_key is not None:
+            if response.status_code == 304 and cache_entry is not None:
+                logger.info("Cache revalidated: %s %s", method, full_url)
+                self.__cache.refresh(cache_key)
+                return cache_entry.response
+            if response.status_code == 200:
+                self.__cache.put(cache_key, response)
+        elif self.__cache is not None and method != "GET":
+            # writes make cached copies of the collection they touch stale
+            self.__cache.invalidate(self.__collection_url(full_url))
 
         # Raise for status codes
         if response.status_code == 400:
@@ -179,10 +588,10 @@ class Requester(object):
             return response
         if response.status_code == 401:
             if "WWW-Authenticate" in response.headers:
-                raise InvalidAccessToken(response.json())
-            raise Unauthorized(response.json())
+                raise InvalidAccessToken(self.decode(response))
+            raise Unauthorized(self.decode(response))
         if response.status_code == 403:
-            raise ForbiddenError(response.json())
+            raise ForbiddenError(self.decode(response))
         if response.status_code == 404:
             raise ResourceDoesNotExist("Not found")
         if response.status_code == 409:
@@ -194,7 +603,8 @@ class Requester(object):
         if response.status_code == 429:
             raise RateLimitExceeded(
                 "Rate Limit Exceeded. Too many requests in a short amount of time. Retry in at least 2 seconds."
-                "https://github.com/FabmanHQ/fabman-api#rate-limiting"
+                "https://github.com/FabmanHQ/fabman-api#rate-limiting. Pass a RetryPolicy to"
+                " Fabman to retry automatically."
             )
 
         if response.status_code > 400:
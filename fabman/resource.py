@@ -2,6 +2,7 @@
 import requests
 
 from fabman.fabman_object import FabmanObject
+from fabman.fields import RESOURCE_FIELDS
 
 
 class ResourceBridge(FabmanObject):
@@ -27,7 +28,7 @@ class ResourceBridge(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -47,6 +48,9 @@ class Resource(FabmanObject):
     operate on a single Resource.
     """
 
+    __slots__ = tuple(RESOURCE_FIELDS)
+    __annotations__ = dict(RESOURCE_FIELDS)
+
     def __str__(self):
         return f"Resource #{self.id}: {self.name}"
 
@@ -100,7 +104,7 @@ class Resource(FabmanObject):
 
         response = self._requester.request("GET", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"resource_id": self.id})
 
         return ResourceBridge(self._requester, data)
@@ -121,7 +125,7 @@ class Resource(FabmanObject):
 
         response = self._requester.request("GET", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"resource_id": self.id})
 
         return ResourceBridgeApiKey(self._requester, data)
@@ -159,7 +163,6 @@ class Resource(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
-        for attr, val in data.items():
-            setattr(self, attr, val)
+        self.set_attributes(data)
@@ -3,11 +3,15 @@
 import requests
 
 from fabman.fabman_object import FabmanObject
+from fabman.fields import RESOURCE_LOG_FIELDS
 
 
 class ResourceLog(FabmanObject):
     """Class for interacting with the resource-logs endpoint on the Fabman API"""
 
+    __slots__ = tuple(RESOURCE_LOG_FIELDS)
+    __annotations__ = dict(RESOURCE_LOG_FIELDS)
+
     def __str__(self):
         return f"ResourceLog #{self.id}, Resource #{self.resource} - {self.type}"
 
@@ -46,7 +50,6 @@ class ResourceLog(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
-        for attr, val in data.items():
-            setattr(self, attr, val)
+        self.set_attributes(data)
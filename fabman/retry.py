@@ -0,0 +1,156 @@
+"""Retry policy for transient failures when talking to the Fabman API.
+Documentation: https://github.com/FabmanHQ/fabman-api#rate-limiting
+"""
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import requests
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = ("GET", "PUT", "DELETE")
+
+# headers which may tell us when the rate limit resets, in order of preference
+RATE_LIMIT_RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+
+
+class RetryPolicy(object):
+    """
+    Describes when and how long :code:`Requester` waits before retrying a failed
+    request. Waits grow exponentially with full jitter, unless the server says how
+    long to wait with a :code:`Retry-After` or rate limit reset header.
+
+    A :code:`429 Too Many Requests` response means the request was not processed, so
+    it is retried for every method. Server errors and connection errors are only
+    retried for the methods in :code:`retry_methods`, as the request may already have
+    taken effect.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        max_total_time: float = 120.0,
+        status_codes: Iterable[int] = RETRY_STATUS_CODES,
+        retry_methods: Iterable[str] = IDEMPOTENT_METHODS,
+    ) -> None:
+        """
+        :param max_retries: Maximum number of retries per request, defaults to 3
+        :type max_retries: int, optional
+        :param backoff_factor: Base wait in seconds, doubled with every attempt,
+            defaults to 0.5
+        :type backoff_factor: float, optional
+        :param max_backoff: Longest single wait in seconds, defaults to 30
+        :type max_backoff: float, optional
+        :param max_total_time: Retries stop once waiting further would take the request
+            past this many seconds since it was first sent, defaults to 120
+        :type max_total_time: float, optional
+        :param status_codes: Status codes to retry, defaults to 429 and 5xx gateway errors
+        :type status_codes: Iterable[int], optional
+        :param retry_methods: Methods which are retried on server and connection errors,
+            defaults to GET, PUT and DELETE
+        :type retry_methods: Iterable[str], optional
+        """
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_total_time = max_total_time
+        self.status_codes = frozenset(status_codes)
+        self.retry_methods = frozenset(method.upper() for method in retry_methods)
+
+    def __repr__(self):
+        return f"<RetryPolicy max_retries={self.max_retries}>"
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        Returns a random wait between 0 and the exponential backoff for
+        :code:`attempt`.
+
+        :param attempt: Number of retries already made
+        :type attempt: int
+        :return: Seconds to wait
+        :rtype: float
+        """
+        ceiling = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def get_retry_after(response: requests.Response) -> Optional[float]:
+        """
+        Reads how long the server asked us to wait from the response headers.
+
+        :param response: The response to inspect
+        :type response: requests.Response
+        :return: Seconds to wait, or None if the server did not say
+        :rtype: Optional[float]
+        """
+        value = response.headers.get("Retry-After")
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                pass
+            try:
+                retry_at = parsedate_to_datetime(value)
+            except (TypeError, ValueError, IndexError):
+                return None
+            return max(0.0, retry_at.timestamp() - time.time())
+
+        for header in RATE_LIMIT_RESET_HEADERS:
+            value = response.headers.get(header)
+            if value is None:
+                continue
+            try:
+                reset = float(value)
+            except ValueError:
+                continue
+            # large values are epoch timestamps rather than a number of seconds
+            if reset > 1e9:
+                reset -= time.time()
+            return max(0.0, reset)
+
+        return None
+
+    def get_delay(
+        self,
+        method: str,
+        attempt: int,
+        elapsed: float,
+        response: Optional[requests.Response] = None,
+    ) -> Optional[float]:
+        """
+        Decides whether a request should be retried.
+
+        :param method: HTTP method of the request
+        :type method: str
+        :param attempt: Number of retries already made
+        :type attempt: int
+        :param elapsed: Seconds since the request was first sent
+        :type elapsed: float
+        :param response: The response received, or None after a connection error
+        :type response: Optional[requests.Response]
+        :return: Seconds to wait before retrying, or None to stop
+        :rtype: Optional[float]
+        """
+        if attempt >= self.max_retries:
+            return None
+
+        if response is None:
+            if method not in self.retry_methods:
+                return None
+            delay = self.get_backoff(attempt)
+        else:
+            status = response.status_code
+            if status not in self.status_codes:
+                return None
+            if status != 429 and method not in self.retry_methods:
+                return None
+            delay = self.get_retry_after(response)
+            if delay is None:
+                delay = self.get_backoff(attempt)
+
+        if elapsed + delay > self.max_total_time:
+            return None
+        return delay
@@ -0,0 +1,186 @@
+"""Typed schemas of the main objects returned by the Fabman API, for decoding large
+pages straight into lightweight records rather than :code:`FabmanObject`
+instances. With msgspec installed the schemas are :code:`msgspec.Struct` types and
+response bodies are decoded and validated in a single pass. Otherwise they are
+dataclasses, filled in and validated after the body has been decoded.
+
+Every field defaults to None when the API leaves it out. Fields the API returns
+but the schema does not know are ignored. :code:`_embedded` is available as
+:code:`embedded`.
+"""
+import dataclasses
+import json
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Type, Union
+
+from fabman.exceptions import SchemaError
+from fabman.fields import (
+    BOOKING_FIELDS,
+    CHARGE_FIELDS,
+    INVOICE_FIELDS,
+    MEMBER_FIELDS,
+    PAYMENT_FIELDS,
+    RESOURCE_LOG_FIELDS,
+)
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+EMBEDDED = ("embedded", "_embedded", Optional[dict])
+
+
+def _json_types(annotation: Any) -> Optional[FrozenSet[type]]:
+    """The types of decoded JSON values matching an annotation, or None for any.
+    Decoded values are of these exact types, so a lookup in the set is enough."""
+    if annotation is Any:
+        return None
+    if getattr(annotation, "__origin__", None) is Union:
+        types = set()
+        for arg in annotation.__args__:
+            arg_types = _json_types(arg)
+            if arg_types is None:
+                return None
+            types |= arg_types
+        return frozenset(types)
+    if annotation is float:
+        return frozenset((int, float))
+    return frozenset((annotation,))
+
+
+def _build(schema: type, data: Any) -> Any:
+    """Fills in a dataclass schema from a decoded JSON object, validating it"""
+    if data.__class__ is not dict:
+        raise SchemaError(f"Expected an object for {schema.__name__}, got {data!r}")
+    values = {}
+    # pylint: disable=protected-access
+    for attribute, key, types, annotation in schema._checks:
+        value = data.get(key)
+        if types is not None and value.__class__ not in types and key in data:
+            raise SchemaError(
+                f"Expected {annotation} for {schema.__name__}.{key}, got {value!r}"
+            )
+        values[attribute] = value
+    # skips the generated __init__, the values have been checked already
+    record = schema.__new__(schema)
+    record.__dict__.update(values)
+    return record
+
+
+def _define(name: str, fields: Dict[str, Any]) -> type:
+    """Creates the schema :code:`name` with the given fields and :code:`embedded`"""
+    attribute, key, annotation = EMBEDDED
+    if msgspec is not None:
+        schema = msgspec.defstruct(
+            name,
+            [(field, kind, None) for field, kind in fields.items()]
+            + [(attribute, annotation, None)],
+            rename={attribute: key},
+            gc=False,
+        )
+    else:
+        schema = dataclasses.make_dataclass(
+            name,
+            [
+                (field, kind, dataclasses.field(default=None))
+                for field, kind in fields.items()
+            ]
+            + [(attribute, annotation, dataclasses.field(default=None))],
+        )
+        schema._checks = tuple(  # pylint: disable=protected-access
+            (field, field, _json_types(kind), kind) for field, kind in fields.items()
+        ) + (
+            (attribute, key, _json_types(annotation), annotation),
+        )
+    schema.__module__ = __name__
+    return schema
+
+
+BookingSchema = _define("BookingSchema", BOOKING_FIELDS)
+ChargeSchema = _define("ChargeSchema", CHARGE_FIELDS)
+InvoiceSchema = _define("InvoiceSchema", INVOICE_FIELDS)
+MemberSchema = _define("MemberSchema", MEMBER_FIELDS)
+PaymentSchema = _define("PaymentSchema", PAYMENT_FIELDS)
+ResourceLogSchema = _define("ResourceLogSchema", RESOURCE_LOG_FIELDS)
+
+# schemas by the name of the FabmanObject class they describe
+SCHEMAS = {
+    "Booking": BookingSchema,
+    "Charge": ChargeSchema,
+    "Invoice": InvoiceSchema,
+    "Member": MemberSchema,
+    "Payment": PaymentSchema,
+    "ResourceLog": ResourceLogSchema,
+}
+
+
+def schema_for(content_class: type) -> type:
+    """
+    Looks up the schema of a :code:`FabmanObject` class.
+
+    :param content_class: The class, e.g. :code:`fabman.member.Member`
+    :type content_class: type
+    :raises ValueError: There is no schema for the class
+    :return: The schema
+    :rtype: type
+    """
+    for cls in content_class.__mro__:
+        if cls.__name__ in SCHEMAS:
+            return SCHEMAS[cls.__name__]
+    raise ValueError(f"There is no schema for {content_class.__name__}")
+
+
+_decoders = {}
+
+
+def _msgspec_decoder(schema: type, many: bool):
+    key = (schema, many)
+    decoder = _decoders.get(key)
+    if decoder is None:
+        kind = List[Optional[schema]] if many else schema
+        decoder = _decoders[key] = msgspec.json.Decoder(kind)
+    return decoder
+
+
+def decode(
+    content: bytes,
+    schema: Type,
+    many: bool = False,
+    loads: Callable[[bytes], Any] = json.loads,
+) -> Any:
+    """
+    Decodes a JSON body into instances of a schema, validating it.
+
+    .. code:: python
+
+        member = decode(response.content, MemberSchema)
+
+    :param content: The body
+    :type content: bytes
+    :param schema: The schema, e.g. :code:`MemberSchema`
+    :type schema: type
+    :param many: Whether the body is an array of objects, defaults to False
+    :type many: bool, optional
+    :param loads: Decodes the JSON when msgspec is not installed, defaults to
+        :code:`json.loads`
+    :type loads: Callable[[bytes], Any], optional
+    :raises SchemaError: The body does not match the schema
+    :return: An instance of the schema, or a list of them if :code:`many`. null
+        elements of an array are left out
+    :rtype: Any
+    """
+    if msgspec is not None:
+        try:
+            result = _msgspec_decoder(schema, many).decode(content)
+        except msgspec.ValidationError as error:
+            raise SchemaError(str(error)) from error
+        if many:
+            return [element for element in result if element is not None]
+        return result
+
+    data = loads(content)
+    if not many:
+        return _build(schema, data)
+    if not isinstance(data, list):
+        raise SchemaError(f"Expected an array of {schema.__name__}, got {data!r}")
+    return [_build(schema, element) for element in data if element is not None]
@@ -0,0 +1,73 @@
+"""Coalescing of identical requests made at the same time. Used by the Requester
+when :code:`Fabman` is created with :code:`coalesce=True`.
+"""
+import threading
+from typing import Any, Callable, Hashable, Tuple
+
+
+class _Call(object):
+    """A call in flight, and its outcome once it has finished"""
+
+    __slots__ = ("done", "result", "exception", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """
+    Runs at most one call per key at a time. Threads asking for a key while a call
+    for it is in flight wait for that call and share its result, or its exception,
+    instead of making their own. Once the call has finished, the next caller starts
+    a new one, so results are never served after the fact.
+    """
+
+    def __init__(self) -> None:
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __repr__(self):
+        return f"<SingleFlight {len(self)} calls in flight>"
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Calls :code:`func`, unless a call with the same key is already in flight, in
+        which case its outcome is awaited and returned.
+
+        :param key: Identifies calls which may share a result
+        :type key: Hashable
+        :param func: Makes the call
+        :type func: Callable[[], Any]
+        :return: The result, and whether it was shared with another caller
+        :rtype: Tuple[Any, bool]
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as exception:
+            call.exception = exception
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, call.waiters > 0
@@ -50,7 +50,7 @@ class SpaceBillingSettings(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -110,7 +110,7 @@ class SpaceHoliday(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -149,7 +149,7 @@ class Space(FabmanObject):
 
         response = self._requester.request("POST", uri, _kwargs=kwargs)
 
-        return SpaceHoliday(self._requester, response.json())
+        return SpaceHoliday(self._requester, self._requester.decode(response))
 
     def delete(self, **kwargs) -> requests.Response:
         """
@@ -204,7 +204,7 @@ class Space(FabmanObject):
 
         response = self._requester.request("GET", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"space_id": self.id})
 
         return SpaceBillingSettings(self._requester, data)
@@ -226,7 +226,7 @@ class Space(FabmanObject):
 
         response = self._requester.request("GET", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         data.update({"space_id": self.id})
 
         return SpaceHoliday(self._requester, data)
@@ -280,7 +280,7 @@ class Space(FabmanObject):
             uri = f"/spaces/{self.id}/opening-hours"
 
             response = self._requester.request("GET", uri, _kwargs=kwargs)
-            data = {"days": response.json()}
+            data = {"days": self._requester.decode(response)}
 
         data.update({"space_id": self.id})
         return SpaceOpeningHours(self._requester, data)
@@ -303,7 +303,7 @@ class Space(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -324,7 +324,7 @@ class Space(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         token = data["calendarUrl"].split("/")[-1].split(".")[0]
         setattr(self, "calendarToken", token)
@@ -349,7 +349,7 @@ class Space(FabmanObject):
 
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
         out = {"days": data}
         out.update({"space_id": self.id})
 
@@ -0,0 +1,326 @@
+"""Local SQLite mirror of Fabman records. Works as a store for
+:code:`fabman.sync.Synchronizer` and answers common lookups without a request to
+the API.
+"""
+import json
+import sqlite3
+import threading
+from typing import Iterable, List, Optional, Union
+
+from fabman.booking import Booking
+from fabman.charge import Charge
+from fabman.fabman_object import FabmanObject
+from fabman.invoice import Invoice
+from fabman.member import Member
+from fabman.package import Package
+from fabman.payment import Payment
+from fabman.resource import Resource
+from fabman.resource_log import ResourceLog
+from fabman.resource_type import ResourceType
+from fabman.space import Space
+from fabman.training_course import TrainingCourse
+from fabman.util import get_path
+
+# classes used to rebuild records of each collection when a requester is given
+COLLECTION_CLASSES = {
+    "bookings": Booking,
+    "charges": Charge,
+    "invoices": Invoice,
+    "members": Member,
+    "packages": Package,
+    "payments": Payment,
+    "resources": Resource,
+    "resource_logs": ResourceLog,
+    "resource_types": ResourceType,
+    "spaces": Space,
+    "training_courses": TrainingCourse,
+}
+
+# field each collection is ordered and filtered by in date range lookups
+DATE_FIELDS = {"bookings": "fromDateTime"}
+DEFAULT_DATE_FIELD = "createdAt"
+
+# indexed columns and the path of the field they are extracted from
+COLUMNS = {
+    "space": ("space",),
+    "member": ("member",),
+    "resource": ("resource",),
+    "key_token": ("_embedded", "key", "token"),
+    "updated_at": ("updatedAt",),
+}
+
+INDEXES = {
+    "space": ("space",),
+    "member": ("member",),
+    "resource_date": ("resource", "date"),
+    "updated_at": ("updated_at",),
+    "key_token": ("key_token",),
+}
+
+Record = Union[dict, FabmanObject]
+
+
+class SQLiteStore(object):
+    """
+    Keeps records in a SQLite database, one table per collection. Besides the full
+    record, each table holds indexed columns for :code:`id`, :code:`space`,
+    :code:`member`, :code:`resource`, :code:`updatedAt`, the record's date and the
+    token of an embedded key, so lookups by any of them never scan the table.
+
+    Records are returned as dictionaries, or as the matching :code:`FabmanObject`
+    subclass when the store is given a requester.
+
+    .. code:: python
+
+        store = SQLiteStore("mirror.db")
+        store.upsert("members", fabman.get_members(embed="key"))
+        store.commit()
+
+        member = store.get_member_by_key("0a1b2c3d")
+        logs = store.get_resource_logs(3, since="2023-06-01", until="2023-07-01")
+
+    The store implements the same interface as :code:`fabman.sync.JSONFileStore`,
+    so it can be kept up to date with a :code:`fabman.sync.Synchronizer`. It may be
+    shared between threads.
+    """
+
+    def __init__(self, path: str = ":memory:", requester=None) -> None:
+        """
+        :param path: Database file, defaults to an in-memory database
+        :type path: str, optional
+        :param requester: Requester to rebuild objects with. Without one, records are
+            returned as dictionaries.
+        :type requester: Optional[fabman.requester.Requester], optional
+        """
+        self.path = path
+        self._requester = requester
+        self._lock = threading.RLock()
+        self._tables = set()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks "
+            "(collection TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+    def __repr__(self):
+        return f"<SQLiteStore {self.path}>"
+
+    def _table(self, collection: str) -> str:
+        """Returns the quoted table name of a collection, creating the table if needed"""
+        if not collection.isidentifier():
+            raise ValueError(f"Invalid collection name: {collection!r}")
+
+        table = f'"{collection}"'
+        if collection in self._tables:
+            return table
+
+        columns = ", ".join(COLUMNS)
+        self._connection.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {columns}, "
+            "date TEXT, data TEXT NOT NULL)"
+        )
+        for name, indexed in INDEXES.items():
+            self._connection.execute(
+                f'CREATE INDEX IF NOT EXISTS "{collection}_{name}" '
+                f"ON {table} ({', '.join(indexed)})"
+            )
+        self._tables.add(collection)
+        return table
+
+    def _build(self, collection: str, data: str) -> Record:
+        record = json.loads(data)
+        if self._requester is None:
+            return record
+        content_class = COLLECTION_CLASSES.get(collection, FabmanObject)
+        return content_class(self._requester, record)
+
+    def _select(self, collection: str, where: str = "", params: tuple = ()) -> list:
+        with self._lock:
+            table = self._table(collection)
+            rows = self._connection.execute(
+                f"SELECT data FROM {table} {where}", params
+            ).fetchall()
+        return [self._build(collection, data) for (data,) in rows]
+
+    def get_watermark(self, collection: str) -> Optional[str]:
+        """
+        :param collection: Name of the collection
+        :type collection: str
+        :return: The newest :code:`updatedAt` stored for the collection
+        :rtype: Optional[str]
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM watermarks WHERE collection = ?", (collection,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_watermark(self, collection: str, value: str) -> None:
+        """
+        :param collection: Name of the collection
+        :type collection: str
+        :param value: The newest :code:`updatedAt` stored for the collection
+        :type value: str
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO watermarks (collection, value) VALUES (?, ?)",
+                (collection, value),
+            )
+
+    def upsert(self, collection: str, records: Iterable[Record]) -> None:
+        """
+        Inserts records, replacing any stored record with the same :code:`id`.
+
+        :param collection: Name of the collection, e.g. :code:`members`
+        :type collection: str
+        :param records: Records as returned by the API, as dictionaries or objects.
+            A :code:`PaginatedList` may be passed directly.
+        :type records: Iterable[Union[dict, fabman.fabman_object.FabmanObject]]
+        """
+        date_field = DATE_FIELDS.get(collection, DEFAULT_DATE_FIELD)
+
+        rows = []
+        for record in records:
+            if isinstance(record, FabmanObject):
+                record = record.to_dict()
+            rows.append(
+                (
+                    record["id"],
+                    *(get_path(record, path) for path in COLUMNS.values()),
+                    record.get(date_field),
+                    json.dumps(record),
+                )
+            )
+
+        placeholders = ", ".join("?" * (len(COLUMNS) + 3))
+        with self._lock:
+            table = self._table(collection)
+            self._connection.executemany(
+                f"INSERT OR REPLACE INTO {table} VALUES ({placeholders})", rows
+            )
+
+    def get(self, collection: str, record_id: int) -> Optional[Record]:
+        """
+        :param collection: Name of the collection
+        :type collection: str
+        :param record_id: The id of the record
+        :type record_id: int
+        :return: The stored record, if any
+        :rtype: Optional[Union[dict, fabman.fabman_object.FabmanObject]]
+        """
+        records = self._select(collection, "WHERE id = ?", (record_id,))
+        return records[0] if records else None
+
+    def all(self, collection: str) -> List[Record]:
+        """
+        :param collection: Name of the collection
+        :type collection: str
+        :return: Every stored record of the collection, ordered by id
+        :rtype: List[Union[dict, fabman.fabman_object.FabmanObject]]
+        """
+        return self._select(collection, "ORDER BY id")
+
+    def find(self, collection: str, **filters) -> List[Record]:
+        """
+        Returns the records whose indexed columns equal the given values, e.g.
+        :code:`store.find("members", space=1)`.
+
+        :param collection: Name of the collection
+        :type collection: str
+        :return: The matching records, ordered by id
+        :rtype: List[Union[dict, fabman.fabman_object.FabmanObject]]
+        """
+        for column in filters:
+            if column not in COLUMNS:
+                raise ValueError(f"{column} is not an indexed column")
+
+        where = " AND ".join(f"{column} = ?" for column in filters)
+        return self._select(
+            collection,
+            f"WHERE {where} ORDER BY id" if where else "ORDER BY id",
+            tuple(filters.values()),
+        )
+
+    def get_member_by_key(self, token: str) -> Optional[Record]:
+        """
+        Looks up the member a key card belongs to. Members must have been stored
+        with their key embedded, i.e. retrieved with :code:`embed="key"`.
+
+        :param token: The token of the key card
+        :type token: str
+        :return: The member, if any
+        :rtype: Optional[Union[dict, fabman.member.Member]]
+        """
+        members = self.find("members", key_token=token)
+        return members[0] if members else None
+
+    def _between(
+        self,
+        collection: str,
+        resource: Optional[int],
+        since: Optional[str],
+        until: Optional[str],
+    ) -> List[Record]:
+        conditions, params = [], []
+        if resource is not None:
+            conditions.append("resource = ?")
+            params.append(resource)
+        if since is not None:
+            conditions.append("date >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("date < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        return self._select(collection, f"{where}ORDER BY date, id", tuple(params))
+
+    def get_resource_logs(
+        self,
+        resource: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Record]:
+        """
+        Returns resource logs ordered by :code:`createdAt`.
+
+        :param resource: Only return logs of this resource
+        :type resource: Optional[int], optional
+        :param since: Only return logs created at or after this ISO 8601 time
+        :type since: Optional[str], optional
+        :param until: Only return logs created before this ISO 8601 time
+        :type until: Optional[str], optional
+        :rtype: List[Union[dict, fabman.resource_log.ResourceLog]]
+        """
+        return self._between("resource_logs", resource, since, until)
+
+    def get_bookings(
+        self,
+        resource: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> List[Record]:
+        """
+        Returns bookings ordered by :code:`fromDateTime`.
+
+        :param resource: Only return bookings of this resource
+        :type resource: Optional[int], optional
+        :param since: Only return bookings starting at or after this ISO 8601 time
+        :type since: Optional[str], optional
+        :param until: Only return bookings starting before this ISO 8601 time
+        :type until: Optional[str], optional
+        :rtype: List[Union[dict, fabman.booking.Booking]]
+        """
+        return self._between("bookings", resource, since, until)
+
+    def commit(self) -> None:
+        """Makes the changes since the last commit permanent"""
+        with self._lock:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Commits outstanding changes and closes the database"""
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
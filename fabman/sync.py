@@ -0,0 +1,311 @@
+"""Incremental mirroring of Fabman collections into a local store. Each run only
+retrieves the records changed since the previous one, using the :code:`updatedAt`
+timestamp every Fabman object carries.
+"""
+import json
+import logging
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fabman.exceptions import BadRequest
+
+logger = logging.getLogger(__name__)
+
+CURSOR_FIELD = "updatedAt"
+NEWEST_FIRST = {"orderBy": "updatedAt", "order": "desc"}
+
+
+class SyncCollection(object):
+    """Describes how to retrieve one collection for :code:`Synchronizer`"""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        method: str,
+        order_params: Optional[dict] = None,
+        cursor_field: str = CURSOR_FIELD,
+        full_scan: bool = False,
+        **params,
+    ) -> None:
+        """
+        :param name: Name of the collection in the store, e.g. :code:`members`
+        :type name: str
+        :param method: Name of the :code:`Fabman` method returning the collection, e.g.
+            :code:`get_members`
+        :type method: str
+        :param order_params: Parameters asking the API to return the most recently
+            updated records first, defaults to :code:`orderBy=updatedAt&order=desc`
+        :type order_params: Optional[dict], optional
+        :param cursor_field: Attribute holding the time a record was last changed,
+            defaults to :code:`updatedAt`
+        :type cursor_field: str, optional
+        :param full_scan: Read the whole collection every run, storing only records
+            changed since the last one. Use this for endpoints which are not known to
+            support ordering by :code:`cursor_field`, defaults to False
+        :type full_scan: bool, optional
+
+        Any other keyword arguments are passed to :code:`method`, e.g. :code:`embed`.
+        """
+        self.name = name
+        self.method = method
+        self.order_params = NEWEST_FIRST if order_params is None else order_params
+        self.cursor_field = cursor_field
+        self.full_scan = full_scan
+        self.params = params
+
+    def __repr__(self):
+        return f"<SyncCollection {self.name}>"
+
+
+# the small configuration collections are read in full, ordering by updatedAt is
+# only relied on for the large ones, and checked on every page
+DEFAULT_COLLECTIONS = (
+    SyncCollection("members", "get_members"),
+    SyncCollection("bookings", "get_bookings"),
+    SyncCollection("resource_logs", "get_resource_logs"),
+    SyncCollection("charges", "get_charges"),
+    SyncCollection("invoices", "get_invoices"),
+    SyncCollection("payments", "get_payments"),
+    SyncCollection("resources", "get_resources", full_scan=True),
+    SyncCollection("resource_types", "get_resource_types", full_scan=True),
+    SyncCollection("packages", "get_packages", full_scan=True),
+    SyncCollection("spaces", "get_spaces", full_scan=True),
+    SyncCollection("training_courses", "get_training_courses", full_scan=True),
+)
+
+
+class JSONFileStore(object):
+    """
+    Keeps mirrored records and high-water marks in a single JSON file. Suitable for
+    small collections; changes are only written to disk by :code:`commit`.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: File to keep the mirror in. Created on the first commit.
+        :type path: str
+        """
+        self.path = path
+        self._watermarks = {}
+        self._records = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                data = json.load(file)
+            self._watermarks = data.get("watermarks", {})
+            self._records = data.get("records", {})
+
+    def __repr__(self):
+        return f"<JSONFileStore {self.path}>"
+
+    def get_watermark(self, collection: str) -> Optional[str]:
+        """
+        :param collection: Name of the collection
+        :type collection: str
+        :return: The newest :code:`updatedAt` stored for the collection
+        :rtype: Optional[str]
+        """
+        return self._watermarks.get(collection)
+
+    def set_watermark(self, collection: str, value: str) -> None:
+        """
+        :param collection: Name of the collection
+        :type collection: str
+        :param value: The newest :code:`updatedAt` stored for the collection
+        :type value: str
+        """
+        self._watermarks[collection] = value
+
+    def upsert(self, collection: str, records: Iterable[dict]) -> None:
+        """
+        Inserts records, replacing any stored record with the same :code:`id`.
+
+        :param collection: Name of the collection
+        :type collection: str
+        :param records: Records as returned by the API
+        :type records: Iterable[dict]
+        """
+        stored = self._records.setdefault(collection, {})
+        for record in records:
+            stored[str(record["id"])] = record
+
+    def get(self, collection: str, record_id: int) -> Optional[dict]:
+        """
+        :param collection: Name of the collection
+        :type collection: str
+        :param record_id: The id of the record
+        :type record_id: int
+        :return: The stored record, if any
+        :rtype: Optional[dict]
+        """
+        return self._records.get(collection, {}).get(str(record_id))
+
+    def all(self, collection: str) -> List[dict]:
+        """
+        :param collection: Name of the collection
+        :type collection: str
+        :return: Every stored record of the collection
+        :rtype: List[dict]
+        """
+        return list(self._records.get(collection, {}).values())
+
+    def commit(self) -> None:
+        """Writes the store to disk. The file is replaced atomically, so a crash never
+        leaves a partially written mirror behind."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"watermarks": self._watermarks, "records": self._records}, file
+                )
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+
+class Synchronizer(object):
+    """
+    Mirrors Fabman collections into a store, fetching only what changed.
+
+    For every collection the store keeps a high-water mark: the newest
+    :code:`updatedAt` seen so far. Each run asks the API for the most recently updated
+    records first and stops reading as soon as it reaches records older than the
+    mark. The changed records are merged into the store and the mark moves forward.
+
+    Every page is checked to really be ordered newest first. If the API ignores the
+    ordering, or rejects it, the collection is read in full instead so no change is
+    missed.
+
+    Deletions are not detected, since deleted records no longer appear in the API.
+
+    .. code:: python
+
+        store = JSONFileStore("mirror.json")
+        Synchronizer(fabman, store).sync()
+        member = store.get("members", 12345)
+    """
+
+    def __init__(
+        self,
+        fabman,
+        store,
+        collections: Optional[Iterable[SyncCollection]] = None,
+        page_size: int = 100,
+    ) -> None:
+        """
+        :param fabman: Client to read the collections with
+        :type fabman: fabman.Fabman
+        :param store: Store providing :code:`get_watermark`, :code:`set_watermark`,
+            :code:`upsert` and :code:`commit`, such as :code:`JSONFileStore`
+        :param collections: Collections to mirror, defaults to :code:`DEFAULT_COLLECTIONS`
+        :type collections: Optional[Iterable[SyncCollection]], optional
+        :param page_size: Number of records requested per page, defaults to 100
+        :type page_size: int, optional
+        """
+        self.fabman = fabman
+        self.store = store
+        self.collections = {
+            collection.name: collection
+            for collection in (collections or DEFAULT_COLLECTIONS)
+        }
+        self.page_size = page_size
+
+    def sync(self, names: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        Brings the store up to date.
+
+        :param names: Names of the collections to sync, defaults to all of them
+        :type names: Optional[Iterable[str]], optional
+        :return: Number of records stored for each collection
+        :rtype: Dict[str, int]
+        """
+        return {
+            name: self.sync_collection(self.collections[name])
+            for name in (names or self.collections)
+        }
+
+    def sync_collection(self, collection: SyncCollection) -> int:
+        """
+        Brings a single collection up to date and commits the store.
+
+        :param collection: The collection to sync
+        :type collection: SyncCollection
+        :return: Number of records stored
+        :rtype: int
+        """
+        watermark = self.store.get_watermark(collection.name)
+        pages = []
+        try:
+            newest, stored = self._read(
+                collection, watermark, not collection.full_scan, pages
+            )
+        except BadRequest:
+            # only an ordered read is retried, and only if it failed on the first page
+            if collection.full_scan or pages:
+                raise
+            logger.warning(
+                "%s cannot be ordered by %s, reading it in full",
+                collection.name,
+                collection.cursor_field,
+            )
+            newest, stored = self._read(collection, watermark, False, pages)
+
+        if newest is not None:
+            self.store.set_watermark(collection.name, newest)
+        self.store.commit()
+
+        logger.info("Synced %s: %d records stored", collection.name, stored)
+        return stored
+
+    def _read(
+        self,
+        collection: SyncCollection,
+        watermark: Optional[str],
+        ordered: bool,
+        pages: list,
+    ) -> Tuple[Optional[str], int]:
+        """Stores the records of a collection changed since :code:`watermark`,
+        appending the number of records of each page read to :code:`pages`. Returns
+        the newest :code:`cursor_field` seen and the number of records stored."""
+        newest = watermark
+        previous = None
+        stored = 0
+
+        params = dict(collection.params)
+        if ordered:
+            params.update(collection.order_params)
+        records = getattr(self.fabman, collection.method)(
+            limit=self.page_size, retain=False, **params
+        )
+
+        for page in records.iter_pages():
+            pages.append(len(page))
+            changed = []
+            reached_watermark = False
+            for record in page:
+                stamp = getattr(record, collection.cursor_field, None)
+                if ordered and stamp is not None:
+                    if previous is not None and stamp > previous:
+                        logger.warning(
+                            "%s is not ordered by %s, reading it in full",
+                            collection.name,
+                            collection.cursor_field,
+                        )
+                        ordered = False
+                    previous = stamp
+                if watermark is not None and stamp is not None and stamp < watermark:
+                    reached_watermark = True
+                    continue
+                changed.append(record.to_dict())
+                if stamp is not None and (newest is None or stamp > newest):
+                    newest = stamp
+
+            self.store.upsert(collection.name, changed)
+            stored += len(changed)
+            if reached_watermark and ordered:
+                break
+
+        return newest, stored
@@ -42,7 +42,7 @@ class TrainingCourse(FabmanObject):
         kwargs.update({"lockVersion": self.lockVersion})
         response = self._requester.request("PUT", uri, _kwargs=kwargs)
 
-        data = response.json()
+        data = self._requester.decode(response)
 
         for attr, val in data.items():
             setattr(self, attr, val)
@@ -1,9 +1,13 @@
 """General Utility Functions to be used throughout the package"""
 
-from typing import Union
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Sequence, Union
 
 from requests.structures import CaseInsensitiveDict
 
+JSON_WHITESPACE = " \t\r\n"
+
 
 def clean_headers(headers: Union[dict, CaseInsensitiveDict]):
     """Cleans the headers to hide sensitive information in logs.
@@ -24,3 +28,89 @@ def clean_headers(headers: Union[dict, CaseInsensitiveDict]):
         cleaned_headers["Authorization"] = sanitized
 
     return cleaned_headers
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Decodes a JSON array from a stream of UTF-8 encoded chunks, yielding each
+    element as soon as it has been received in full. Only the current element is
+    kept in memory, rather than the whole document.
+
+    Args:
+        chunks (Iterable[bytes]): The document, e.g. :code:`response.iter_content()`
+
+    Raises:
+        ValueError: The document is not a JSON array
+
+    Yields:
+        Any: The decoded elements of the array
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buffer, pos = "", 0
+    expecting = "["
+    more = True
+
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in JSON_WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if expecting == "[":
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                expecting = "first"
+                pos += 1
+            elif expecting == "," and char == ",":
+                expecting = "value"
+                pos += 1
+            elif expecting in ("first", ",") and char == "]":
+                return
+            elif expecting == ",":
+                raise ValueError(f"Expected ',' or ']' at position {pos}")
+            else:
+                try:
+                    element, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if more:
+                        break
+                    raise
+                # a number is only complete once the character after it is seen
+                if end == len(buffer) or buffer[end] not in JSON_WHITESPACE + ",]":
+                    if more:
+                        break
+                    if end < len(buffer):
+                        raise ValueError(f"Expected ',' or ']' at position {end}")
+                yield element
+                pos = end
+                expecting = ","
+
+        if not more:
+            raise ValueError("Unterminated JSON array")
+
+        buffer, pos = buffer[pos:], 0
+        try:
+            buffer += utf8.decode(next(chunks))
+        except StopIteration:
+            buffer += utf8.decode(b"", final=True)
+            more = False
+
+
+def get_path(record: Any, path: Sequence[str]) -> Any:
+    """Looks up a nested field, such as :code:`("_embedded", "key", "token")`.
+
+    Args:
+        record (Any): The decoded JSON object to look in
+        path (Sequence[str]): Names of the fields to descend through
+
+    Returns:
+        Any: The value of the field, or None if any part of the path is missing
+    """
+    for name in path:
+        if not isinstance(record, dict):
+            return None
+        record = record.get(name)
+    return record
@@ -0,0 +1,159 @@
+"""Tests for the AsyncFabman class."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument, protected-access
+import asyncio
+import unittest
+import warnings
+
+import requests_mock
+
+from fabman import AsyncFabman
+from fabman.async_fabman import AsyncPaginatedList
+from fabman.exceptions import ResourceDoesNotExist
+from fabman.member import Member
+from fabman.resource import Resource
+from tests import settings
+from tests.util import register_uris
+
+
+@requests_mock.Mocker()
+class TestAsyncFabman(unittest.TestCase):
+    def setUp(self):
+        self.fabman = AsyncFabman(settings.API_KEY)
+
+    def tearDown(self):
+        self.fabman._executor.shutdown()
+
+    def test_init_no_api_key(self, m):
+        with self.assertRaises(ValueError, msg="No access token provided"):
+            AsyncFabman("")
+
+    def test_get_member(self, m):
+        register_uris({"fabman": ["get_member_by_id"]}, m)
+
+        member = asyncio.run(self.fabman.get_member(1))
+        self.assertIsInstance(member, Member)
+
+    def test_create_resource(self, m):
+        register_uris({"fabman": ["create_resource"]}, m)
+
+        resource = asyncio.run(self.fabman.create_resource(name="Replicator"))
+        self.assertIsInstance(resource, Resource)
+
+    def test_gather(self, m):
+        register_uris({"fabman": ["get_member_by_id", "get_resource_by_id"]}, m)
+
+        async def gather():
+            return await asyncio.gather(
+                self.fabman.get_member(1),
+                self.fabman.get_resource(1),
+                self.fabman.get_member(1),
+            )
+
+        member, resource, again = asyncio.run(gather())
+        self.assertIsInstance(member, Member)
+        self.assertIsInstance(resource, Resource)
+        self.assertIsInstance(again, Member)
+        self.assertEqual(m.call_count, 3)
+
+    def test_pool_sized_to_workers(self, m):
+        fabman = AsyncFabman(settings.API_KEY, max_workers=24)
+        requester = fabman._fabman._Fabman__requester
+        self.assertEqual(requester.adapter._pool_maxsize, 24)
+        asyncio.run(fabman.close())
+
+        fabman = AsyncFabman(settings.API_KEY, max_workers=24, pool_maxsize=4)
+        requester = fabman._fabman._Fabman__requester
+        self.assertEqual(requester.adapter._pool_maxsize, 4)
+        asyncio.run(fabman.close())
+
+    def test_get_members_by_ids(self, m):
+        register_uris({"fabman": ["get_member_by_id"]}, m)
+
+        members = asyncio.run(self.fabman.get_members_by_ids([1, 1]))
+        self.assertEqual([member.id for member in members], [1, 1])
+        self.assertEqual(m.call_count, 1)
+
+    def test_exceptions_propagate(self, m):
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/members/2", status_code=404
+        )
+
+        with self.assertRaises(ResourceDoesNotExist):
+            asyncio.run(self.fabman.get_member(2))
+
+    def test_get_members_is_lazy(self, m):
+        members = self.fabman.get_members(limit=5)
+
+        self.assertIsInstance(members, AsyncPaginatedList)
+        self.assertEqual("<AsyncPaginatedList of type Member>", repr(members))
+        self.assertFalse(m.called)
+
+    def test_async_iteration(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = asyncio.run(self.fabman.get_members(limit=5).to_list())
+        self.assertEqual([member.id for member in members], list(range(1, 11)))
+
+    def test_async_unretained_iteration(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        for incremental in (False, True):
+            members = self.fabman.get_members(
+                limit=5, retain=False, incremental=incremental
+            )
+            for _ in range(2):
+                items = asyncio.run(members.to_list())
+                self.assertEqual([item.id for item in items], list(range(1, 11)))
+            self.assertEqual(members._paginated_list._elements, [])
+            self.assertEqual(members._paginated_list._pages, {})
+
+    def test_async_get(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        member = asyncio.run(self.fabman.get_members(limit=5).get(7))
+        self.assertEqual(member.id, 8)
+
+    def test_context_manager(self, m):
+        register_uris({"fabman": ["get_member_by_id"]}, m)
+
+        async def use():
+            async with AsyncFabman(settings.API_KEY) as fabman:
+                return await fabman.get_member(1)
+
+        self.assertIsInstance(asyncio.run(use()), Member)
+
+    def test_bulk(self, m):
+        register_uris({"fabman": ["create_resource", "get_member_by_id"]}, m)
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/members/2", status_code=404
+        )
+        progress = []
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            results = asyncio.run(
+                self.fabman.bulk(
+                    [
+                        (self.fabman.create_resource, {"name": "Replicator"}),
+                        lambda: self.fabman.get_member(1),
+                        (self.fabman._fabman.get_member, {"member_id": 1}),
+                        (self.fabman.get_member, {"member_id": 2}),
+                    ],
+                    workers=2,
+                    callback=progress.append,
+                )
+            )
+
+        self.assertEqual(m.call_count, 4)
+        self.assertIsInstance(results[0].result, Resource)
+        self.assertIsInstance(results[1].result, Member)
+        self.assertIsInstance(results[2].result, Member)
+        self.assertFalse(results[3].ok)
+        self.assertIsInstance(results[3].exception, ResourceDoesNotExist)
+        self.assertEqual([result.index for result in progress], [0, 1, 2, 3])
@@ -0,0 +1,102 @@
+"""Tests for bulk operations."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument
+
+import threading
+import time
+import unittest
+
+import requests_mock
+
+from fabman import Fabman
+from fabman.bulk import BulkResult, run_bulk
+from fabman.exceptions import UnprocessableEntity
+from fabman.member import Member
+from tests import settings
+from tests.util import register_uris
+
+
+def fail():
+    raise ValueError("failed")
+
+
+class TestRunBulk(unittest.TestCase):
+    def test_results_in_order(self):
+        def slow(value, delay):
+            time.sleep(delay)
+            return value
+
+        results = run_bulk(
+            [(slow, {"value": 1, "delay": 0.05}), (slow, {"value": 2, "delay": 0})],
+            workers=2,
+        )
+        self.assertEqual([result.result for result in results], [1, 2])
+        self.assertEqual([result.index for result in results], [0, 1])
+
+    def test_failures_do_not_abort(self):
+        results = run_bulk([lambda: 1, fail, lambda: 3])
+
+        self.assertEqual([result.ok for result in results], [True, False, True])
+        self.assertIsInstance(results[1].exception, ValueError)
+        self.assertIsNone(results[1].result)
+        self.assertIs(results[1].operation, fail)
+        self.assertEqual(results[2].result, 3)
+
+    def test_workers(self):
+        lock = threading.Lock()
+        running = []
+        peak = []
+
+        def operation():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+
+        run_bulk([operation] * 12, workers=3)
+        self.assertLessEqual(max(peak), 3)
+
+        with self.assertRaises(ValueError):
+            run_bulk([operation], workers=0)
+
+    def test_callback(self):
+        seen = []
+        run_bulk(iter([lambda: "a", fail, lambda: "c"]), callback=seen.append)
+        self.assertEqual([result.index for result in seen], [0, 1, 2])
+
+    def test_empty(self):
+        self.assertEqual(run_bulk([]), [])
+
+    def test_repr(self):
+        self.assertEqual(repr(BulkResult(0, fail, result=1)), "<BulkResult #0 ok: 1>")
+        self.assertEqual(
+            repr(BulkResult(1, fail, exception=ValueError("x"))),
+            "<BulkResult #1 failed: ValueError('x')>",
+        )
+
+
+@requests_mock.Mocker()
+class TestFabmanBulk(unittest.TestCase):
+    def setUp(self):
+        self.fabman = Fabman(settings.API_KEY)
+
+    def test_bulk(self, m):
+        register_uris({"fabman": ["create_member", "get_member_by_id"]}, m)
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/members/2", status_code=422
+        )
+
+        results = self.fabman.bulk(
+            [
+                (self.fabman.create_member, {"account": 1, "firstName": "Julian"}),
+                (self.fabman.get_member, {"member_id": 2}),
+                lambda: self.fabman.get_member(1),
+            ],
+            workers=2,
+        )
+
+        self.assertIsInstance(results[0].result, Member)
+        self.assertIsInstance(results[1].exception, UnprocessableEntity)
+        self.assertIsInstance(results[2].result, Member)
+        self.assertEqual(m.call_count, 3)
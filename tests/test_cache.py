@@ -0,0 +1,117 @@
+"""Tests for the ResponseCache class"""
+# pylint: disable=missing-docstring, invalid-name, unused-argument, protected-access
+import unittest
+from unittest import mock
+
+import requests
+
+from fabman.cache import ResponseCache
+
+
+def make_response(content=b"{}", headers=None):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch("fabman.cache.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = ResponseCache(max_entries=3, max_bytes=10, ttl=5)
+
+    def test_repr(self):
+        self.cache.put(("a", ()), make_response(b"1234"))
+        self.assertEqual("<ResponseCache with 1 entries, 4 bytes>", repr(self.cache))
+
+    def test_make_key(self):
+        self.assertEqual(
+            ResponseCache.make_key("u", {"b": 1, "a": ["x", "y"]}),
+            ResponseCache.make_key("u", {"a": ["x", "y"], "b": 1}),
+        )
+        self.assertNotEqual(
+            ResponseCache.make_key("u", {"a": 1}), ResponseCache.make_key("u")
+        )
+        self.assertNotEqual(
+            ResponseCache.make_key("u", None, "token-a"),
+            ResponseCache.make_key("u", None, "token-b"),
+        )
+        self.assertNotIn("token-a", repr(ResponseCache.make_key("u", None, "token-a")))
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get(("a", ())))
+
+    def test_ttl(self):
+        self.cache.put(("a", ()), make_response())
+        self.assertTrue(self.cache.get(("a", ())).is_fresh())
+
+        self.now += 5
+        self.assertFalse(self.cache.get(("a", ())).is_fresh())
+
+        self.cache.refresh(("a", ()))
+        self.assertTrue(self.cache.get(("a", ())).is_fresh())
+
+    def test_evicts_least_recently_used(self):
+        for name in "abc":
+            self.cache.put((name, ()), make_response(b"1"))
+        self.cache.get(("a", ()))
+        self.cache.put(("d", ()), make_response(b"1"))
+
+        self.assertIsNone(self.cache.get(("b", ())))
+        self.assertIsNotNone(self.cache.get(("a", ())))
+        self.assertEqual(len(self.cache), 3)
+
+    def test_evicts_by_size(self):
+        self.cache.put(("a", ()), make_response(b"123456"))
+        self.cache.put(("b", ()), make_response(b"123456"))
+
+        self.assertIsNone(self.cache.get(("a", ())))
+        self.assertEqual(self.cache.size, 6)
+
+    def test_too_large(self):
+        self.cache.put(("a", ()), make_response(b"x" * 11))
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
+
+    def test_replace(self):
+        self.cache.put(("a", ()), make_response(b"1234"))
+        self.cache.put(("a", ()), make_response(b"12"))
+        self.assertEqual(self.cache.size, 2)
+
+    def test_validators(self):
+        self.cache.put(
+            ("a", ()),
+            make_response(
+                headers={
+                    "ETag": '"abc"',
+                    "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT",
+                }
+            ),
+        )
+        self.assertEqual(
+            self.cache.get(("a", ())).validators(),
+            {
+                "If-None-Match": '"abc"',
+                "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+            },
+        )
+
+    def test_invalidate(self):
+        self.cache.put(("https://x/members", ()), make_response(b"1"))
+        self.cache.put(("https://x/members/1", ()), make_response(b"1"))
+        self.cache.put(("https://x/spaces", ()), make_response(b"1"))
+
+        self.cache.invalidate("https://x/members")
+
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.size, 1)
+
+    def test_clear(self):
+        self.cache.put(("a", ()), make_response(b"1"))
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.size, 0)
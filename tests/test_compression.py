@@ -0,0 +1,79 @@
+"""Tests for response compression."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument
+import gzip
+import json
+import unittest
+from unittest import mock
+
+import requests_mock
+
+from fabman import Fabman, MetricsCollector
+from fabman.compression import accept_encoding, supported_encodings, wire_size
+from tests import settings
+
+
+class TestEncodings(unittest.TestCase):
+    def test_supported_encodings(self):
+        encodings = supported_encodings()
+        self.assertIn("gzip", encodings)
+        self.assertIn("deflate", encodings)
+
+    @mock.patch("fabman.compression.ACCEPT_ENCODING", "gzip,deflate,br,zstd")
+    def test_most_compact_first(self):
+        self.assertEqual(supported_encodings(), ["zstd", "br", "gzip", "deflate"])
+        self.assertEqual(accept_encoding(), "zstd, br, gzip, deflate")
+
+    def test_no_compression(self):
+        self.assertEqual(accept_encoding(False), "identity")
+
+    def test_wire_size_unknown(self):
+        self.assertIsNone(wire_size(mock.Mock(raw=None)))
+
+
+@requests_mock.Mocker()
+class TestCompressedResponses(unittest.TestCase):
+    def setUp(self):
+        self.metrics = MetricsCollector()
+        self.url = f"{settings.BASE_URL_WITH_VERSION}/resource-logs"
+        self.body = json.dumps([{"id": 1, "type": "allowed"}] * 200).encode("utf-8")
+
+    def test_accept_encoding(self, m):
+        m.register_uri("GET", self.url, json=[])
+
+        list(Fabman(settings.API_KEY).get_resource_logs())
+        self.assertEqual(m.last_request.headers["Accept-Encoding"], accept_encoding())
+
+        list(Fabman(settings.API_KEY, compression=False).get_resource_logs())
+        self.assertEqual(m.last_request.headers["Accept-Encoding"], "identity")
+
+    def test_measures_compressed_bytes(self, m):
+        compressed = gzip.compress(self.body)
+        m.register_uri(
+            "GET",
+            self.url,
+            content=compressed,
+            headers={"Content-Encoding": "gzip"},
+        )
+        fabman = Fabman(settings.API_KEY, metrics=self.metrics)
+
+        logs = list(fabman.get_resource_logs())
+
+        self.assertEqual(len(logs), 200)
+        stats = self.metrics.snapshot()[("GET", "/resource-logs")]
+        self.assertEqual(stats["bytes_received"], len(self.body))
+        self.assertEqual(stats["wire_bytes"], len(compressed))
+        self.assertEqual(stats["encodings"], {"gzip": 1})
+        self.assertAlmostEqual(
+            stats["compression_ratio"], len(self.body) / len(compressed)
+        )
+
+    def test_measures_uncompressed_bytes(self, m):
+        m.register_uri("GET", self.url, content=self.body)
+        fabman = Fabman(settings.API_KEY, metrics=self.metrics)
+
+        list(fabman.get_resource_logs())
+
+        stats = self.metrics.snapshot()[("GET", "/resource-logs")]
+        self.assertEqual(stats["wire_bytes"], len(self.body))
+        self.assertEqual(stats["compression_ratio"], 1.0)
+        self.assertEqual(stats["encodings"], {"identity": 1})
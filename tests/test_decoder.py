@@ -0,0 +1,83 @@
+"""Tests for JSON decoding."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument
+import json
+import sys
+import unittest
+from unittest import mock
+
+import requests_mock
+
+from fabman import Fabman
+from fabman.decoder import get_decoder
+from fabman.exceptions import ForbiddenError
+from fabman.member import Member
+from tests import settings
+from tests.util import register_uris
+
+BODY = b'{"id": 1, "firstName": "J\\u00falian", "tags": [1.5, null, true]}'
+
+
+class TestGetDecoder(unittest.TestCase):
+    def test_fastest_installed(self):
+        orjson = mock.Mock()
+        with mock.patch.dict(sys.modules, {"orjson": orjson}):
+            self.assertIs(get_decoder(), orjson.loads)
+
+        msgspec = mock.Mock()
+        with mock.patch.dict(sys.modules, {"orjson": None, "msgspec": msgspec}):
+            self.assertIs(get_decoder(), msgspec.json.Decoder.return_value.decode)
+
+        with mock.patch.dict(sys.modules, {"orjson": None, "msgspec": None}):
+            self.assertIs(get_decoder(), json.loads)
+
+    def test_named(self):
+        self.assertIs(get_decoder("json"), json.loads)
+
+        with mock.patch.dict(sys.modules, {"msgspec": None}):
+            with self.assertRaises(ImportError):
+                get_decoder("msgspec")
+
+        with self.assertRaises(ValueError):
+            get_decoder("simplejson")
+
+    def test_callable(self):
+        decoder = mock.Mock()
+        self.assertIs(get_decoder(decoder), decoder)
+
+    def test_installed_decoders_agree(self):
+        expected = json.loads(BODY)
+        for name in ("orjson", "msgspec", "json"):
+            try:
+                decoder = get_decoder(name)
+            except ImportError:
+                continue
+            self.assertEqual(decoder(BODY), expected, name)
+
+
+@requests_mock.Mocker()
+class TestRequesterDecode(unittest.TestCase):
+    def test_decoder_used(self, m):
+        register_uris({"fabman": ["get_member_by_id"]}, m)
+        decoder = mock.Mock(side_effect=json.loads)
+        fabman = Fabman(settings.API_KEY, json_decoder=decoder)
+
+        member = fabman.get_member(1)
+
+        self.assertIsInstance(member, Member)
+        decoder.assert_called_once()
+        self.assertIsInstance(decoder.call_args[0][0], bytes)
+
+    def test_error_bodies(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members/1",
+            status_code=403,
+            json={"errors": "forbidden"},
+        )
+        decoder = mock.Mock(side_effect=json.loads)
+        fabman = Fabman(settings.API_KEY, json_decoder=decoder)
+
+        with self.assertRaises(ForbiddenError) as error:
+            fabman.get_member(1)
+        decoder.assert_called_once()
+        self.assertIn("forbidden", str(error.exception))
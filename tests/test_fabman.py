@@ -10,6 +10,7 @@ from fabman import Fabman
 from fabman.account import Account
 from fabman.api_key import ApiKey
 from fabman.booking import Booking
+from fabman.cache import ResponseCache
 from fabman.charge import Charge
 from fabman.fabman_object import FabmanObject
 from fabman.invoice import Invoice
@@ -18,6 +19,7 @@ from fabman.member import Member
 from fabman.package import Package
 from fabman.paginated_list import PaginatedList
 from fabman.payment import Payment
+from fabman.rate_limiter import RateLimiter
 from fabman.requester import Requester
 from fabman.resource import Resource
 from fabman.resource_log import ResourceLog
@@ -71,6 +73,18 @@ class TestFabman(unittest.TestCase):
         self.assertTrue(m.called)
         self.assertIsInstance(member, Member)
 
+    def test_init_rate_limiter(self, m):
+        limiter = RateLimiter(5)
+        fabman = Fabman(settings.API_KEY, rate_limiter=limiter)
+        self.assertIs(fabman._Fabman__requester.rate_limiter, limiter)
+
+    def test_init_connection_options(self, m):
+        fabman = Fabman(settings.API_KEY, pool_maxsize=32, timeout=5, keepalive=60)
+        requester = fabman._Fabman__requester
+        self.assertEqual(requester.adapter._pool_maxsize, 32)
+        self.assertEqual(requester.timeout, 5)
+        self.assertIsNotNone(requester.adapter.socket_options)
+
     def test_create_api_key(self, m):
         register_uris({"fabman": ["create_api_key"]}, m)
 
@@ -292,6 +306,50 @@ class TestFabman(unittest.TestCase):
         self.assertTrue(hasattr(members[0], "id"))
         self.assertTrue(members[0].id == 1)
 
+    def test_get_members_by_ids(self, m):
+        register_uris({"fabman": ["get_member_by_id"]}, m)
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/members/2", status_code=404
+        )
+
+        members = self.fabman.get_members_by_ids([1, 2, 1])
+
+        self.assertEqual(len(members), 3)
+        self.assertIsInstance(members[0], Member)
+        self.assertIsNone(members[1])
+        self.assertIs(members[2], members[0])
+        self.assertEqual(m.call_count, 2)
+
+    def test_get_members_by_ids_empty(self, m):
+        self.assertEqual(self.fabman.get_members_by_ids(iter([])), [])
+        self.assertFalse(m.called)
+
+    def test_get_members_by_ids_cached(self, m):
+        register_uris({"fabman": ["get_member_by_id"]}, m)
+        fabman = Fabman(settings.API_KEY, cache=ResponseCache())
+
+        fabman.get_member(1)
+        members = fabman.get_members_by_ids([1, 1])
+
+        self.assertEqual([member.id for member in members], [1, 1])
+        self.assertEqual(m.call_count, 1)
+
+    def test_get_by_ids(self, m):
+        register_uris(
+            {
+                "fabman": [
+                    "get_booking_by_id",
+                    "get_invoice_by_id",
+                    "get_resource_by_id",
+                ]
+            },
+            m,
+        )
+
+        self.assertIsInstance(self.fabman.get_bookings_by_ids([1])[0], Booking)
+        self.assertIsInstance(self.fabman.get_invoices_by_ids([1])[0], Invoice)
+        self.assertIsInstance(self.fabman.get_resources_by_ids([1])[0], Resource)
+
     def test_get_member_with_embed_str(self, m):
         """
         Tests the ability to embed a single resource as a string. Primarily tests
@@ -482,6 +540,97 @@ class TestFabmanObject(unittest.TestCase):
         obj = FabmanObject(requester, {"id": 1})
         self.assertEqual(repr(obj), "<FabmanObject id=1>")
 
+    def test_to_dict(self):
+        requester = Requester(settings.BASE_URL_WITH_VERSION, settings.API_KEY)
+        obj = FabmanObject(requester, {"id": 1, "_embedded": {"key": None}})
+        self.assertEqual(obj.to_dict(), {"id": 1, "_embedded": {"key": None}})
+
+    def test_slotted(self):
+        requester = Requester(settings.BASE_URL_WITH_VERSION, settings.API_KEY)
+        member = Member(requester, {"id": 1, "firstName": "John", "newField": 2})
+
+        self.assertEqual(Member.__dictoffset__, 0)
+        self.assertEqual(member.firstName, "John")
+        self.assertEqual(member.newField, 2)
+        self.assertEqual(member._extra, {"newField": 2})
+        self.assertEqual(member._embedded, {})
+        self.assertEqual(repr(member), "<Member id=1, firstName=John, newField=2>")
+        self.assertEqual(
+            member.to_dict(),
+            {"id": 1, "firstName": "John", "newField": 2, "_embedded": {}},
+        )
+        with self.assertRaises(AttributeError):
+            member.lastName  # pylint: disable=pointless-statement
+
+        member.set_attributes({"lastName": "Person", "member_id": 1})
+        self.assertEqual(member.lastName, "Person")
+        self.assertEqual(member.member_id, 1)
+
+    def test_slotted_assignment(self):
+        member = Member(None, {"id": 1, "pronouns": "they"})
+
+        member.pronouns = "she"
+        member.firstName = "Jane"
+        member.nickname = "JJ"
+        self.assertEqual(member.pronouns, "she")
+        self.assertEqual(member.nickname, "JJ")
+        self.assertEqual(member._extra, {"pronouns": "she", "nickname": "JJ"})
+        self.assertEqual(
+            vars(member),
+            {
+                "id": 1,
+                "firstName": "Jane",
+                "pronouns": "she",
+                "nickname": "JJ",
+                "_embedded": {},
+            },
+        )
+
+        del member.nickname
+        self.assertFalse(hasattr(member, "nickname"))
+
+    def test_slotted_classes(self):
+        for content_class in (Booking, Charge, Member, Resource, ResourceLog):
+            self.assertIn("id", content_class._fields)
+            self.assertIn("_embedded", content_class._fields)
+            self.assertEqual(content_class.__dictoffset__, 0)
+            self.assertEqual(vars(content_class(None, {"id": 1}))["id"], 1)
+
+    def test_lazy(self):
+        attributes = {"id": 1, "firstName": "John", "newField": 2, "_embedded": {}}
+        member = Member(None, attributes, lazy=True)
+
+        self.assertIs(member._raw, attributes)
+        with self.assertRaises(AttributeError):
+            object.__getattribute__(member, "firstName")
+        self.assertEqual(repr(member), "<Member id=1, firstName=John, newField=2>")
+        self.assertEqual(member.to_dict(), attributes)
+
+        self.assertEqual(member.firstName, "John")
+        self.assertEqual(object.__getattribute__(member, "firstName"), "John")
+        self.assertEqual(member.newField, 2)
+        self.assertEqual(member._extra, {"newField": 2})
+        with self.assertRaises(AttributeError):
+            member.lastName  # pylint: disable=pointless-statement
+
+        member.set_attributes({"firstName": "Jane"})
+        self.assertEqual(member.firstName, "Jane")
+        self.assertEqual(member.to_dict()["firstName"], "Jane")
+
+    def test_lazy_unslotted(self):
+        account = Account(None, {"id": 1, "name": "Test"}, lazy=True)
+        self.assertEqual(account.__dict__, {})
+        self.assertEqual(account.name, "Test")
+        self.assertEqual(account.__dict__, {"name": "Test"})
+        self.assertEqual(account.to_dict(), {"id": 1, "name": "Test", "_embedded": {}})
+
+    def test_unslotted(self):
+        account = Account(None, {"id": 1, "name": "Test"})
+        self.assertIsNone(Account._fields)
+        self.assertEqual(account.__dict__, {"id": 1, "name": "Test"})
+        self.assertIsNone(account._extra)
+        self.assertEqual(account.to_dict(), {"id": 1, "name": "Test", "_embedded": {}})
+
 
 if __name__ == "__main__":
     unittest.main()
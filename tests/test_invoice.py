@@ -1,7 +1,8 @@
 """Tests for the Invoice class."""
-# pylint: disable=missing-docstring, invalid-name, unused-argument
+# pylint: disable=missing-docstring, invalid-name, unused-argument, protected-access
 
 import unittest
+from unittest import mock
 
 import requests_mock
 
@@ -50,6 +51,19 @@ class TestInvoice(unittest.TestCase):
 
         self.assertEqual(str(details), "Invoice #1: 12.34 # Charges: 1")
 
+    def test_details_decoded_once(self, m):
+        register_uris({"invoice": ["details"]}, m)
+
+        with mock.patch.object(
+            self.invoice._requester, "decode", wraps=self.invoice._requester.decode
+        ) as decode:
+            self.invoice.details()
+        decode.assert_called_once()
+
+        # the details are kept, and the next call is answered without a request
+        self.assertEqual(self.invoice.details().id, 1)
+        self.assertEqual(m.call_count, 1)
+
     def test_details_embedded(self, m):
         register_uris({"fabman": ["get_invoice_embedded_detail"]}, m)
         invoice = self.fabman.get_invoice(1)
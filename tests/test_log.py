@@ -0,0 +1,115 @@
+"""Tests for request logging."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument
+import json
+import logging
+import unittest
+from unittest import mock
+
+import requests_mock
+
+from fabman.log import JSONFormatter, LazyFormat, format_body, format_headers
+from fabman.requester import Requester
+from tests import settings
+
+
+class TestFormatting(unittest.TestCase):
+    def test_lazy_format(self):
+        func = mock.Mock(return_value="formatted")
+        lazy = LazyFormat(func, 1, key=2)
+
+        func.assert_not_called()
+        self.assertEqual(str(lazy), "formatted")
+        func.assert_called_once_with(1, key=2)
+
+    def test_format_headers(self):
+        formatted = format_headers({"Authorization": "Bearer 1234567"})
+        self.assertIn("****4567", formatted)
+        self.assertNotIn("Bearer", formatted)
+
+    def test_format_body(self):
+        self.assertEqual(format_body(b'{"id": 1}'), "'{\"id\": 1}'")
+        self.assertEqual(format_body(b"\xff"), "b'\\xff'")
+        self.assertEqual(format_body(None), "<no data>")
+
+    def test_format_body_limit(self):
+        self.assertEqual(format_body(b"abcdef", 4), "'abcd' ... (2 more bytes)")
+        self.assertEqual(format_body(b"abcdef", None), "'abcdef'")
+        # the cut falls inside the two bytes of "é"
+        self.assertEqual(
+            format_body("abcé".encode("utf-8"), 4), "'abc' ... (1 more bytes)"
+        )
+
+    def test_json_formatter(self):
+        record = logging.LogRecord(
+            "fabman.requester",
+            logging.INFO,
+            __file__,
+            1,
+            "Response: %s",
+            ("GET",),
+            None,
+        )
+        record.fabman = {"event": "response", "status": 200}
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        self.assertEqual(entry["message"], "Response: GET")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "fabman.requester")
+        self.assertEqual(entry["status"], 200)
+        self.assertEqual(entry["event"], "response")
+
+
+@requests_mock.Mocker()
+class TestRequesterLogging(unittest.TestCase):
+    def setUp(self):
+        self.url = f"{settings.BASE_URL_WITH_VERSION}/members"
+
+    def test_no_formatting_without_debug(self, m):
+        m.register_uri("GET", self.url, text="x" * 100)
+        requester = Requester(settings.BASE_URL_WITH_VERSION, settings.API_KEY)
+
+        with mock.patch("fabman.requester.format_body") as body, mock.patch(
+            "fabman.requester.format_headers"
+        ) as headers:
+            with self.assertLogs("fabman.requester", "INFO"):
+                requester.request("GET", "/members")
+
+        body.assert_not_called()
+        headers.assert_not_called()
+
+    def test_body_limit(self, m):
+        m.register_uri("GET", self.url, text="x" * 100)
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, log_body_limit=10
+        )
+
+        with self.assertLogs("fabman.requester", "DEBUG") as logs:
+            requester.request("GET", "/members")
+
+        self.assertIn(f"Data: '{'x' * 10}' ... (90 more bytes)", logs.output[-1])
+
+    @mock.patch("fabman.requester.random.random", return_value=0.5)
+    def test_sampling(self, m, random):
+        m.register_uri("GET", self.url, text="body")
+
+        for rate, logged in ((0.4, False), (0.6, True)):
+            requester = Requester(
+                settings.BASE_URL_WITH_VERSION, settings.API_KEY, log_sample_rate=rate
+            )
+            with self.assertLogs("fabman.requester", "DEBUG") as logs:
+                requester.request("GET", "/members")
+            self.assertEqual("Data: 'body'" in logs.output[-1], logged)
+
+    def test_structured(self, m):
+        m.register_uri("GET", self.url, status_code=200)
+        requester = Requester(settings.BASE_URL_WITH_VERSION, settings.API_KEY)
+
+        with self.assertLogs("fabman.requester", "INFO") as logs:
+            requester.request("GET", "/members")
+
+        request, response = (record.fabman for record in logs.records)
+        self.assertEqual(request, {**request, "event": "request", "url": self.url})
+        self.assertEqual(response["event"], "response")
+        self.assertEqual(response["status"], 200)
+        self.assertGreaterEqual(response["duration"], 0)
@@ -0,0 +1,227 @@
+"""Tests for request metrics."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument
+import sys
+import unittest
+from unittest import mock
+
+import requests
+import requests_mock
+
+from fabman import Fabman, MetricsCollector
+from fabman.cache import ResponseCache
+from fabman.metrics import (
+    OpenTelemetryMetrics,
+    PrometheusMetrics,
+    RequestEvent,
+    endpoint_template,
+)
+from fabman.rate_limiter import RateLimiter
+from fabman.requester import Requester
+from fabman.retry import RetryPolicy
+from tests import settings
+
+
+class TestEndpointTemplate(unittest.TestCase):
+    def test_replaces_ids(self):
+        self.assertEqual(
+            endpoint_template(
+                f"{settings.BASE_URL_WITH_VERSION}/members/42/trainings/7?limit=10",
+                settings.BASE_URL_WITH_VERSION,
+            ),
+            "/members/{id}/trainings/{id}",
+        )
+
+    def test_keeps_names(self):
+        self.assertEqual(
+            endpoint_template(f"{settings.BASE_URL_WITH_VERSION}/resource-logs"),
+            "/api/v1/resource-logs",
+        )
+        self.assertEqual(endpoint_template("/members/1x/key"), "/members/1x/key")
+        self.assertEqual(endpoint_template("https://fabman.io"), "/")
+
+
+class TestMetricsCollector(unittest.TestCase):
+    def test_aggregates_per_endpoint(self):
+        collector = MetricsCollector(buckets=(0.1, 1.0))
+        collector(RequestEvent("GET", "/members", "", 200, 0.05, bytes_received=10))
+        collector(RequestEvent("GET", "/members", "", 503, 0.5, attempt=0))
+        collector(
+            RequestEvent("GET", "/members", "", 200, 2.0, attempt=1, bytes_sent=3)
+        )
+        collector(RequestEvent("GET", "/members", "", 200, cached=True))
+        collector(RequestEvent("POST", "/members", "", error=requests.Timeout()))
+
+        stats = collector.snapshot()[("GET", "/members")]
+        self.assertEqual(stats["count"], 3)
+        self.assertAlmostEqual(stats["mean_time"], 2.55 / 3)
+        self.assertEqual(stats["max_time"], 2.0)
+        self.assertEqual(stats["histogram"], {0.1: 1, 1.0: 2, float("inf"): 3})
+        self.assertEqual(stats["statuses"], {200: 2, 503: 1})
+        self.assertEqual(stats["retries"], 1)
+        self.assertEqual(stats["cache_hits"], 1)
+        self.assertEqual(stats["bytes_sent"], 3)
+        self.assertEqual(stats["bytes_received"], 10)
+        self.assertEqual(collector.snapshot()[("POST", "/members")]["errors"], 1)
+
+        totals = collector.totals()
+        self.assertEqual(totals["count"], 4)
+        self.assertEqual(totals["errors"], 1)
+        self.assertEqual(totals["histogram"][float("inf")], 4)
+
+        collector.reset()
+        self.assertEqual(collector.snapshot(), {})
+
+
+@requests_mock.Mocker()
+class TestRequesterMetrics(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.url = f"{settings.BASE_URL_WITH_VERSION}/members/1"
+
+    def requester(self, **kwargs):
+        return Requester(
+            settings.BASE_URL_WITH_VERSION,
+            settings.API_KEY,
+            metrics=self.events.append,
+            **kwargs,
+        )
+
+    def test_event(self, m):
+        m.register_uri("PUT", self.url, json={"id": 1}, status_code=200)
+
+        self.requester().request("PUT", "/members/1", json=True, firstName="Julian")
+
+        (event,) = self.events
+        self.assertEqual(event.method, "PUT")
+        self.assertEqual(event.endpoint, "/members/{id}")
+        self.assertEqual(event.url, self.url)
+        self.assertEqual(event.status, 200)
+        self.assertEqual(event.bytes_sent, len(m.last_request.body))
+        self.assertEqual(event.bytes_received, len(b'{"id": 1}'))
+        self.assertGreaterEqual(event.duration, 0)
+        self.assertFalse(event.is_retry)
+
+    def test_no_hooks_by_default(self, m):
+        m.register_uri("GET", self.url, json={})
+        requester = Requester(settings.BASE_URL_WITH_VERSION, settings.API_KEY)
+
+        requester.request("GET", "/members/1")
+        self.assertEqual(requester.metrics, ())
+
+    @mock.patch("fabman.requester.sleep")
+    def test_retries_and_errors(self, m, sleep):
+        m.register_uri(
+            "GET",
+            self.url,
+            [{"exc": requests.ConnectionError}, {"status_code": 503}, {"json": {}}],
+        )
+
+        self.requester(retry_policy=RetryPolicy()).request("GET", "/members/1")
+
+        self.assertEqual([event.attempt for event in self.events], [0, 1, 2])
+        self.assertIsInstance(self.events[0].error, requests.ConnectionError)
+        self.assertIsNone(self.events[0].status)
+        self.assertEqual([event.status for event in self.events[1:]], [503, 200])
+
+    def test_rate_limit_wait(self, m):
+        m.register_uri("GET", self.url, json={})
+        limiter = mock.Mock(spec=RateLimiter)
+        limiter.acquire.return_value = 0.25
+
+        self.requester(rate_limiter=limiter).request("GET", "/members/1")
+        self.assertEqual(self.events[0].rate_limit_wait, 0.25)
+
+    def test_cache_hit(self, m):
+        m.register_uri("GET", self.url, json={})
+        requester = self.requester(cache=ResponseCache())
+
+        requester.request("GET", "/members/1")
+        requester.request("GET", "/members/1")
+
+        self.assertEqual([event.cached for event in self.events], [False, True])
+        self.assertEqual(m.call_count, 1)
+
+    def test_stream(self, m):
+        m.register_uri(
+            "GET", self.url, content=b"12345", headers={"Content-Length": "5"}
+        )
+
+        self.requester().request("GET", "/members/1", stream=True)
+        self.assertEqual(self.events[0].bytes_received, 5)
+
+    def test_failing_hook(self, m):
+        m.register_uri("GET", self.url, json={})
+
+        def broken(event):
+            raise RuntimeError("broken")
+
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION,
+            settings.API_KEY,
+            metrics=[broken, self.events.append],
+        )
+        with self.assertLogs("fabman.metrics", "ERROR"):
+            response = requester.request("GET", "/members/1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.events), 1)
+
+    def test_fabman(self, m):
+        m.register_uri("GET", self.url, json={"id": 1})
+        collector = MetricsCollector()
+
+        Fabman(settings.API_KEY, metrics=collector).get_member(1)
+        self.assertEqual(collector.snapshot()[("GET", "/members/{id}")]["count"], 1)
+
+
+class TestAdapters(unittest.TestCase):
+    def setUp(self):
+        self.event = RequestEvent(
+            "GET", "/members", "", 200, 0.2, bytes_received=10, attempt=1
+        )
+
+    def test_prometheus(self):
+        prometheus_client = mock.Mock()
+
+        with mock.patch.dict(sys.modules, {"prometheus_client": prometheus_client}):
+            hook = PrometheusMetrics(prefix="test")
+        hook(self.event)
+
+        hook.duration.labels.assert_called_with("GET", "/members")
+        hook.duration.labels.return_value.observe.assert_called_once_with(0.2)
+        hook.responses.labels.assert_any_call("GET", "/members", "200")
+        names = [call[0][0] for call in prometheus_client.Counter.call_args_list]
+        self.assertIn("test_responses", names)
+        self.assertEqual(
+            prometheus_client.Histogram.call_args[1]["registry"],
+            prometheus_client.REGISTRY,
+        )
+
+    def test_prometheus_not_installed(self):
+        with mock.patch.dict(sys.modules, {"prometheus_client": None}):
+            with self.assertRaises(ImportError):
+                PrometheusMetrics()
+
+    def test_opentelemetry(self):
+        meter = mock.Mock()
+
+        hook = OpenTelemetryMetrics(meter)
+        hook(self.event)
+
+        attributes = {"http.method": "GET", "endpoint": "/members"}
+        hook.duration.record.assert_called_once_with(0.2, attributes)
+        meter.create_histogram.assert_called_once()
+        self.assertEqual(meter.create_counter.call_count, 8)
+
+    def test_opentelemetry_global_meter(self):
+        opentelemetry = mock.Mock()
+
+        with mock.patch.dict(
+            sys.modules,
+            {
+                "opentelemetry": opentelemetry,
+                "opentelemetry.metrics": opentelemetry.metrics,
+            },
+        ):
+            OpenTelemetryMetrics()
+        opentelemetry.metrics.get_meter.assert_called_once_with("fabman")
@@ -1,13 +1,16 @@
 """Tests for the PaginatedList class."""
 # pylint: disable=missing-docstring, invalid-name, unused-argument
 
+import sys
 import unittest
+from unittest import mock
 
 import requests_mock
 
 from fabman import Fabman
 from fabman.member import Member
 from fabman.paginated_list import PaginatedList
+from fabman.resource_log import ResourceLog
 from tests import settings
 from tests.util import register_uris
 
@@ -52,13 +55,17 @@ class TestPaginatedList(unittest.TestCase):
             self.assertEqual(item.id, i + 1)
 
     def test_negative_index(self, m):
-        register_uris({"paginated_list": ["get_members_first"]}, m)
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
 
         members = self.fabman.get_members(limit=5)
         self.assertIsInstance(members, PaginatedList)
 
+        self.assertEqual(members[-1].id, 10)
+        self.assertEqual(members[-10].id, 1)
         with self.assertRaises(IndexError):
-            member = members[-1]
+            member = members[-11]
 
     def test_index(self, m):
         register_uris({"paginated_list": ["get_members_first"]}, m)
@@ -84,9 +91,534 @@ class TestPaginatedList(unittest.TestCase):
         register_uris(
             {"paginated_list": ["get_members_first", "get_members_second"]}, m
         )
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?limit=5&offset=10",
+            json=[],
+        )
 
         members = self.fabman.get_members(limit=5)
         self.assertIsInstance(members, PaginatedList)
 
         with self.assertRaises(IndexError):
             member = members[11]
+
+    def test_parse_links(self, m):
+        headers = {
+            "link": '<https://fabman.io/api/v1/members?limit=1&offset=0>; rel="prev", <https://fabman.io/api/v1/members?limit=1&offset=2>; rel="last"'
+        }
+        links = self.paginated_list._PaginatedList__parse_links(headers)
+        self.assertEqual(
+            links,
+            {
+                "prev": "/members?limit=1&offset=0",
+                "last": "/members?limit=1&offset=2",
+            },
+        )
+        self.assertIsNone(self.paginated_list._PaginatedList__format_link(headers))
+
+    def test_offset_endpoint(self, m):
+        offset_endpoint = self.paginated_list._PaginatedList__offset_endpoint
+        self.assertEqual(
+            offset_endpoint("/members?limit=5&offset=5&q=Dax", 2),
+            "/members?limit=5&offset=15&q=Dax",
+        )
+        self.assertIsNone(offset_endpoint("/members?cursor=abc", 1))
+
+    def test_prefetch_next_page(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, prefetch=1)
+        self.assertEqual(members[0].id, 1)
+
+        for future in list(members._prefetched.values()):
+            future.result()
+        self.assertEqual(m.call_count, 2)
+
+        items = list(members)
+        self.assertEqual([item.id for item in items], list(range(1, 11)))
+        self.assertEqual(m.call_count, 2)
+        self.assertIsNone(members._executor)
+
+    def test_prefetch_predicts_offsets(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?limit=5&offset=10",
+            json=[],
+        )
+
+        members = self.fabman.get_members(limit=5, prefetch=2)
+        items = list(members)
+
+        self.assertEqual([item.id for item in items], list(range(1, 11)))
+        self.assertEqual(len(members._prefetched), 0)
+        self.assertIsNone(members._executor)
+
+    def test_prefetch_stops_at_total_count(self, m):
+        url = f"{settings.BASE_URL_WITH_VERSION}/members"
+        m.register_uri(
+            "GET",
+            f"{url}?limit=4",
+            json=[{"id": i} for i in range(1, 5)],
+            headers={
+                "link": '</api/v1/members?limit=4&offset=4>; rel="next"',
+                "X-Total-Count": "6",
+            },
+        )
+        m.register_uri("GET", f"{url}?limit=4&offset=4", json=[{"id": 5}, {"id": 6}])
+
+        members = self.fabman.get_members(limit=4, prefetch=3)
+        self.assertEqual([member.id for member in members], list(range(1, 7)))
+        self.assertEqual(
+            [request.qs.get("offset") for request in m.request_history],
+            [None, ["4"]],
+        )
+
+    def test_prefetch_stops_at_short_page(self, m):
+        url = f"{settings.BASE_URL_WITH_VERSION}/members"
+        m.register_uri(
+            "GET",
+            f"{url}?limit=2",
+            json=[{"id": 1}, {"id": 2}],
+            headers={"link": '</api/v1/members?limit=2&offset=2>; rel="next"'},
+        )
+        m.register_uri(
+            "GET",
+            f"{url}?limit=2&offset=2",
+            json=[{"id": 3}],
+            headers={"link": '</api/v1/members?limit=2&offset=4>; rel="next"'},
+        )
+        m.register_uri("GET", f"{url}?limit=2&offset=4", json=[])
+
+        members = self.fabman.get_members(limit=2, prefetch=1)
+        members[0]  # pylint: disable=pointless-statement
+        for future in list(members._prefetched.values()):
+            future.result()
+        members._get_next_page()
+
+        self.assertEqual(members._prefetched, {})
+        offsets = [request.qs.get("offset") for request in m.request_history]
+        self.assertNotIn(["4"], offsets)
+
+    def test_fetch_all_with_last_link(self, m):
+        register_uris(
+            {
+                "paginated_list": [
+                    "get_resource_logs_first",
+                    "get_resource_logs_second",
+                    "get_resource_logs_third",
+                    "get_resource_logs_fourth",
+                ]
+            },
+            m,
+        )
+
+        logs = self.fabman.get_resource_logs(limit=2)
+        items = logs.fetch_all(parallelism=8)
+
+        self.assertEqual([item.id for item in items], list(range(1, 8)))
+        for item in items:
+            self.assertIsInstance(item, ResourceLog)
+        self.assertEqual(m.call_count, 4)
+        self.assertFalse(logs._has_next())
+        self.assertEqual([item.id for item in logs], list(range(1, 8)))
+        self.assertEqual(m.call_count, 4)
+
+    def test_fetch_all_probes(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+        for offset in (10, 15):
+            m.register_uri(
+                "GET",
+                f"{settings.BASE_URL_WITH_VERSION}/members?limit=5&offset={offset}",
+                json=[],
+            )
+
+        items = self.fabman.get_members(limit=5).fetch_all(parallelism=3)
+
+        self.assertEqual([item.id for item in items], list(range(1, 11)))
+
+    def test_fetch_all_stops_at_short_page(self, m):
+        url = f"{settings.BASE_URL_WITH_VERSION}/members"
+        for offset, ids in ((None, [1, 2, 3]), (3, [4, 5, 6]), (6, [7, 8])):
+            query = "limit=3" if offset is None else f"limit=3&offset={offset}"
+            next_offset = 3 if offset is None else offset + 3
+            m.register_uri(
+                "GET",
+                f"{url}?{query}",
+                json=[{"id": i} for i in ids],
+                headers={
+                    "link": f'</api/v1/members?limit=3&offset={next_offset}>; rel="next"'
+                },
+            )
+
+        items = self.fabman.get_members(limit=3).fetch_all(parallelism=2)
+
+        self.assertEqual([item.id for item in items], list(range(1, 9)))
+        self.assertEqual(m.call_count, 3)
+
+    def test_fetch_all_total_count(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?limit=5",
+            json=[{"id": i} for i in range(1, 6)],
+            headers={
+                "link": '</api/v1/members?limit=5&offset=5>; rel="next"',
+                "X-Total-Count": "8",
+            },
+        )
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?limit=5&offset=5",
+            json=[{"id": i} for i in range(6, 9)],
+        )
+
+        items = self.fabman.get_members(limit=5).fetch_all(parallelism=4)
+
+        self.assertEqual([item.id for item in items], list(range(1, 9)))
+        self.assertEqual(m.call_count, 2)
+
+    def test_fetch_all_unpredictable_links(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?limit=1",
+            json=[{"id": 1}],
+            headers={"link": '</api/v1/members?cursor=b>; rel="next"'},
+        )
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?cursor=b",
+            json=[{"id": 2}],
+        )
+
+        items = self.fabman.get_members(limit=1).fetch_all()
+
+        self.assertEqual([item.id for item in items], [1, 2])
+
+    def test_incremental_iteration(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, incremental=True)
+        items = [member for member in members]
+
+        self.assertEqual([item.id for item in items], list(range(1, 11)))
+        for item in items:
+            self.assertIsInstance(item, Member)
+        self.assertEqual(len(members._elements), 10)
+        self.assertFalse(members._has_next())
+
+    def test_incremental_yields_before_page_is_complete(self, m):
+        register_uris({"paginated_list": ["get_members_first"]}, m)
+
+        members = self.fabman.get_members(limit=5, incremental=True)
+        iterator = iter(members)
+
+        self.assertEqual(next(iterator).id, 1)
+        self.assertEqual(len(members._elements), 0)
+
+    def test_incremental_abandoned_page(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, incremental=True)
+        iterator = iter(members)
+        next(iterator)
+        iterator.close()
+
+        self.assertEqual([item.id for item in members], list(range(1, 11)))
+
+    def test_iter_pages(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5)
+        pages = [[member.id for member in page] for page in members.iter_pages()]
+
+        self.assertEqual(pages, [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10]])
+        self.assertEqual(members._elements, [])
+
+    def test_unretained_iteration(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, retain=False)
+
+        self.assertEqual([member.id for member in members], list(range(1, 11)))
+        self.assertEqual(members._elements, [])
+        self.assertEqual(m.call_count, 2)
+
+        self.assertEqual([member.id for member in members], list(range(1, 11)))
+        self.assertEqual(m.call_count, 4)
+
+    def test_unretained_incremental_iteration(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, retain=False, incremental=True)
+
+        self.assertEqual([member.id for member in members], list(range(1, 11)))
+        self.assertEqual(members._elements, [])
+
+    def test_lazy(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, lazy=True)
+
+        self.assertEqual([member.id for member in members], list(range(1, 11)))
+        self.assertIsNotNone(members[0]._raw)
+        self.assertEqual(members[0].to_dict()["id"], 1)
+
+        members = self.fabman.get_members(limit=5, lazy=True, incremental=True)
+        self.assertEqual([member.id for member in members], list(range(1, 11)))
+
+    def test_unretained_index(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, retain=False)
+
+        self.assertEqual(members[7].id, 8)
+        self.assertEqual(members[6].id, 7)
+        # the first page, to learn the page size, then the page holding both
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(members._elements, [])
+        self.assertEqual(list(members._pages), [1])
+
+    def test_unretained_index_empty(self, m):
+        m.register_uri("GET", f"{settings.BASE_URL_WITH_VERSION}/members", json=[])
+
+        members = self.fabman.get_members(retain=False)
+
+        for _ in range(2):
+            with self.assertRaises(IndexError):
+                members[0]  # pylint: disable=pointless-statement
+
+    def test_index_with_smaller_pages_than_limit(self, m):
+        url = f"{settings.BASE_URL_WITH_VERSION}/members"
+
+        def serve(request, context):
+            # the API returns at most 3 members per page, whatever the limit
+            offset = int(request.qs.get("offset", ["0"])[0])
+            if offset + 3 < 40:
+                context.headers["link"] = (
+                    f'</api/v1/members?limit=10&offset={offset + 3}>; rel="next"'
+                )
+            return [{"id": i + 1} for i in range(offset, min(offset + 3, 40))]
+
+        m.register_uri("GET", url, json=serve)
+
+        for retain in (True, False):
+            members = self.fabman.get_members(limit=10, retain=retain)
+            self.assertEqual(members[25].id, 26)
+            self.assertEqual(members[39].id, 40)
+            with self.assertRaises(IndexError):
+                members[40]  # pylint: disable=pointless-statement
+        self.assertEqual(len(list(self.fabman.get_members(limit=10))), 40)
+
+    def test_unretained_fetch_all(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, retain=False)
+        items = members.fetch_all(parallelism=1)
+
+        self.assertEqual([item.id for item in items], list(range(1, 11)))
+        self.assertEqual(members._elements, [])
+
+    def register_resource_logs(self, m):
+        register_uris(
+            {
+                "paginated_list": [
+                    "get_resource_logs_first",
+                    "get_resource_logs_second",
+                    "get_resource_logs_third",
+                    "get_resource_logs_fourth",
+                ]
+            },
+            m,
+        )
+
+    def test_to_columns(self, m):
+        self.register_resource_logs(m)
+        logs = self.fabman.get_resource_logs(limit=2)
+
+        columns = logs.to_columns(["id", "type", "member"])
+
+        self.assertEqual(columns["id"], list(range(1, 8)))
+        self.assertEqual(columns["type"], ["allowed"] * 7)
+        self.assertEqual(columns["member"], [None] * 7)
+        self.assertEqual(logs._elements, [])
+        self.assertEqual(m.call_count, 4)
+
+    def test_to_columns_nested(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/resource-logs",
+            json=[
+                {"id": 1, "_embedded": {"member": {"firstName": "Kira"}}},
+                {"id": 2, "_embedded": {"member": None}},
+                None,
+            ],
+        )
+        logs = self.fabman.get_resource_logs()
+
+        columns = logs.to_columns(["id", "_embedded.member.firstName"])
+        self.assertEqual(
+            columns, {"id": [1, 2], "_embedded.member.firstName": ["Kira", None]}
+        )
+
+    def test_to_pandas(self, m):
+        self.register_resource_logs(m)
+        pandas = mock.Mock()
+
+        with mock.patch.dict(sys.modules, {"pandas": pandas}):
+            frame = self.fabman.get_resource_logs(limit=2).to_pandas(["id"])
+
+        self.assertIs(frame, pandas.DataFrame.return_value)
+        pandas.DataFrame.assert_called_once_with(
+            {"id": list(range(1, 8))}, columns=["id"]
+        )
+
+    def test_to_arrow(self, m):
+        self.register_resource_logs(m)
+        pyarrow = mock.Mock()
+
+        with mock.patch.dict(sys.modules, {"pyarrow": pyarrow}):
+            table = self.fabman.get_resource_logs(limit=2).to_arrow(["id", "type"])
+
+        self.assertIs(table, pyarrow.table.return_value)
+        pyarrow.table.assert_called_once_with(
+            {"id": list(range(1, 8)), "type": ["allowed"] * 7}
+        )
+
+    def test_to_pandas_not_installed(self, m):
+        with mock.patch.dict(sys.modules, {"pandas": None}):
+            with self.assertRaises(ImportError):
+                self.fabman.get_resource_logs().to_pandas(["id"])
+        self.assertFalse(m.called)
+
+    def test_index_jumps_to_page(self, m):
+        self.register_resource_logs(m)
+
+        logs = self.fabman.get_resource_logs(limit=2)
+        log = logs[6]
+
+        self.assertEqual(log.id, 7)
+        self.assertEqual(
+            [request.qs.get("offset") for request in m.request_history],
+            [None, ["6"]],
+        )
+        self.assertEqual(len(logs._elements), 2)
+
+    def test_index_deep_without_walking(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?limit=50",
+            json=[{"id": 1 + i} for i in range(50)],
+            headers={"link": '</api/v1/members?limit=50&offset=50>; rel="next"'},
+        )
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?limit=50&offset=10000",
+            json=[{"id": 10001 + i} for i in range(50)],
+        )
+
+        members = self.fabman.get_members(limit=50)
+
+        self.assertEqual(members[10000].id, 10001)
+        self.assertEqual(members[10049].id, 10050)
+        self.assertEqual(m.call_count, 2)
+
+    def test_len_from_last_link(self, m):
+        self.register_resource_logs(m)
+
+        logs = self.fabman.get_resource_logs(limit=2)
+
+        self.assertEqual(len(logs), 7)
+        self.assertEqual(m.call_count, 2)
+
+    def test_len_from_total_count(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/members?limit=5",
+            json=[{"id": i} for i in range(1, 6)],
+            headers={
+                "link": '</api/v1/members?limit=5&offset=5>; rel="next"',
+                "X-Total-Count": "1234",
+            },
+        )
+
+        self.assertEqual(len(self.fabman.get_members(limit=5)), 1234)
+        self.assertEqual(m.call_count, 1)
+
+    def test_len_by_walking(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        self.assertEqual(len(self.fabman.get_members(limit=5)), 10)
+        self.assertEqual(len(self.fabman.get_members(limit=5, retain=False)), 10)
+
+    def test_unretained_len_is_kept(self, m):
+        register_uris(
+            {"paginated_list": ["get_members_first", "get_members_second"]}, m
+        )
+
+        members = self.fabman.get_members(limit=5, retain=False)
+        self.assertEqual(len(members), 10)
+        calls = m.call_count
+
+        self.assertEqual(len(members), 10)
+        self.assertEqual(members[-1].id, 10)
+        self.assertEqual(members[-2].id, 9)
+        # only the last page is requested again, to index into it
+        self.assertEqual(m.call_count, calls + 1)
+
+    def test_slice(self, m):
+        self.register_resource_logs(m)
+
+        logs = self.fabman.get_resource_logs(limit=2)
+
+        self.assertEqual([log.id for log in logs[4:6]], [5, 6])
+        self.assertEqual([log.id for log in logs[5:100]], [6, 7])
+        self.assertEqual([log.id for log in logs[-2:]], [6, 7])
+        self.assertEqual([log.id for log in logs[::3]], [1, 4, 7])
+        self.assertEqual([log.id for log in logs[::-3]], [7, 4, 1])
+        self.assertEqual(logs[10:12], [])
+        with self.assertRaises(IndexError):
+            logs[8]
+
+    def test_slice_only_fetches_needed_pages(self, m):
+        self.register_resource_logs(m)
+
+        logs = self.fabman.get_resource_logs(limit=2)
+        logs[4:6]
+
+        self.assertEqual(
+            [request.qs.get("offset") for request in m.request_history],
+            [None, ["4"]],
+        )
+
+    def test_iteration_after_jump(self, m):
+        self.register_resource_logs(m)
+
+        logs = self.fabman.get_resource_logs(limit=2)
+        logs[5]
+
+        self.assertEqual([log.id for log in logs], list(range(1, 8)))
@@ -0,0 +1,84 @@
+"""Tests for the RateLimiter class"""
+# pylint: disable=missing-docstring, invalid-name, unused-argument, protected-access
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+from fabman.rate_limiter import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.now = 100.0
+        patcher = mock.patch("fabman.rate_limiter.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.limiter = RateLimiter(2, burst=3)
+
+    def test_repr(self):
+        self.assertEqual("<RateLimiter rate=2/s burst=3>", repr(self.limiter))
+
+    def test_default_burst(self):
+        self.assertEqual(RateLimiter(5).burst, 5)
+        self.assertEqual(RateLimiter(0.5).burst, 1)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(0)
+        with self.assertRaises(ValueError):
+            RateLimiter(1, burst=0)
+
+    @mock.patch("fabman.rate_limiter.sleep")
+    def test_burst_then_pace(self, sleep):
+        for _ in range(3):
+            self.assertEqual(self.limiter.acquire(), 0)
+        sleep.assert_not_called()
+
+        self.assertAlmostEqual(self.limiter.acquire(), 0.5)
+        self.assertAlmostEqual(self.limiter.acquire(), 1.0)
+        self.assertEqual(sleep.call_count, 2)
+
+    @mock.patch("fabman.rate_limiter.sleep")
+    def test_refill(self, sleep):
+        for _ in range(3):
+            self.limiter.acquire()
+
+        self.now += 1.0
+        self.assertEqual(self.limiter.acquire(), 0)
+        self.assertEqual(self.limiter.acquire(), 0)
+        self.assertAlmostEqual(self.limiter.acquire(), 0.5)
+
+    @mock.patch("fabman.rate_limiter.sleep")
+    def test_refill_capped_at_burst(self, sleep):
+        self.now += 60
+        for _ in range(3):
+            self.assertEqual(self.limiter.acquire(), 0)
+        self.assertAlmostEqual(self.limiter.acquire(), 0.5)
+
+    @mock.patch("fabman.rate_limiter.sleep")
+    def test_shared_between_threads(self, sleep):
+        waits = []
+        threads = [
+            threading.Thread(target=lambda: waits.append(self.limiter.acquire()))
+            for _ in range(7)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(waits), [0, 0, 0, 0.5, 1.0, 1.5, 2.0])
+
+    def test_acquire_async(self):
+        sleeps = []
+
+        async def sleep(seconds):
+            sleeps.append(seconds)
+
+        async def acquire_all():
+            return [await self.limiter.acquire_async() for _ in range(4)]
+
+        with mock.patch("fabman.rate_limiter.asyncio.sleep", sleep):
+            self.assertEqual(asyncio.run(acquire_all()), [0, 0, 0, 0.5])
+        self.assertEqual(sleeps, [0.5])
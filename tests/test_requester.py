@@ -1,9 +1,16 @@
 """Tests for the Requester Class"""
 # pylint: disable=missing-docstring, invalid-name, unused-argument, protected-access
+import socket
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
+import requests
 import requests_mock
 
+from fabman.adapter import FabmanHTTPAdapter, keepalive_socket_options
+from fabman.cache import ResponseCache
 from fabman.exceptions import (
     BadRequest,
     Conflict,
@@ -14,7 +21,9 @@ from fabman.exceptions import (
     Unauthorized,
     UnprocessableEntity,
 )
+from fabman.rate_limiter import RateLimiter
 from fabman.requester import Requester
+from fabman.retry import RetryPolicy
 from tests import settings
 from tests.util import test_exceptions
 
@@ -27,6 +36,114 @@ class TestRequester(unittest.TestCase):
     def test_sanity(self, m):
         self.assertEqual(1, 1)
 
+    def test_adapter_defaults(self, m):
+        adapter = self.requester.adapter
+        self.assertIsInstance(adapter, FabmanHTTPAdapter)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertIsNone(adapter.socket_options)
+
+    def test_adapter_tuning(self, m):
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION,
+            settings.API_KEY,
+            pool_maxsize=32,
+            max_retries=2,
+            keepalive=60,
+        )
+        adapter = requester.adapter
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn(
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), adapter.socket_options
+        )
+        self.assertEqual(
+            adapter.poolmanager.connection_pool_kw["socket_options"],
+            adapter.socket_options,
+        )
+
+    def test_keepalive_socket_options(self, m):
+        options = keepalive_socket_options(30.5)
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), options)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            self.assertIn((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30), options)
+
+    def test_caller_dicts_not_modified(self, m):
+        m.register_uri("GET", f"{settings.BASE_URL_WITH_VERSION}/test", json={})
+        headers = {"X-Test": "1"}
+        params = {"limit": 5}
+
+        self.requester.request(
+            "GET", "/test", headers=headers, _kwargs=params, offset=10
+        )
+
+        self.assertEqual(headers, {"X-Test": "1"})
+        self.assertEqual(params, {"limit": 5})
+        self.assertEqual(m.last_request.qs, {"limit": ["5"], "offset": ["10"]})
+        self.assertEqual(m.last_request.headers["Authorization"], "Bearer 123")
+
+    def test_session_per_thread(self, m):
+        sessions = []
+
+        def get_session():
+            sessions.append(self.requester._session)
+            self.assertIs(self.requester._session, sessions[-1])
+
+        threads = [threading.Thread(target=get_session) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIsNot(sessions[0], sessions[1])
+        for session in sessions:
+            self.assertIs(
+                session.get_adapter("https://fabman.io"), self.requester.adapter
+            )
+
+    def test_shared_between_threads(self, m):
+        def respond(request, context):
+            return {"id": int(request.path.rsplit("/", 1)[1]), "thread": request.qs}
+
+        m.register_uri(
+            "GET",
+            requests_mock.ANY,
+            json=respond,
+        )
+        shared_params = {"embed": "key"}
+
+        def get(index):
+            response = self.requester.request(
+                "GET",
+                f"/members/{index}",
+                headers={"X-Index": str(index)},
+                _kwargs=shared_params,
+                limit=index,
+            )
+            return index, response.json(), response.request.headers["X-Index"]
+
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(executor.map(get, range(200)))
+
+        for index, data, header in results:
+            self.assertEqual(data["id"], index)
+            self.assertEqual(data["thread"], {"embed": ["key"], "limit": [str(index)]})
+            self.assertEqual(header, str(index))
+        self.assertEqual(shared_params, {"embed": "key"})
+        self.assertEqual(m.call_count, 200)
+
+    def test_timeout(self, m):
+        m.register_uri("GET", f"{settings.BASE_URL_WITH_VERSION}/test", json={})
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, timeout=(3.05, 27)
+        )
+
+        requester.request("GET", "/test")
+        self.assertEqual(m.last_request.timeout, (3.05, 27))
+
+        self.requester.request("GET", "/test")
+        self.assertIsNone(m.last_request.timeout)
+
     def test_instance(self, m):
         self.assertIsInstance(self.requester, Requester)
 
@@ -76,15 +193,206 @@ class TestRequester(unittest.TestCase):
         with self.assertRaises(ValueError, msg="Invalid method GAHBAGE"):
             self.requester.request("GAHBAGE", "/test")
 
-    def test_cache(self, m):
+    def test_rate_limiter(self, m):
         m.register_uri("GET", f"{settings.BASE_URL_WITH_VERSION}/test", status_code=200)
-        for i in range(4):
-            self.assertTrue(len(self.requester._Requester__cache) == i)
+        limiter = mock.Mock(spec=RateLimiter)
+        limiter.acquire.return_value = 0
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, rate_limiter=limiter
+        )
+
+        requester.request("GET", "/test")
+        requester.request("GET", "/test")
+
+        self.assertEqual(limiter.acquire.call_count, 2)
+
+    @mock.patch("fabman.requester.sleep")
+    def test_retry_transient_error(self, m, sleep):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/test",
+            [{"status_code": 502}, {"status_code": 503}, {"status_code": 200}],
+        )
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, retry_policy=RetryPolicy()
+        )
+
+        resp = requester.request("GET", "/test")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    @mock.patch("fabman.requester.sleep")
+    def test_retry_honours_retry_after(self, m, sleep):
+        m.register_uri(
+            "POST",
+            f"{settings.BASE_URL_WITH_VERSION}/test",
+            [
+                {"status_code": 429, "headers": {"Retry-After": "4"}},
+                {"status_code": 201},
+            ],
+        )
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, retry_policy=RetryPolicy()
+        )
+
+        resp = requester.request("POST", "/test")
+
+        self.assertEqual(resp.status_code, 201)
+        sleep.assert_called_once_with(4.0)
+
+    @mock.patch("fabman.requester.sleep")
+    def test_retry_exhausted(self, m, sleep):
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/test_429", status_code=429
+        )
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION,
+            settings.API_KEY,
+            retry_policy=RetryPolicy(max_retries=2),
+        )
+
+        with self.assertRaises(RateLimitExceeded):
+            requester.request("GET", "/test_429")
+
+        self.assertEqual(m.call_count, 3)
+
+    @mock.patch("fabman.requester.sleep")
+    def test_retry_connection_error(self, m, sleep):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/test",
+            [{"exc": requests.ConnectionError}, {"status_code": 200}],
+        )
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, retry_policy=RetryPolicy()
+        )
+
+        resp = requester.request("GET", "/test")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(m.call_count, 2)
+
+    @mock.patch("fabman.requester.sleep")
+    def test_no_retry_by_default(self, m, sleep):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/test",
+            [{"exc": requests.ConnectionError}, {"status_code": 200}],
+        )
+
+        with self.assertRaises(requests.ConnectionError):
             self.requester.request("GET", "/test")
-            self.assertTrue(len(self.requester._Requester__cache) == i + 1)
 
+        sleep.assert_not_called()
+
+    def test_no_cache_by_default(self, m):
+        m.register_uri("GET", f"{settings.BASE_URL_WITH_VERSION}/test", status_code=200)
+
+        self.requester.request("GET", "/test")
         self.requester.request("GET", "/test")
-        self.assertTrue(len(self.requester._Requester__cache) == 4)
+
+        self.assertIsNone(self.requester.cache)
+        self.assertEqual(m.call_count, 2)
+
+    def test_cache_hit(self, m):
+        m.register_uri("GET", f"{settings.BASE_URL_WITH_VERSION}/test", json={"id": 1})
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, cache=ResponseCache()
+        )
+
+        first = requester.request("GET", "/test", _kwargs={"embed": "key"})
+        second = requester.request("GET", "/test", _kwargs={"embed": "key"})
+        requester.request("GET", "/test", _kwargs={"embed": "trainings"})
+
+        self.assertIs(first, second)
+        self.assertEqual(m.call_count, 2)
+
+    def test_cache_shared_between_api_keys(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/test",
+            [{"json": {"tenant": "a"}}, {"json": {"tenant": "b"}}],
+        )
+        cache = ResponseCache()
+        tenant_a = Requester(settings.BASE_URL_WITH_VERSION, "key-a", cache=cache)
+        tenant_b = Requester(settings.BASE_URL_WITH_VERSION, "key-b", cache=cache)
+
+        self.assertEqual(tenant_a.request("GET", "/test").json(), {"tenant": "a"})
+        self.assertEqual(tenant_b.request("GET", "/test").json(), {"tenant": "b"})
+        self.assertEqual(tenant_a.request("GET", "/test").json(), {"tenant": "a"})
+        self.assertEqual(m.call_count, 2)
+
+    def test_cache_revalidation(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/test",
+            [
+                {"json": {"id": 1}, "headers": {"ETag": '"v1"'}},
+                {"status_code": 304},
+            ],
+        )
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, cache=ResponseCache(ttl=0)
+        )
+
+        first = requester.request("GET", "/test")
+        second = requester.request("GET", "/test")
+
+        self.assertIs(first, second)
+        self.assertEqual(second.json(), {"id": 1})
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(m.last_request.headers["If-None-Match"], '"v1"')
+
+    def test_cache_invalidated_by_write(self, m):
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/members", json=[{"id": 1}]
+        )
+        m.register_uri(
+            "PUT", f"{settings.BASE_URL_WITH_VERSION}/members/1", json={"id": 1}
+        )
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, cache=ResponseCache()
+        )
+
+        requester.request("GET", "/members")
+        requester.request("PUT", "/members/1")
+        requester.request("GET", "/members")
+
+        self.assertEqual(m.call_count, 3)
+
+    def test_cache_ignores_errors(self, m):
+        m.register_uri(
+            "GET",
+            f"{settings.BASE_URL_WITH_VERSION}/test_404",
+            text=test_exceptions,
+            status_code=404,
+        )
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, cache=ResponseCache()
+        )
+
+        for _ in range(2):
+            with self.assertRaises(FabmanException):
+                requester.request("GET", "/test_404")
+
+        self.assertEqual(len(requester.cache), 0)
+
+    def test_stream(self, m):
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/test", content=b'[{"id": 1}]'
+        )
+        requester = Requester(
+            settings.BASE_URL_WITH_VERSION, settings.API_KEY, cache=ResponseCache()
+        )
+
+        resp = requester.request("GET", "/test", stream=True)
+        self.assertEqual(b"".join(resp.iter_content(4)), b'[{"id": 1}]')
+
+        requester.request("GET", "/test", stream=True)
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(len(requester.cache), 0)
 
     def test_400(self, m):
         m.register_uri(
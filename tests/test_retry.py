@@ -0,0 +1,82 @@
+"""Tests for the RetryPolicy class"""
+# pylint: disable=missing-docstring, invalid-name, unused-argument, protected-access
+import unittest
+from email.utils import formatdate
+from unittest import mock
+
+import requests
+
+from fabman.retry import RetryPolicy
+
+
+def make_response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_retries=3, backoff_factor=1, max_backoff=5)
+
+    def test_repr(self):
+        self.assertEqual("<RetryPolicy max_retries=3>", repr(self.policy))
+
+    def test_backoff_is_jittered_and_capped(self):
+        with mock.patch("fabman.retry.random.uniform", lambda a, b: b):
+            self.assertEqual(
+                [self.policy.get_backoff(i) for i in range(5)], [1, 2, 4, 5, 5]
+            )
+        for attempt in range(5):
+            self.assertLessEqual(self.policy.get_backoff(attempt), 5)
+
+    def test_retry_after_seconds(self):
+        response = make_response(429, {"Retry-After": "3"})
+        self.assertEqual(RetryPolicy.get_retry_after(response), 3)
+
+    def test_retry_after_date(self):
+        response = make_response(503, {"Retry-After": formatdate(usegmt=True)})
+        self.assertLessEqual(RetryPolicy.get_retry_after(response), 1)
+
+    def test_retry_after_invalid(self):
+        response = make_response(429, {"Retry-After": "soon"})
+        self.assertIsNone(RetryPolicy.get_retry_after(response))
+
+    def test_rate_limit_reset(self):
+        response = make_response(429, {"X-RateLimit-Reset": "2"})
+        self.assertEqual(RetryPolicy.get_retry_after(response), 2)
+
+    def test_rate_limit_reset_epoch(self):
+        with mock.patch("fabman.retry.time.time", return_value=1700000000):
+            response = make_response(429, {"RateLimit-Reset": "1700000004"})
+            self.assertEqual(RetryPolicy.get_retry_after(response), 4)
+
+    def test_no_header(self):
+        self.assertIsNone(RetryPolicy.get_retry_after(make_response(429)))
+
+    def test_delay_uses_retry_after(self):
+        response = make_response(429, {"Retry-After": "2"})
+        self.assertEqual(self.policy.get_delay("GET", 0, 0, response), 2)
+
+    def test_no_retry_for_client_errors(self):
+        self.assertIsNone(self.policy.get_delay("GET", 0, 0, make_response(404)))
+        self.assertIsNone(self.policy.get_delay("GET", 0, 0, make_response(200)))
+
+    def test_post_only_retried_on_429(self):
+        self.assertIsNone(self.policy.get_delay("POST", 0, 0, make_response(502)))
+        self.assertIsNone(self.policy.get_delay("POST", 0, 0))
+        self.assertIsNotNone(self.policy.get_delay("POST", 0, 0, make_response(429)))
+
+    def test_connection_error(self):
+        self.assertIsNotNone(self.policy.get_delay("GET", 0, 0))
+
+    def test_max_retries(self):
+        self.assertIsNotNone(self.policy.get_delay("GET", 2, 0, make_response(502)))
+        self.assertIsNone(self.policy.get_delay("GET", 3, 0, make_response(502)))
+
+    def test_max_total_time(self):
+        policy = RetryPolicy(max_total_time=10)
+        response = make_response(429, {"Retry-After": "5"})
+        self.assertEqual(policy.get_delay("GET", 0, 5, response), 5)
+        self.assertIsNone(policy.get_delay("GET", 0, 6, response))
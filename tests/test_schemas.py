@@ -0,0 +1,118 @@
+"""Tests for typed schemas."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument
+import unittest
+
+import requests_mock
+
+from fabman import Fabman
+from fabman.account import Account
+from fabman.exceptions import SchemaError
+from fabman.member import Member
+from fabman.schemas import (
+    BookingSchema,
+    ChargeSchema,
+    InvoiceSchema,
+    MemberSchema,
+    PaymentSchema,
+    ResourceLogSchema,
+    decode,
+    schema_for,
+)
+from tests import settings
+from tests.util import register_uris
+
+
+class TestDecode(unittest.TestCase):
+    def test_decode(self):
+        member = decode(
+            b'{"id": 1, "firstName": "Julian", "unknown": 2, "_embedded": {"a": 1}}',
+            MemberSchema,
+        )
+
+        self.assertIsInstance(member, MemberSchema)
+        self.assertEqual(member.id, 1)
+        self.assertEqual(member.firstName, "Julian")
+        self.assertIsNone(member.lastName)
+        self.assertEqual(member.embedded, {"a": 1})
+        self.assertFalse(hasattr(member, "unknown"))
+
+    def test_decode_many(self):
+        payments = decode(
+            b'[{"id": 1, "total": 12.34}, null, {"id": 2, "total": "5.00"}]',
+            PaymentSchema,
+            many=True,
+        )
+
+        self.assertEqual([payment.id for payment in payments], [1, 2])
+        self.assertEqual([payment.total for payment in payments], [12.34, "5.00"])
+
+    def test_validation(self):
+        for body in (
+            b'{"id": "1"}',
+            b'{"id": true}',
+            b'{"firstName": null}',
+            b'{"metadata": []}',
+        ):
+            with self.assertRaises(SchemaError, msg=body):
+                decode(body, MemberSchema)
+
+        with self.assertRaises(SchemaError):
+            decode(b'{"id": 1}', MemberSchema, many=True)
+        with self.assertRaises(SchemaError):
+            decode(b"[1]", MemberSchema, many=True)
+
+    def test_schema_for(self):
+        self.assertIs(schema_for(Member), MemberSchema)
+        with self.assertRaises(ValueError):
+            schema_for(Account)
+
+
+@requests_mock.Mocker()
+class TestIterStructs(unittest.TestCase):
+    def setUp(self):
+        self.fabman = Fabman(settings.API_KEY)
+
+    def test_fixtures_match_schemas(self, m):
+        for fixture, method, schema in (
+            ("get_bookings", self.fabman.get_bookings, BookingSchema),
+            ("get_charges", self.fabman.get_charges, ChargeSchema),
+            ("get_invoices", self.fabman.get_invoices, InvoiceSchema),
+            ("get_members", self.fabman.get_members, MemberSchema),
+            ("get_payments", self.fabman.get_payments, PaymentSchema),
+            ("get_resource_logs", self.fabman.get_resource_logs, ResourceLogSchema),
+        ):
+            register_uris({"fabman": [fixture]}, m)
+
+            records = list(method().iter_structs())
+
+            self.assertTrue(records, fixture)
+            for record in records:
+                self.assertIsInstance(record, schema)
+            self.assertEqual(
+                [record.id for record in records], [obj.id for obj in method()]
+            )
+
+    def test_pages(self, m):
+        register_uris(
+            {
+                "paginated_list": [
+                    "get_resource_logs_first",
+                    "get_resource_logs_second",
+                    "get_resource_logs_third",
+                    "get_resource_logs_fourth",
+                ]
+            },
+            m,
+        )
+        logs = self.fabman.get_resource_logs(limit=2)
+
+        records = list(logs.iter_structs())
+
+        self.assertEqual([record.id for record in records], list(range(1, 8)))
+        self.assertEqual(logs._elements, [])  # pylint: disable=protected-access
+
+    def test_explicit_schema(self, m):
+        register_uris({"fabman": ["get_members"]}, m)
+
+        records = list(self.fabman.get_members().iter_structs(MemberSchema))
+        self.assertIsInstance(records[0], MemberSchema)
@@ -0,0 +1,175 @@
+"""Tests for request coalescing."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument, protected-access
+import threading
+import time
+import unittest
+
+import requests_mock
+
+from fabman import Fabman
+from fabman.exceptions import ResourceDoesNotExist
+from fabman.member import Member
+from fabman.single_flight import SingleFlight
+from tests import settings
+
+
+def wait_for_waiters(single_flight, count):
+    """Waits until :code:`count` callers wait on the single call in flight"""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        calls = list(single_flight._calls.values())
+        if calls and calls[0].waiters >= count:
+            return
+        time.sleep(0.001)
+    raise AssertionError("callers did not join the call in flight")
+
+
+class Burst(object):
+    """Runs a blocking call on one thread and the same call on several others, which
+    join it while it is in flight"""
+
+    def __init__(self, single_flight, target, followers=4):
+        self.single_flight = single_flight
+        self.target = target
+        self.followers = followers
+        self.results = []
+        self.lock = threading.Lock()
+
+    def _run(self):
+        try:
+            result = self.target()
+        except Exception as exception:  # pylint: disable=broad-except
+            result = exception
+        with self.lock:
+            self.results.append(result)
+
+    def run(self, started, release):
+        threads = [threading.Thread(target=self._run)]
+        threads[0].start()
+        self.assert_started(started)
+        for _ in range(self.followers):
+            thread = threading.Thread(target=self._run)
+            thread.start()
+            threads.append(thread)
+        wait_for_waiters(self.single_flight, self.followers)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return self.results
+
+    @staticmethod
+    def assert_started(started):
+        if not started.wait(5):
+            raise AssertionError("call did not start")
+
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def blocking(self, result=None, exception=None):
+        def call():
+            self.calls += 1
+            self.started.set()
+            self.release.wait(5)
+            if exception is not None:
+                raise exception
+            return result
+
+        return call
+
+    def test_shares_result(self):
+        call = self.blocking(result=object())
+        burst = Burst(self.single_flight, lambda: self.single_flight.do("key", call))
+
+        results = burst.run(self.started, self.release)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len(results), 5)
+        self.assertEqual(len({id(result) for result, _ in results}), 1)
+        self.assertTrue(all(shared for _, shared in results))
+        self.assertEqual(len(self.single_flight), 0)
+
+    def test_shares_exception(self):
+        error = ValueError("failed")
+        call = self.blocking(exception=error)
+        burst = Burst(self.single_flight, lambda: self.single_flight.do("key", call))
+
+        results = burst.run(self.started, self.release)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [error] * 5)
+
+    def test_sequential_calls_not_shared(self):
+        self.assertEqual(self.single_flight.do("key", lambda: 1), (1, False))
+        self.assertEqual(self.single_flight.do("key", lambda: 2), (2, False))
+
+    def test_keys_independent(self):
+        self.release.set()
+        self.assertEqual(self.single_flight.do("a", self.blocking(1)), (1, False))
+        self.assertEqual(self.single_flight.do("b", self.blocking(2)), (2, False))
+        self.assertEqual(self.calls, 2)
+
+
+@requests_mock.Mocker()
+class TestCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.fabman = Fabman(settings.API_KEY, coalesce=True)
+        self.requester = self.fabman._Fabman__requester
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def register_member(self, m, status_code=200):
+        def respond(request, context):
+            self.started.set()
+            self.release.wait(5)
+            context.status_code = status_code
+            return {"id": 1, "firstName": "Julian"}
+
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/members/1", json=respond
+        )
+
+    def burst(self, target):
+        return Burst(self.requester._Requester__single_flight, target).run(
+            self.started, self.release
+        )
+
+    def test_identical_gets_share_request(self, m):
+        self.register_member(m)
+
+        members = self.burst(lambda: self.fabman.get_member(1))
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(len(members), 5)
+        for member in members:
+            self.assertIsInstance(member, Member)
+            self.assertEqual(member.firstName, "Julian")
+        # every caller gets its own object
+        self.assertEqual(len({id(member) for member in members}), 5)
+
+    def test_errors_raised_for_every_caller(self, m):
+        self.register_member(m, status_code=404)
+
+        results = self.burst(lambda: self.fabman.get_member(1))
+
+        self.assertEqual(m.call_count, 1)
+        for result in results:
+            self.assertIsInstance(result, ResourceDoesNotExist)
+
+    def test_different_params_not_shared(self, m):
+        m.register_uri(
+            "GET", f"{settings.BASE_URL_WITH_VERSION}/members/1", json={"id": 1}
+        )
+
+        self.fabman.get_member(1, embed="key")
+        self.fabman.get_member(1)
+
+        self.assertEqual(m.call_count, 2)
+
+    def test_off_by_default(self, m):
+        self.assertFalse(Fabman(settings.API_KEY)._Fabman__requester.coalesce)
+        self.assertTrue(self.requester.coalesce)
@@ -0,0 +1,161 @@
+"""Tests for the SQLite mirror store."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument
+
+import os
+import tempfile
+import unittest
+
+import requests_mock
+
+from fabman import Fabman
+from fabman.member import Member
+from fabman.requester import Requester
+from fabman.resource_log import ResourceLog
+from fabman.store import SQLiteStore
+from fabman.sync import SyncCollection, Synchronizer
+from tests import settings
+from tests.util import register_uris
+
+
+def resource_log(log_id, resource, created_at):
+    return {
+        "id": log_id,
+        "resource": resource,
+        "member": 1,
+        "createdAt": created_at,
+        "updatedAt": created_at,
+    }
+
+
+class TestSQLiteStore(unittest.TestCase):
+    def setUp(self):
+        self.store = SQLiteStore()
+        self.store.upsert(
+            "resource_logs",
+            [
+                resource_log(1, 1, "2023-06-01T10:00:00.000Z"),
+                resource_log(2, 2, "2023-06-02T10:00:00.000Z"),
+                resource_log(3, 1, "2023-06-03T10:00:00.000Z"),
+                resource_log(4, 1, "2023-07-01T10:00:00.000Z"),
+            ],
+        )
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_repr(self):
+        self.assertEqual(repr(self.store), "<SQLiteStore :memory:>")
+
+    def test_get(self):
+        self.assertEqual(self.store.get("resource_logs", 2)["resource"], 2)
+        self.assertIsNone(self.store.get("resource_logs", 9))
+        self.assertIsNone(self.store.get("members", 1))
+
+    def test_all(self):
+        logs = self.store.all("resource_logs")
+        self.assertEqual([log["id"] for log in logs], [1, 2, 3, 4])
+        self.assertEqual(self.store.all("bookings"), [])
+
+    def test_upsert_replaces(self):
+        self.store.upsert("resource_logs", [resource_log(2, 3, "2023-06-02")])
+        self.assertEqual(self.store.get("resource_logs", 2)["resource"], 3)
+        self.assertEqual(len(self.store.all("resource_logs")), 4)
+
+    def test_upsert_objects(self):
+        requester = Requester(settings.BASE_URL_WITH_VERSION, settings.API_KEY)
+        self.store.upsert("members", [Member(requester, {"id": 7, "space": 1})])
+        self.assertEqual(
+            self.store.get("members", 7), {"id": 7, "space": 1, "_embedded": {}}
+        )
+
+    def test_find(self):
+        self.store.upsert("members", [{"id": 1, "space": 1}, {"id": 2, "space": 2}])
+        self.assertEqual([m["id"] for m in self.store.find("members", space=2)], [2])
+        self.assertEqual(len(self.store.find("resource_logs", member=1)), 4)
+
+        with self.assertRaises(ValueError):
+            self.store.find("members", firstName="John")
+
+    def test_invalid_collection(self):
+        with self.assertRaises(ValueError):
+            self.store.get('members"; DROP TABLE watermarks; --', 1)
+
+    def test_get_member_by_key(self):
+        self.store.upsert(
+            "members",
+            [
+                {
+                    "id": 1,
+                    "_embedded": {"key": {"token": "0a1b2c3d", "type": "em4102"}},
+                },
+                {"id": 2, "_embedded": {"key": None}},
+                {"id": 3},
+            ],
+        )
+        self.assertEqual(self.store.get_member_by_key("0a1b2c3d")["id"], 1)
+        self.assertIsNone(self.store.get_member_by_key("ffffffff"))
+
+    def test_get_resource_logs(self):
+        logs = self.store.get_resource_logs(1, since="2023-06-01", until="2023-07-01")
+        self.assertEqual([log["id"] for log in logs], [1, 3])
+        self.assertEqual(len(self.store.get_resource_logs()), 4)
+        self.assertEqual(len(self.store.get_resource_logs(since="2023-06-02")), 3)
+
+    def test_get_bookings(self):
+        self.store.upsert(
+            "bookings",
+            [
+                {"id": 1, "resource": 1, "fromDateTime": "2023-01-02T14:00"},
+                {"id": 2, "resource": 1, "fromDateTime": "2023-01-01T14:00"},
+                {"id": 3, "resource": 2, "fromDateTime": "2023-01-01T15:00"},
+            ],
+        )
+        bookings = self.store.get_bookings(1)
+        self.assertEqual([booking["id"] for booking in bookings], [2, 1])
+        bookings = self.store.get_bookings(until="2023-01-02")
+        self.assertEqual([booking["id"] for booking in bookings], [2, 3])
+
+    def test_watermarks(self):
+        self.assertIsNone(self.store.get_watermark("members"))
+        self.store.set_watermark("members", "2023-01-01T00:00:00Z")
+        self.store.set_watermark("members", "2023-01-02T00:00:00Z")
+        self.assertEqual(self.store.get_watermark("members"), "2023-01-02T00:00:00Z")
+
+    def test_requester_builds_objects(self):
+        requester = Requester(settings.BASE_URL_WITH_VERSION, settings.API_KEY)
+        store = SQLiteStore(requester=requester)
+        store.upsert("resource_logs", [resource_log(1, 1, "2023-06-01")])
+
+        log = store.get("resource_logs", 1)
+        self.assertIsInstance(log, ResourceLog)
+        self.assertEqual(log.resource, 1)
+
+    def test_persisted(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "mirror.db")
+            store = SQLiteStore(path)
+            store.upsert("members", [{"id": 1, "space": 1}])
+            store.set_watermark("members", "2023-01-01T00:00:00Z")
+            store.close()
+
+            store = SQLiteStore(path)
+            self.assertEqual(store.get("members", 1), {"id": 1, "space": 1})
+            self.assertEqual(store.get_watermark("members"), "2023-01-01T00:00:00Z")
+            store.close()
+
+
+@requests_mock.Mocker()
+class TestSQLiteStoreSync(unittest.TestCase):
+    def test_synchronizer(self, m):
+        register_uris({"fabman": ["get_members"]}, m)
+        store = SQLiteStore()
+        synchronizer = Synchronizer(
+            Fabman(settings.API_KEY),
+            store,
+            collections=[SyncCollection("members", "get_members")],
+        )
+
+        counts = synchronizer.sync()
+        self.assertEqual(counts["members"], len(store.all("members")))
+        self.assertIsNotNone(store.get_watermark("members"))
+        store.close()
@@ -0,0 +1,218 @@
+"""Tests for the incremental sync engine."""
+# pylint: disable=missing-docstring, invalid-name, unused-argument
+
+import json
+import os
+import tempfile
+import unittest
+
+import requests_mock
+
+from fabman import Fabman
+from fabman.sync import JSONFileStore, SyncCollection, Synchronizer
+from tests import settings
+
+MEMBERS_URL = f"{settings.BASE_URL_WITH_VERSION}/members"
+
+
+def member(member_id, updated_at):
+    return {"id": member_id, "firstName": "Member", "updatedAt": updated_at}
+
+
+def register_members(m, first_page, second_page=None):
+    """Serves members two per page, most recently updated first"""
+    headers = {}
+    if second_page is not None:
+        headers["Link"] = f'<{MEMBERS_URL}?limit=2&offset=2>; rel="next"'
+    m.register_uri("GET", f"{MEMBERS_URL}?limit=2", json=first_page, headers=headers)
+    if second_page is not None:
+        m.register_uri("GET", f"{MEMBERS_URL}?limit=2&offset=2", json=second_page)
+
+
+@requests_mock.Mocker()
+class TestSynchronizer(unittest.TestCase):
+    def setUp(self):
+        self.fabman = Fabman(settings.API_KEY)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "mirror.json")
+        self.store = JSONFileStore(self.path)
+        self.synchronizer = Synchronizer(
+            self.fabman,
+            self.store,
+            collections=[SyncCollection("members", "get_members")],
+            page_size=2,
+        )
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_initial_sync(self, m):
+        register_members(
+            m,
+            [member(4, "2023-01-04T00:00:00Z"), member(3, "2023-01-03T00:00:00Z")],
+            [member(2, "2023-01-02T00:00:00Z"), member(1, "2023-01-01T00:00:00Z")],
+        )
+
+        self.assertEqual(self.synchronizer.sync(), {"members": 4})
+        self.assertEqual(len(self.store.all("members")), 4)
+        self.assertEqual(self.store.get_watermark("members"), "2023-01-04T00:00:00Z")
+        self.assertEqual(
+            self.store.get("members", 3)["updatedAt"], "2023-01-03T00:00:00Z"
+        )
+        self.assertNotIn("_requester", self.store.get("members", 3))
+
+        query = m.request_history[0].qs
+        self.assertEqual(query["orderby"], ["updatedat"])
+        self.assertEqual(query["order"], ["desc"])
+
+    def test_incremental_sync_stops_at_watermark(self, m):
+        self.store.upsert("members", [member(1, "2023-01-01T00:00:00Z")])
+        self.store.set_watermark("members", "2023-01-03T00:00:00Z")
+        register_members(
+            m,
+            [member(5, "2023-01-05T00:00:00Z"), member(1, "2023-01-04T00:00:00Z")],
+            [member(3, "2023-01-03T00:00:00Z"), member(2, "2023-01-02T00:00:00Z")],
+        )
+
+        self.assertEqual(self.synchronizer.sync(["members"]), {"members": 3})
+        self.assertEqual(
+            self.store.get("members", 1)["updatedAt"], "2023-01-04T00:00:00Z"
+        )
+        self.assertIsNotNone(self.store.get("members", 5))
+        self.assertIsNone(self.store.get("members", 2))
+        self.assertEqual(self.store.get_watermark("members"), "2023-01-05T00:00:00Z")
+
+    def test_unchanged_collection_reads_one_page(self, m):
+        self.store.set_watermark("members", "2023-01-04T00:00:00Z")
+        register_members(
+            m,
+            [member(3, "2023-01-03T00:00:00Z"), member(2, "2023-01-02T00:00:00Z")],
+            [member(1, "2023-01-01T00:00:00Z")],
+        )
+
+        self.assertEqual(self.synchronizer.sync(), {"members": 0})
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(self.store.get_watermark("members"), "2023-01-04T00:00:00Z")
+
+    def test_full_scan(self, m):
+        self.store.set_watermark("members", "2023-01-03T00:00:00Z")
+        register_members(
+            m,
+            [member(1, "2023-01-01T00:00:00Z"), member(2, "2023-01-02T00:00:00Z")],
+            [member(4, "2023-01-04T00:00:00Z")],
+        )
+        synchronizer = Synchronizer(
+            self.fabman,
+            self.store,
+            collections=[SyncCollection("members", "get_members", full_scan=True)],
+            page_size=2,
+        )
+
+        self.assertEqual(synchronizer.sync(), {"members": 1})
+        self.assertEqual(m.call_count, 2)
+        self.assertNotIn("orderby", m.request_history[0].qs)
+        self.assertEqual(self.store.get_watermark("members"), "2023-01-04T00:00:00Z")
+
+    def test_unordered_pages_read_in_full(self, m):
+        self.store.set_watermark("members", "2023-01-03T00:00:00Z")
+        # the API ignored orderBy, a changed record follows an older one
+        register_members(
+            m,
+            [member(2, "2023-01-02T00:00:00Z"), member(5, "2023-01-05T00:00:00Z")],
+            [member(4, "2023-01-04T00:00:00Z"), member(1, "2023-01-01T00:00:00Z")],
+        )
+
+        with self.assertLogs("fabman.sync", "WARNING"):
+            self.assertEqual(self.synchronizer.sync(), {"members": 2})
+        self.assertEqual(m.call_count, 2)
+        self.assertIsNotNone(self.store.get("members", 4))
+        self.assertEqual(self.store.get_watermark("members"), "2023-01-05T00:00:00Z")
+
+    def test_unordered_across_pages(self, m):
+        self.store.set_watermark("members", "2023-01-02T00:00:00Z")
+        register_members(
+            m,
+            [member(5, "2023-01-05T00:00:00Z"), member(3, "2023-01-03T00:00:00Z")],
+            [member(4, "2023-01-04T00:00:00Z"), member(1, "2023-01-01T00:00:00Z")],
+        )
+
+        with self.assertLogs("fabman.sync", "WARNING"):
+            self.assertEqual(self.synchronizer.sync(), {"members": 3})
+        self.assertIsNone(self.store.get("members", 1))
+
+    def test_ordering_rejected(self, m):
+        self.store.set_watermark("members", "2023-01-03T00:00:00Z")
+        m.register_uri(
+            "GET", f"{MEMBERS_URL}?limit=2", json=[member(4, "2023-01-04T00:00:00Z")]
+        )
+        m.register_uri(
+            "GET",
+            f"{MEMBERS_URL}?orderBy=updatedAt",
+            status_code=400,
+            json={"errors": ["orderBy"]},
+        )
+
+        with self.assertLogs("fabman.sync", "WARNING"):
+            self.assertEqual(self.synchronizer.sync(), {"members": 1})
+        self.assertNotIn("orderby", m.last_request.qs)
+
+    def test_default_collections(self, m):
+        synchronizer = Synchronizer(self.fabman, self.store)
+        self.assertFalse(synchronizer.collections["members"].full_scan)
+        self.assertTrue(synchronizer.collections["spaces"].full_scan)
+
+    def test_collection_params(self, m):
+        register_members(m, [member(1, "2023-01-01T00:00:00Z")])
+        synchronizer = Synchronizer(
+            self.fabman,
+            self.store,
+            collections=[SyncCollection("members", "get_members", embed="key")],
+            page_size=2,
+        )
+
+        synchronizer.sync()
+        self.assertEqual(m.request_history[0].qs["embed"], ["key"])
+
+    def test_store_persisted(self, m):
+        register_members(m, [member(1, "2023-01-01T00:00:00Z")])
+
+        self.synchronizer.sync()
+
+        reopened = JSONFileStore(self.path)
+        self.assertEqual(reopened.get("members", 1)["id"], 1)
+        self.assertEqual(reopened.get_watermark("members"), "2023-01-01T00:00:00Z")
+
+
+class TestJSONFileStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "mirror.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_empty(self):
+        store = JSONFileStore(self.path)
+        self.assertIsNone(store.get_watermark("members"))
+        self.assertIsNone(store.get("members", 1))
+        self.assertEqual(store.all("members"), [])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_upsert_replaces(self):
+        store = JSONFileStore(self.path)
+        store.upsert("members", [{"id": 1, "firstName": "Old"}])
+        store.upsert("members", [{"id": 1, "firstName": "New"}, {"id": 2}])
+
+        self.assertEqual(store.get("members", 1)["firstName"], "New")
+        self.assertEqual(len(store.all("members")), 2)
+
+    def test_commit(self):
+        store = JSONFileStore(self.path)
+        store.upsert("members", [{"id": 1}])
+        store.set_watermark("members", "2023-01-01T00:00:00Z")
+        store.commit()
+
+        with open(self.path, encoding="utf-8") as file:
+            data = json.load(file)
+        self.assertEqual(data["watermarks"], {"members": "2023-01-01T00:00:00Z"})
+        self.assertEqual(os.listdir(self.directory.name), ["mirror.json"])
@@ -1,10 +1,11 @@
 """Utility Function tests"""
 # pylint: disable=missing-docstring, invalid-name, unused-argument
+import json
 import unittest
 
 import requests_mock
 
-from fabman.util import clean_headers
+from fabman.util import clean_headers, get_path, iter_json_array
 
 # pylint: disable=missing-class-docstring, missing-function-docstring, too-many-public-methods
 
@@ -22,3 +23,47 @@ class TestUtil(unittest.TestCase):
         headers = {"Authorization": "thisisatoken"}
         out = clean_headers(headers)
         self.assertEqual(out["Authorization"], "****oken")
+
+    def test_iter_json_array(self, m):
+        data = [
+            {"id": i, "name": 'Dax é \\"]', "n": [1, {"a": None}]} for i in range(50)
+        ]
+        raw = json.dumps(data).encode("utf-8")
+        for size in (1, 2, 7, 64, len(raw)):
+            chunks = [raw[i : i + size] for i in range(0, len(raw), size)]
+            self.assertEqual(list(iter_json_array(chunks)), data)
+
+    def test_iter_json_array_scalars(self, m):
+        raw = b' [ 12345 , -1.5e3,null, true ,"x" ] '
+        chunks = [raw[i : i + 1] for i in range(len(raw))]
+        self.assertEqual(
+            list(iter_json_array(chunks)), [12345, -1500.0, None, True, "x"]
+        )
+
+    def test_iter_json_array_empty(self, m):
+        self.assertEqual(list(iter_json_array([b"[", b"]"])), [])
+
+    def test_iter_json_array_is_incremental(self, m):
+        elements = iter_json_array(iter([b'[{"id": 1}, ', b'{"id": 2}', b"]"]))
+        self.assertEqual(next(elements), {"id": 1})
+
+    def test_iter_json_array_invalid(self, m):
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'{"id": 1}']))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[{"id": 1}']))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[{"id": 1} {"id": 2}]']))
+        with self.assertRaises(ValueError):
+            list(iter_json_array([b'[{"id": ']))
+
+
+class TestGetPath(unittest.TestCase):
+    def test_get_path(self):
+        record = {"id": 1, "_embedded": {"key": {"token": "0a1b"}, "member": None}}
+
+        self.assertEqual(get_path(record, ["id"]), 1)
+        self.assertEqual(get_path(record, ["_embedded", "key", "token"]), "0a1b")
+        self.assertIsNone(get_path(record, ["_embedded", "member", "firstName"]))
+        self.assertIsNone(get_path(record, ["missing", "field"]))
+        self.assertIsNone(get_path(record, ["id", "nested"]))